@@ -7,10 +7,15 @@ Updated on Sat Apr  2 18:57:50 2022
 
 @author: cghiaus
 """
+import time
 import numpy as np
-import pandas as pd
 import psychro as psy
+import solvers
+import instrument
+import lin_gen
 import matplotlib.pyplot as plt
+from functools import lru_cache
+from scipy.linalg import lu_factor, lu_solve
 
 # global variables
 # UA = 935.83                 # bldg conductance
@@ -24,10 +29,67 @@ c = 1e3                     # air specific heat J/kg K
 l = 2496e3                  # latent heat J/kg
 
 
+Kθ, Kw = 1e10, 1e10         # controller gain; np.inf: ideal controller
+θs_ref = 10                 # °C, tangent to saturation in factorized matrix
+
+
 # *****************************************
 # RECYCLED AIR
 # *****************************************
-def ModelRecAir(m, α, β, θS, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA):
+@lru_cache(maxsize=128)
+def _lu_RecAir(m, α, β, mi, UA, Kθ, Kw, θs_ref):
+    """
+    LU factorization of the matrix of ModelRecAir with the tangent
+    to the saturation curve in θs_ref (row 5: wsp_ref θ2 - w2 = b5).
+    Ideal controllers (Kθ, Kw = np.inf) are eliminated (solvers.py):
+    rows 14, 15 and unknowns θ5, w5 (10, 11) are removed; the indexes
+    0 ... 9 of equations and unknowns are not changed.
+    Cached for calls with the same m, α, β, mi, UA, Kθ, Kw, θs_ref.
+
+    Returns
+    -------
+    lu      LU factorization of A0 (scipy.linalg.lu_factor)
+    z       A0⁻¹ e5, used in the rank-one update of row 5
+    wsp_ref slope of the saturation curve in θs_ref
+    Ac, eqs, free   given by solvers.reduce
+    """
+    A = np.zeros((16, 16))          # coefficents of unknowns
+    # MX1
+    A[0, 0], A[0, 10] = m * c, -(1 - α) * m * c
+    A[1, 1], A[1, 11] = m * l, -(1 - α) * m * l
+    # HC1
+    A[2, 0], A[2, 2], A[2, 12] = m * c, -m * c, 1
+    A[3, 1], A[3, 3] = m * l, -m * l
+    # AH
+    A[4, 2], A[4, 3], A[4, 4], A[4, 5] = c, l, -c, -l
+    _, wsp_ref, _ = psy.wsat(θs_ref)
+    A[5, 4], A[5, 5] = wsp_ref, -1
+    # MX2
+    A[6, 2], A[6, 4], A[6, 6] = β * m * c, (1 - β) * m * c, -m * c
+    A[7, 3], A[7, 5], A[7, 7] = β * m * l, (1 - β) * m * l, -m * l
+    # HC2
+    A[8, 6], A[8, 8], A[8, 13] = m * c, -m * c, 1
+    A[9, 7], A[9, 9] = m * l, -m * l
+    # TZ
+    A[10, 8], A[10, 10], A[10, 14] = m * c, -m * c, 1
+    A[11, 9], A[11, 11], A[11, 15] = m * l, -m * l, 1
+    # BL
+    A[12, 10], A[12, 14] = (UA + mi * c), 1
+    A[13, 11], A[13, 15] = mi * l, 1
+    # Kθ & Kw
+    A[14, 10], A[14, 12] = Kθ, 1
+    A[15, 11], A[15, 13] = Kw, 1
+
+    rows, cols, _ = solvers.ideal([Kθ, Kw], [14, 15], [10, 11], [0, 0])
+    A, Ac, eqs, free = solvers.reduce(A, rows, cols)
+    lu = lu_factor(A)
+    e5 = np.zeros(len(free))
+    e5[5] = 1
+    return lu, lu_solve(lu, e5), wsp_ref, Ac, eqs, free
+
+
+def ModelRecAir(m, α, β, θS, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA,
+                θs0=None, max_iter=20, accel='picard', full_output=False):
     """
     Model:
         Heating and adiabatic humidification
@@ -49,6 +111,12 @@ def ModelRecAir(m, α, β, θS, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA):
         Qla     aux. latente heat, W
         mi      infiltration massflow rate, kg/s
         UA      global conductivity bldg, W/K
+        θs0     initial guess of the saturation temperature θ2, °C;
+                None: θS (e.g. warm start from θ2 = x[4] of a neighbouring
+                operating point)
+        max_iter    maximum number of iterations on θs
+        accel   acceleration of the iterations, see *solvers.fixed_point*
+        full_output if True, returns also the status of the iterations
 
     System:
         MX1:    Mixing box
@@ -79,51 +147,176 @@ def ModelRecAir(m, α, β, θS, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA):
     x       vector 16 elem.:
             θ0, w0, t1, w1, t2, w2, t3, w3, t4, w4, t5, w5,...
                 QHC1, QHC2, QsTZ, QlTZ
+    If full_output is True, returns (x, status)
+    status  dict, see *solvers.fixed_point*
 
     """
-    Kθ, Kw = 1e10, 1e10             # controller gain
     wO = psy.w(θO, φO)            # hum. out
     wIsp = psy.w(θIsp, φIsp)      # indoor mumidity ratio
 
     # Model
-    θs0, Δ_θs = θS, 2             # initial guess saturation temp.
-
-    A = np.zeros((16, 16))          # coefficents of unknowns
+    # A = A0 + (wsp(θs0) - wsp_ref) e5 e4' (tangent in θs0 in row 5)
+    # b = b0 + (wsp(θs0) θs0 - ws(θs0)) e5
+    # A0 is factorized once (and cached); for each value of θs0,
+    # x is obtained by Sherman-Morrison formula in O(n) operations.
+    t0 = time.perf_counter()
+    m, α, β, mi, UA = np.hstack([m, α, β, mi, UA]).tolist()  # floats
+    lu, z, wsp_ref, Ac, eqs, free = _lu_RecAir(m, α, β, mi, UA, Kθ, Kw,
+                                               θs_ref)
+    rows, cols, x_sp = solvers.ideal([Kθ, Kw], [14, 15], [10, 11],
+                                     [θIsp, wIsp])
     b = np.zeros(16)                # vector of inputs
-    while Δ_θs > 0.01:
-        # MX1
-        A[0, 0], A[0, 10], b[0] = m * c, -(1 - α) * m * c, α * m * c * θO
-        A[1, 1], A[1, 11], b[1] = m * l, -(1 - α) * m * l, α * m * l * wO
-        # HC1
-        A[2, 0], A[2, 2], A[2, 12], b[2] = m * c, -m * c, 1, 0
-        A[3, 1], A[3, 3], b[3] = m * l, -m * l, 0
-        # AH
-        A[4, 2], A[4, 3], A[4, 4], A[4, 5], b[4] = c, l, -c, -l, 0
-        A[5, 4], A[5, 5] = psy.wsp(θs0), -1
-        b[5] = psy.wsp(θs0) * θs0 - psy.w(θs0, 1)
-        # MX2
-        A[6, 2], A[6, 4], A[6, 6], b[6] = β * m * c, (1 - β) * m * c, -m * c, 0
-        A[7, 3], A[7, 5], A[7, 7], b[7] = β * m * l, (1 - β) * m * l, -m * l, 0
-        # HC2
-        A[8, 6], A[8, 8], A[8, 13], b[8] = m * c, -m * c, 1, 0
-        A[9, 7], A[9, 9], b[9] = m * l, -m * l, 0
-        # TZ
-        A[10, 8], A[10, 10], A[10, 14], b[10] = m * c, -m * c, 1, 0
-        A[11, 9], A[11, 11], A[11, 15], b[11] = m * l, -m * l, 1, 0
-        # BL
-        A[12, 10], A[12, 14], b[12] = (UA + mi * c), 1, (UA + mi * c
-                                                         ) * θO + Qsa
-        A[13, 11], A[13, 15], b[13] = mi * l, 1, mi * l * wO + Qla
-        # Kθ & Kw
-        A[14, 10], A[14, 12], b[14] = Kθ, 1, Kθ * θIsp
-        A[15, 11], A[15, 13], b[15] = Kw, 1, Kw * wIsp
-
-        x = np.linalg.solve(A, b)
-        Δ_θs = abs(θs0 - x[4])
-        θs0 = x[4]
+    # MX1
+    b[0] = α * m * c * θO
+    b[1] = α * m * l * wO
+    # BL
+    b[12] = (UA + mi * c) * θO + Qsa
+    b[13] = mi * l * wO + Qla
+    # Kθ & Kw
+    b[14] = Kθ * θIsp
+    b[15] = Kw * wIsp
+    y = lu_solve(lu, solvers.rhs(b, Ac, eqs, x_sp))     # y = A0⁻¹ b0
+
+    θs0 = θS if θs0 is None else θs0    # initial guess saturation temp.
+    t1 = time.perf_counter()
+
+    def g(θs0):
+        ws0, wsp0, _ = psy.wsat(θs0)
+        u = y + (wsp0 * θs0 - ws0) * z      # A0⁻¹ b
+        d = wsp0 - wsp_ref
+        x = u - z * (d * u[4] / (1 + d * z[4]))
+        return x[4], x
+
+    _, x, status = solvers.fixed_point(g, θs0, 0.01, max_iter, accel)
+    if not status['converged']:
+        print(f'ModelRecAir: no convergence in {status["n_iter"]} '
+              'iterations')
+    instrument.record('ad_hum.ModelRecAir', time_assembly=t1 - t0,
+                      time_solve=time.perf_counter() - t1,
+                      n_iter=status['n_iter'],
+                      converged=status['converged'])
+    x = solvers.restore(x, free, cols, x_sp)
+    if full_output:
+        return x, status
+    return x
+
+
+def ModelRecAir_batch(m, α, β, θS, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA,
+                      θs0=None, max_iter=20, full_output=False):
+    """
+    ModelRecAir for N operating points at once (vectorized).
+        The linear model is evaluated by the straight-line functions of
+        lin_gen.py (symbolic elimination, see codegen.py), without
+        matrices; the saturation point θ2 is found by Newton iterations
+        (tangent to the saturation curve) for all points simultaneously;
+        only the points which did not converge are evaluated again.
+
+    Parameters
+    ----------
+    m, α, β, θS, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA
+                as in *ModelRecAir*; scalars or arrays of N values
+    θs0         initial guess of θ2, scalar or N values; None: θS
+    max_iter    maximum number of iterations
+    full_output if True, returns also the no. of iterations and convergence
+
+    Returns
+    -------
+    x           (N, 16) np.array, for each point:
+                θ0, w0, t1, w1, t2, w2, t3, w3, t4, w4, t5, w5,
+                QHC1, QHC2, QsTZ, QlTZ
+    If full_output is True, returns (x, n_iter, converged)
+    n_iter      (N,) np.array, number of iterations of each point
+    converged   (N,) np.array of bool
+    """
+    t0 = time.perf_counter()
+    θs0 = θS if θs0 is None else θs0
+    m, α, β, θs, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA = \
+        np.broadcast_arrays(*np.atleast_1d(m, α, β, θs0, θIsp, φIsp,
+                                           θO, φO, Qsa, Qla, mi, UA))
+    θs = θs.astype(float)
+    N = m.shape[0]
+    v = (m, α, β, np.broadcast_to(Kθ, N), np.broadcast_to(Kw, N),
+         θO, psy.w(θO, φO), θIsp, psy.w(θIsp, φIsp), mi, UA, Qsa, Qla)
+    f = getattr(lin_gen, 'ad_hum_' + ''.join(
+        'I' if np.isinf(K) else 'K' for K in (Kθ, Kw)))
+    x = np.zeros((N, 16))
+    n_iter = np.zeros(N, dtype=int)
+    converged = np.zeros(N, dtype=bool)
+
+    t1 = time.perf_counter()
+    for k in range(1, max_iter + 1):
+        active = ~converged
+        ws0, wsp0, _ = psy.wsat(θs[active])
+        x[active] = f(*(vk[active] for vk in v), wsp0,
+                      wsp0 * θs[active] - ws0)
+        n_iter[active] = k
+        converged[active] = abs(x[active, 4] - θs[active]) < 0.01
+        θs[active] = x[active, 4]
+        if converged.all():
+            break
+    instrument.record('ad_hum.ModelRecAir_batch', time_assembly=t1 - t0,
+                      time_solve=time.perf_counter() - t1, N=N,
+                      n_iter=n_iter.sum(), converged=converged.all())
+    if full_output:
+        return x, n_iter, converged
     return x
 
 
+def RecAirCAV_compute(α=1, β=0.1,
+                      θS=30, θIsp=18, φIsp=0.49, θO=-1, φO=1,
+                      Qsa=0, Qla=0, mi=2.18, UA=935.83):
+    """
+    Computation of *RecAirCAV*, without chart and printing.
+
+    Returns
+    -------
+    res     dict
+        'x'     results of ModelRecAir
+        'θ', 'w'    points o, 0, ..., 5 on psychrometric chart
+        'A'     adjacency matrix of processes (MX1, HC1, AH, MX2, HC2, TZ)
+        'Q'     heat flow rates QsHC1, QsHC2, QsTZ, QlTZ, W
+        'm'     mass flow rate, kg/s
+    """
+    wO = psy.w(θO, φO)            # hum. out
+
+    # Mass flow rate for design conditions
+    # Supplay air mass flow rate
+    # QsZ = UA*(θO - θIsp) + mi*c*(θO - θIsp)
+    # m = - QsZ/(c*(θS - θIsp)
+    # where
+    # θO, wO = -1, 3.5e-3           # outdoor
+    # θS = 30                       # supply air
+    # mid = 2.18                     # infiltration
+    QsZ = UA * (θOd - θIsp) + mid * c * (θOd - θIsp)
+    m = - QsZ / (c * (θS - θIsp))
+
+    # Model
+    x = ModelRecAir(m, α, β,
+                    θS, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
+    return _res_RecAir(x, m, wO, θO)
+
+
+def _res_RecAir(x, m, wO, θO):
+    """
+    Result of recycled air models (CAV & VAV) as a dict.
+    """
+    # Adjancy matrix
+    # Points calc.  o   0   1   2   3   4   5       Elements
+    # Points pplot  0   1   2   3   4   5   6       Elements
+    A = np.array([[-1, +1, +0, +0, +0, +0, -1],     # MX1
+                  [+0, -1, +1, +0, +0, +0, +0],     # HC1
+                  [+0, +0, -1, +1, +0, +0, +0],     # AH
+                  [+0, +0, -1, -1, +1, +0, +0],     # MX2
+                  [+0, +0, +0, +0, -1, +1, +0],     # HC2
+                  [+0, +0, +0, +0, +0, -1, +1]])    # TZ
+    return {'x': x,
+            'θ': np.append(θO, x[0:12:2]),
+            'w': np.append(wO, x[1:12:2]),
+            'A': A,
+            'Q': dict(zip(['QsHC1', 'QsHC2', 'QsTZ', 'QlTZ'], x[12:])),
+            'm': m}
+
+
 def RecAirCAV(α=1, β=0.1,
               θS=30, θIsp=18, φIsp=0.49, θO=-1, φO=1,
               Qsa=0, Qla=0, mi=2.18, UA=935.83):
@@ -178,60 +371,98 @@ def RecAirCAV(α=1, β=0.1,
     -------
     None
     """
+    res = RecAirCAV_compute(α, β, θS, θIsp, φIsp, θO, φO,
+                            Qsa, Qla, mi, UA)
     plt.close('all')
-    wO = psy.w(θO, φO)            # hum. out
-
-    # Mass flow rate for design conditions
-    # Supplay air mass flow rate
-    # QsZ = UA*(θO - θIsp) + mi*c*(θO - θIsp)
-    # m = - QsZ/(c*(θS - θIsp)
-    # where
-    # θO, wO = -1, 3.5e-3           # outdoor
-    # θS = 30                       # supply air
-    # mid = 2.18                     # infiltration
-    QsZ = UA * (θOd - θIsp) + mid * c * (θOd - θIsp)
-    m = - QsZ / (c * (θS - θIsp))
-    print(f'm = {m: 5.3f} kg/s constant for design conditions:')
+    print(f'm = {res["m"]: 5.3f} kg/s constant for design conditions:')
     print(f'    [θSd = {θS: 3.1f} °C, mi = 2.18 kg/S, θO = -1°C, φ0 = 100%]')
+    psy.show(res)
+    return None
 
-    # Model
-    x = ModelRecAir(m, α, β,
-                    θS, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
 
-    θ = np.append(θO, x[0:12:2])
-    w = np.append(wO, x[1:12:2])
+def RecAirVAV_compute(α=1, β=0.1,
+                      θSsp=30, θIsp=18, φIsp=0.49, θO=-1, φO=1,
+                      Qsa=0, Qla=0, mi=2.18, UA=935.83, m0=5, θs0=None):
+    """
+    Computation of *RecAirVAV*, without chart and printing.
 
-    # Adjancy matrix
-    # Points calc.  o   0   1   2   3   4   5       Elements
-    # Points pplot  0   1   2   3   4   5   6       Elements
-    A = np.array([[-1, +1, +0, +0, +0, +0, -1],     # MX1
-                  [+0, -1, +1, +0, +0, +0, +0],     # HC1
-                  [+0, +0, -1, +1, +0, +0, +0],     # AH
-                  [+0, +0, -1, -1, +1, +0, +0],     # MX2
-                  [+0, +0, +0, +0, -1, +1, +0],     # HC2
-                  [+0, +0, +0, +0, +0, -1, +1]])    # TZ
+    Parameters
+    ----------
+    m0      kg/s, initial guess of the mass flow rate
+    θs0     °C, initial guess of the saturation temperature θ2;
+            each evaluation of the model starts from the previous one
+    others  see *RecAirVAV*
+
+    Returns
+    -------
+    res     dict, as *RecAirCAV_compute*, and
+        'success'   bool, m solves θS = θSsp (else m minimizes the error)
+        'nfev'      number of evaluations of the model by least_squares
+        'cost'      cost of least_squares, (θS - θSsp)²/2
+    """
+    from scipy.optimize import least_squares
+
+    def Saturation(m):
+        """
+        Used in VAV to find the mass flow which solves θS = θSsp
+        Parameters
+        ----------
+            m : mass flow rate of dry air
+
+        Returns
+        -------
+            θS - θSsp: difference between supply temp. and its set point
 
-    psy.chartA(θ, w, A)
+        """
+        x = ModelRecAir(m, α, β,
+                        θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA, θs[0])
+        θs[0] = x[4]                # warm start of the next evaluation
+        θS = x[8]
+        return (θS - θSsp)
 
-    θ = pd.Series(θ)
-    w = 1000 * pd.Series(w)
-    P = pd.concat([θ, w], axis=1)       # points
-    P.columns = ['θ [°C]', 'w [g/kg]']
+    wO = psy.w(θO, φO)            # hum. out
 
-    output = P.to_string(formatters={
-        't [°C]': '{:,.2f}'.format,
-        'w [g/kg]': '{:,.2f}'.format
-    })
-    print()
-    print(output)
+    # Mass flow rate
+    θs = [θs0]
+    t0 = time.perf_counter()
+    ls = least_squares(Saturation, np.clip(m0, 0, 10), bounds=(0, 10))
+    m, success = ls.x[0], ls.cost < 1e-10
+    instrument.record('ad_hum.RecAirVAV', time=time.perf_counter() - t0,
+                      nfev=ls.nfev, cost=ls.cost, success=success)
 
-    Q = pd.Series(x[12:], index=['QsHC1', 'QsHC2', 'QsTZ', 'QlTZ'])
-    # Q.columns = ['kW']
-    pd.options.display.float_format = '{:,.2f}'.format
-    print()
-    print(Q.to_frame().T / 1000, 'kW')
+    x = ModelRecAir(m, α, β,
+                    θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA, θs[0])
+    res = _res_RecAir(x, m, wO, θO)
+    res['success'], res['nfev'], res['cost'] = success, ls.nfev, ls.cost
+    return res
 
-    return None
+
+def RecAirVAV_sequence(points, predictor='last'):
+    """
+    Ordered sequence of operating points (hours of a day, positions of a
+    slider, ...) solved by *RecAirVAV_compute*. The initial guesses m0
+    and θs0 of each point are predicted from the solutions of the
+    previous points (*solvers.predict*): warm start or secant
+    continuation.
+
+    Parameters
+    ----------
+    points      list of dict, keyword arguments of RecAirVAV_compute
+    predictor   'last' or 'secant', see *solvers.predict*
+
+    Returns
+    -------
+    res         list of dict, see *RecAirVAV_compute*
+    """
+    m, θs, res = [], [], []
+    for point in points:
+        if m:
+            point = point | {'m0': solvers.predict(m, predictor),
+                             'θs0': solvers.predict(θs, predictor)}
+        res.append(RecAirVAV_compute(**point))
+        m.append(res[-1]['m'])
+        θs.append(res[-1]['x'][4])
+    return res
 
 
 def RecAirVAV(α=1, β=0.1,
@@ -284,80 +515,13 @@ def RecAirVAV(α=1, β=0.1,
         0..5: 2*6 points (temperature, humidity ratio)
         QsHC1, QsHC2, QsTZ, QlTZ
     """
-    from scipy.optimize import least_squares
-
-    def Saturation(m):
-        """
-        Used in VAV to find the mass flow which solves θS = θSsp
-        Parameters
-        ----------
-            m : mass flow rate of dry air
-
-        Returns
-        -------
-            θS - θSsp: difference between supply temp. and its set point
-
-        """
-        x = ModelRecAir(m, α, β,
-                        θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
-        θS = x[8]
-        return (θS - θSsp)
-
+    res = RecAirVAV_compute(α, β, θSsp, θIsp, φIsp, θO, φO,
+                            Qsa, Qla, mi, UA)
     plt.close('all')
-    wO = psy.w(θO, φO)            # hum. out
-
-    # Mass flow rate
-    res = least_squares(Saturation, 5, bounds=(0, 10))
-    if res.cost < 1e-10:
-        m = float(res.x)
-    else:
+    if not res['success']:
         print('RecAirVAV: No solution for m')
-
-    print(f'm = {m: 5.3f} kg/s')
-    x = ModelRecAir(m, α, β,
-                    θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
-
-    # ΔθS, m = 2, 1                   # initial temp; diff; flow rate
-    # while ΔθS > 0.01:
-    #     m = m + 0.01
-    #     # Model
-    #     x = ModelRecAir(m, θSsp, mi, θO, φO, α, β)
-    #     θS = x[8]
-    #     ΔθS = -(θSsp - θS)
-
-    θ = np.append(θO, x[0:12:2])
-    w = np.append(wO, x[1:12:2])
-
-    # Adjancy matrix
-    # Points calc.  o   0   1   2   3   4   5       Elements
-    # Points pplot  0   1   2   3   4   5   6       Elements
-    A = np.array([[-1, +1, +0, +0, +0, +0, -1],     # MX1
-                  [+0, -1, +1, +0, +0, +0, +0],     # HC1
-                  [+0, +0, -1, +1, +0, +0, +0],     # AH
-                  [+0, +0, -1, -1, +1, +0, +0],     # MX2
-                  [+0, +0, +0, +0, -1, +1, +0],     # HC2
-                  [+0, +0, +0, +0, +0, -1, +1]])    # TZ
-
-    psy.chartA(θ, w, A)
-
-    θ = pd.Series(θ)
-    w = 1000 * pd.Series(w)
-    P = pd.concat([θ, w], axis=1)       # points
-    P.columns = ['θ [°C]', 'w [g/kg]']
-
-    output = P.to_string(formatters={
-        'θ [°C]': '{:,.2f}'.format,
-        'w [g/kg]': '{:,.2f}'.format
-    })
-    print()
-    print(output)
-
-    Q = pd.Series(x[12:], index=['QsHC1', 'QsHC2', 'QsTZ', 'QlTZ'])
-    # Q.columns = ['kW']
-    pd.options.display.float_format = '{:,.2f}'.format
-    print()
-    print(Q.to_frame().T / 1000, 'kW')
-
+    print(f'm = {res["m"]: 5.3f} kg/s')
+    psy.show(res)
     return None
 
 
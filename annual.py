@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+
+Annual simulation: HVAC models driven by hourly weather files
+
+The weather file is read by chunks (e.g. one month of hours) and each
+chunk is solved at once by the batched version of the model. The results
+are yielded block by block, so the memory is bounded whatever the number
+of years or sites; the blocks can be written as they are produced.
+
+Weather files
+-------------
+CSV     columns of outdoor temperature, °C, and relative humidity, -
+        (names given, default 'θo', 'φo'); other columns are ignored.
+EPW     EnergyPlus weather: 8 lines of header, then one line per hour;
+        dry bulb temperature (field 7, °C) and relative humidity
+        (field 9, %).
+
+Models
+------
+A model is a tuple (solve, columns): solve(θo, φo) gives the (N, n)
+array of unknowns for the arrays of N outdoor conditions, columns are
+the names of the n unknowns. Heat flow rates are named Q...
+The models are valid in their domain (e.g. heating and humidification
+in winter); the hours for which the saturation point (cool, ad_hum) is
+not found are reported by the solver.
+
+CONTENTS (functions)
+========================================================================
+weather         Generator of chunks of an hourly weather file.
+cool_model      cool.MxCcRhTzBl, CAV (cool.solve_batch).
+va_hum_model    va_hum, all out air or recycled air, CAV (compiled).
+ad_hum_model    ad_hum.ModelRecAir, CAV (hvac_net.RecAirAH).
+simulate        Generator of blocks of results, one per chunk.
+run             Simulation of a weather file; energy consumption.
+
+Example
+-------
+import annual
+model = annual.cool_model(m=3.1, mo=1, β=0.2)
+for block in annual.simulate(model, annual.weather('Paris.epw')):
+    block['QtCC']       # W, one value per hour of the chunk
+E = annual.run('Paris.epw', model, out='Paris_cool.csv')   # kWh
+E = annual.run('Paris.epw', model, out=store.Store('Paris', model[1]))
+"""
+import pandas as pd
+import cool
+import va_hum
+import ad_hum
+import hvac_net as hn
+from store import Store
+
+# EPW: lines of header and fields of the data (0-based)
+_epw_header = 8
+_epw_fields = {'year': 0, 'month': 1, 'day': 2, 'hour': 3,
+               'θo': 6, 'φo': 8}
+
+
+def weather(path, chunksize=744, fmt=None, θ='θo', φ='φo'):
+    """
+    Reads an hourly weather file by chunks.
+
+    Parameters
+    ----------
+    path        name of the file
+    chunksize   number of hours of a chunk (744: one month of 31 days)
+    fmt         'csv' or 'epw'; None: from the extension of the file
+    θ, φ        CSV: columns of temperature, °C, and relative humidity, -
+
+    Yields
+    ------
+    w           pd.DataFrame, columns θo, φo; index: hour of the file
+                (0, 1, ...); EPW: also year, month, day, hour (1 ... 24)
+    """
+    if fmt is None:
+        fmt = 'epw' if str(path).lower().endswith('.epw') else 'csv'
+    if fmt == 'epw':
+        chunks = pd.read_csv(path, skiprows=_epw_header, header=None,
+                             usecols=list(_epw_fields.values()),
+                             chunksize=chunksize)
+        for w in chunks:
+            w = w.rename(columns={v: k for k, v in _epw_fields.items()})
+            w['φo'] = w['φo'] / 100
+            yield w[list(_epw_fields)]
+    elif fmt == 'csv':
+        for w in pd.read_csv(path, usecols=[θ, φ], chunksize=chunksize):
+            yield w.rename(columns={θ: 'θo', φ: 'φo'})[['θo', 'φo']]
+    else:
+        print(f'weather: unknown format {fmt}')
+
+
+def cool_model(m=3.1, mo=1, β=0.2, Kθ=1e10, Kw=1e10,
+               θIsp=26, φIsp=0.5, mi=1.35, UA=675, Qsa=34_000, Qla=4_000):
+    """
+    Cooling and dehumidification, cool.MxCcRhTzBl (CAV).
+    Parameters: see cool.MxCcRhTzBl.
+
+    Returns
+    -------
+    (solve, columns), see the module
+    """
+    def solve(θo, φo):
+        return cool.solve_batch([m, mo, β, Kθ, Kw],
+                                [θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla])
+    return solve, hn.cool().unknowns
+
+
+def va_hum_model(m=None, α=1, θIsp=18, φIsp=0.5,
+                 Qsa=0, Qla=0, mi=2.12, UA=935.83):
+    """
+    Heating and vapor humidification, va_hum (CAV), factorized once.
+    α = 1: all out air (ModelAllOutAir); α < 1: recycled air (ModelRecAir).
+
+    Parameters
+    ----------
+    m       kg/s, mass flow rate; None: design value of va_hum
+    others  see va_hum.ModelAllOutAir and va_hum.ModelRecAir
+
+    Returns
+    -------
+    (solve, columns), see the module
+    """
+    if α == 1:
+        if m is None:
+            m = va_hum.AllOutAirCAV_compute(mi=mi, UA=UA)['m']
+        model = va_hum.CompiledAllOutAir(m, mi, UA)
+        columns = hn.AllOutAirVH().unknowns
+    else:
+        if m is None:
+            m = va_hum.RecAirCAV_compute(α=α, mi=mi, UA=UA)['m']
+        model = va_hum.CompiledRecAir(m, α, mi, UA)
+        columns = hn.RecAirVH().unknowns
+
+    def solve(θo, φo):
+        return model.solve(θIsp, φIsp, θo, φo, Qsa, Qla)
+    return solve, columns
+
+
+def ad_hum_model(m=None, α=1, β=0.1, θIsp=18, φIsp=0.49,
+                 Qsa=0, Qla=0, mi=2.18, UA=935.83):
+    """
+    Heating and adiabatic humidification, ad_hum.ModelRecAir (CAV),
+    solved for arrays of weather by hvac_net.RecAirAH.
+
+    Parameters
+    ----------
+    m       kg/s, mass flow rate; None: design value of ad_hum
+    others  see ad_hum.ModelRecAir
+
+    Returns
+    -------
+    (solve, columns), see the module
+    """
+    if m is None:
+        m = ad_hum.RecAirCAV_compute(α=α, β=β, θIsp=θIsp, mi=mi, UA=UA)['m']
+    net = hn.RecAirAH()
+    values = dict(m=m, α=α, β=β, Kθ=ad_hum.Kθ, Kw=ad_hum.Kw,
+                  θIsp=θIsp, φIsp=φIsp, mi=mi, UA=UA, Qsa=Qsa, Qla=Qla)
+
+    def solve(θo, φo):
+        return net.solve(values | {'θO': θo, 'φO': φo})
+    return solve, net.unknowns
+
+
+def simulate(model, chunks):
+    """
+    Solves the model for each chunk of weather.
+
+    Parameters
+    ----------
+    model       (solve, columns), e.g. cool_model()
+    chunks      iterable of pd.DataFrame with columns θo, φo (weather)
+
+    Yields
+    ------
+    block       pd.DataFrame, unknowns of the model; index of the chunk
+    """
+    solve, columns = model
+    for w in chunks:
+        x = solve(w['θo'].to_numpy(dtype=float),
+                  w['φo'].to_numpy(dtype=float))
+        yield pd.DataFrame(x, index=w.index, columns=columns)
+
+
+def run(path, model, out=None, chunksize=744, **kwargs):
+    """
+    Simulation of a weather file. The results are written, chunk by
+    chunk, to *out* (if given); only the sums of the heat flow rates
+    are kept in memory.
+
+    Parameters
+    ----------
+    path        weather file (see *weather*, kwargs: fmt, θ, φ)
+    model       (solve, columns), e.g. cool_model()
+    out         name of the CSV file of results or store.Store
+                (None: not written)
+    chunksize   number of hours of a chunk
+
+    Returns
+    -------
+    E           pd.Series, kWh, energy of the heat flow rates Q...
+                (hourly values); E['hours'] number of hours
+    """
+    E, n = pd.Series(dtype=float), 0
+    for k, block in enumerate(simulate(model,
+                                       weather(path, chunksize, **kwargs))):
+        if isinstance(out, Store):
+            out.append(block)
+        elif out is not None:
+            block.to_csv(out, mode='w' if k == 0 else 'a', header=k == 0)
+        Q = block.filter(regex='^Q')
+        E = E.add(Q.sum() / 1000, fill_value=0)
+        n += len(block)
+    E['hours'] = n
+    return E
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+
+Benchmarks of the psychrometric kernels, of the models and of the
+optimizers
+
+Each case is a function of the size n (number of points) which returns
+the function to be timed. The time of a call is the minimum over
+*repeat* measurements (timeit). The results of a run are saved as JSON
+(one file per commit) and compared with a baseline: a case is a
+regression if its time exceeds the baseline by more than *threshold*.
+
+Cases
+-----
+psy.*           kernels of psychro.py (and psychro_jit.py) on arrays of
+                10³ ... 10⁷ points (sizes of the run)
+<model>         one operating point (scalar solve)
+<model>.batch   N operating points at once (batched solve)
+<model>.gen     idem, straight-line evaluators of lin_gen.py (codegen.py)
+<model>.<opt>   optimizers: cool.m_ls, cool.β_ls, ad_hum.RecAirVAV,
+                va_hum.m_VAV
+chart           rendering of the psychrometric chart (psy.show)
+
+CONTENTS (functions)
+========================================================================
+cases       Dictionary of the benchmark cases: name: (function, sizes).
+run         Times the cases; results as a dict.
+save        Saves the results in <directory>/<commit>.json.
+load        Loads the results of a JSON file.
+compare     Compares results with a baseline.
+
+Usage
+-----
+python benchmark.py                     # results in benchmarks/<commit>.json
+python benchmark.py --quick -k 'psy.*'  # small sizes, cases psy.*
+python benchmark.py --baseline benchmarks/e57b4ad.json --threshold 0.2
+                                        # exit status 1 if regression
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+import numpy as np
+import pandas as pd
+import psychro as psy
+import psychro_jit
+import cool
+import ad_hum
+import va_hum
+import mix
+import hvac_net as hn
+
+sizes = [10**3, 10**4, 10**5, 10**6, 10**7]     # kernels
+sizes_quick = [10**3, 10**4]
+N_batch = 10**4                                 # batched models
+
+# Operating points of the tutorials (T04, T05, T06)
+_cool = ([3.1, 1., 0.2, 1e10, 0],
+         [32., 0.8, 26., 0.5, 1.35, 675., 34000., 4000.])
+_net = dict(m=3.1, mo=1, β=0.2, Kθ=1e10, Kw=0, θo=32, φo=0.8,
+            θIsp=26, φIsp=0.5, mi=1.35, UA=675, Qsa=34_000, Qla=4_000)
+
+
+def _θφ(n):
+    rng = np.random.default_rng(0)
+    return rng.uniform(-20, 45, n), rng.uniform(0.1, 1, n)
+
+
+def _kernel(f):
+    def case(n):
+        θ, φ = _θφ(n)
+        return lambda: f(θ, φ)
+    return case
+
+
+def _t(n):
+    θ, φ = _θφ(n)
+    w = psy.w(θ, φ)
+    return lambda: psy.t(w, φ)
+
+
+def _scalar(f):
+    return lambda n: f
+
+
+def _ahu(method, **kwargs):
+    def case(n):
+        def f():
+            getattr(cool.MxCcRhTzBl(*_cool), method)(**kwargs)
+        return f
+    return case
+
+
+def _cool_batch(method):
+    def case(n):
+        θo = np.linspace(26, 36, n)
+        return lambda: cool.solve_batch(_cool[0], [θo] + _cool[1][1:],
+                                        method=method)
+    return case
+
+
+def _va_hum_batch(n):
+    model = va_hum.CompiledAllOutAir(4.84, 2.12, 935.83)
+    θO = np.linspace(-10, 10, n)
+    return lambda: model.solve(18, 0.5, θO, 1, 0, 0)
+
+
+def _net_batch(n):
+    net = hn.cool()
+    values = _net | {'θo': np.linspace(26, 36, n)}
+    return lambda: net.solve(values)
+
+
+def _ad_hum_batch(n):
+    net = hn.RecAirAH()
+    values = dict(m=4.93, α=0.5, β=0.1, Kθ=1e10, Kw=1e10,
+                  θO=np.linspace(-10, 5, n), φO=1, θIsp=18, φIsp=0.49,
+                  mi=2.18, UA=935.83, Qsa=0, Qla=0)
+    return lambda: net.solve(values)
+
+
+def _ad_hum_gen(n):
+    θO = np.linspace(-10, 5, n)
+    return lambda: ad_hum.ModelRecAir_batch(4.93, 0.5, 0.1, 30, 18, 0.49, θO,
+                                            1, 0, 0, 2.18, 935.83)
+
+
+def _chart(n):
+    import matplotlib.pyplot as plt
+    res = cool.MxCcRhTzBl(*_cool).CAV()
+
+    def f():
+        psy.show(res)
+        plt.close('all')
+    return f
+
+
+# name: (function of n giving the function to time, sizes)
+# sizes None: sizes of the run (kernels); [1]: one point; [N_batch]
+cases = {
+    'psy.pvs': (_kernel(lambda θ, φ: psy.pvs(θ, 'exact')), None),
+    'psy.pvs_table': (_kernel(lambda θ, φ: psy.pvs(θ, 'table')), None),
+    'psy.wsat': (_kernel(lambda θ, φ: psy.wsat(θ)), None),
+    'psy.w': (_kernel(psy.w), None),
+    'psy.phi': (_kernel(lambda θ, φ: psy.phi(θ, psy.w(θ, φ))), None),
+    'psy.t': (_t, None),
+    'psy_jit.pvs': (_kernel(lambda θ, φ: psychro_jit.pvs(θ, 'exact')), None),
+    'psy_jit.pvs_table': (_kernel(lambda θ, φ: psychro_jit.pvs(θ, 'table')),
+                          None),
+    'psy_jit.w': (_kernel(lambda θ, φ: psychro_jit.w(θ, φ, backend='exact')),
+                  None),
+    'psy_jit.w_table': (_kernel(lambda θ, φ: psychro_jit.w(θ, φ,
+                                                           backend='table')),
+                        None),
+    'cool': (_ahu('CAV'), [1]),
+    'cool.batch': (_cool_batch('lapack'), [N_batch]),
+    'cool.gen': (_cool_batch('gen'), [N_batch]),
+    'cool.m_ls': (_ahu('VAV', sp=16), [1]),
+    'cool.β_ls': (_ahu('VBP', value='φI', sp=0.5), [1]),
+    'hvac_net.cool': (_scalar(lambda: hn.cool().solve(_net)), [1]),
+    'hvac_net.cool.batch': (_net_batch, [N_batch]),
+    'ad_hum': (_scalar(lambda: ad_hum.RecAirCAV_compute(α=0.5)), [1]),
+    'ad_hum.batch': (_ad_hum_batch, [N_batch]),
+    'ad_hum.gen': (_ad_hum_gen, [N_batch]),
+    'ad_hum.RecAirVAV': (_scalar(lambda: ad_hum.RecAirVAV_compute(α=0.5)),
+                         [1]),
+    'va_hum': (_scalar(lambda: va_hum.ModelRecAir(
+        4.84, 0.5, 30, 18, 0.5, -1, 1, 0, 0, 2.12, 935.83)), [1]),
+    'va_hum.batch': (_va_hum_batch, [N_batch]),
+    'va_hum.m_VAV': (_scalar(lambda: va_hum.RecAirVAV_compute()), [1]),
+    'mix': (_scalar(lambda: mix.mixing_compute()), [1]),
+    'mix.batch': (_kernel(lambda θ, φ: mix.mixing_vec(θ, φ, 32, 0.95, 0.5)),
+                  [N_batch]),
+    'chart': (_chart, [1]),
+}
+
+
+def _commit():
+    """
+    Short hash of the git commit (None if not a git repository)
+    """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+            text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(names=None, quick=False, repeat=5, max_time=0.2):
+    """
+    Times the benchmark cases.
+
+    Parameters
+    ----------
+    names       list of names of cases or of patterns, e.g. 'psy.*'
+                (fnmatch); None: all cases
+    quick       if True, sizes of kernels 10³, 10⁴ (else 10³ ... 10⁷)
+    repeat      number of measurements (the minimum is kept)
+    max_time    s, approx. duration of a measurement (timeit autorange)
+
+    Returns
+    -------
+    res         dict: commit, date, platform, versions and
+                'results': {'<case>[<n>]': {'time' (s), 'n', 'rate'}}
+    """
+    results = {}
+    for name, (case, n_case) in cases.items():
+        if names and not any(fnmatch.fnmatchcase(name, k) for k in names):
+            continue
+        for n in (n_case or (sizes_quick if quick else sizes)):
+            f = case(n)
+            timer = timeit.Timer(f)
+            number, _ = timer.autorange()
+            number = max(1, int(number * max_time / 0.2))
+            t = min(timer.repeat(repeat, number)) / number
+            results[f'{name}[{n}]'] = {'time': t, 'n': n, 'rate': n / t}
+    return {'commit': _commit(),
+            'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'results': results}
+
+
+def save(res, directory='benchmarks'):
+    """
+    Saves the results in <directory>/<commit>.json; returns the path.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{res["commit"] or "results"}.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(res, f, indent=1, ensure_ascii=False)
+    return path
+
+
+def load(path):
+    """
+    Results saved by *save*.
+    """
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(res, baseline, threshold=0.2):
+    """
+    Compares the results with a baseline (cases of both).
+
+    Parameters
+    ----------
+    res, baseline   dict, given by *run* or *load*
+    threshold       relative increase of time considered as a regression
+
+    Returns
+    -------
+    df      pd.DataFrame, by case: time, time_baseline (s),
+            speedup (time_baseline / time), regression (bool)
+    """
+    t = pd.DataFrame(res['results']).T['time']
+    t0 = pd.DataFrame(baseline['results']).T['time']
+    df = pd.DataFrame({'time': t, 'time_baseline': t0}).dropna()
+    df['speedup'] = df['time_baseline'] / df['time']
+    df['regression'] = df['time'] > (1 + threshold) * df['time_baseline']
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks of PsychroAn')
+    parser.add_argument('-k', nargs='*',
+                        help="cases (names or patterns, e.g. 'psy.*')")
+    parser.add_argument('--quick', action='store_true',
+                        help='kernels on 10³, 10⁴ points only')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--out', default='benchmarks',
+                        help='directory of the JSON files')
+    parser.add_argument('--baseline', help='JSON file of the baseline')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative increase of time = regression')
+    args = parser.parse_args(argv)
+
+    import matplotlib
+    matplotlib.use('Agg')
+    res = run(args.k, args.quick, args.repeat)
+    print(f'Results saved in {save(res, args.out)}')
+    df = pd.DataFrame(res['results']).T
+    print(df.to_string(float_format='{:.3e}'.format))
+    if args.baseline:
+        df = compare(res, load(args.baseline), args.threshold)
+        print(df.to_string(float_format='{:.3g}'.format))
+        if df['regression'].any():
+            print(f'Regressions: {list(df.index[df["regression"]])}')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+
+Code generation of straight-line evaluators of the linear models
+
+The linear systems A x = b of cool.MxCcRhTzBl (16 equations) and of
+ad_hum.ModelRecAir (16 equations) have a fixed sparse structure. They
+are solved once symbolically (SymPy): Gaussian elimination in an order
+which keeps the matrix sparse, with pivots which cannot be zero for
+admissible values of the parameters: their sign is known from
+m, wsp > 0 and mo, α, β, Kθ, Kw, mi, UA >= 0 (e.g. UA + mi c, but not
+Kθ - (1 - β)(m - mo) c). Only the last pivot is not checked: it is zero
+if and only if A is singular. The common subexpressions of the 16
+unknowns are eliminated (sympy.cse) and the result is written as a
+Python module of NumPy functions without loops and without matrices:
+70 ... 130 arithmetic operations, vectorized (arrays of N operating
+points are broadcasted). They are used by cool.solve_batch
+(method='gen') and ad_hum.ModelRecAir_batch.
+
+The saturation curve enters by its tangent in θs0 (as in *solve_lin*):
+    wsp θs - ws = wsp0 θs0 - ws0 = b_s
+the arguments of the evaluators are wsp (slope) and b_s.
+
+For each model, four evaluators, by type of controllers of θI and wI:
+<model>_KK     both controllers with finite gains Kθ, Kw
+<model>_IK     ideal controller of θI (Kθ = np.inf), finite Kw
+<model>_KI     finite Kθ, ideal controller of wI (Kw = np.inf)
+<model>_II     both ideal controllers (see solvers.py)
+
+SymPy is needed only to generate the module (once); the generated
+module lin_gen.py depends only on NumPy.
+
+CONTENTS (functions)
+========================================================================
+cool_system     Symbolic A, b of cool.MxCcRhTzBl.
+ad_hum_system   Symbolic A, b of ad_hum.ModelRecAir.
+eliminate       Solution of A x = b by sparse symbolic elimination.
+generate        Writes the module of the evaluators.
+
+Usage
+-----
+python codegen.py           # writes lin_gen.py
+"""
+import itertools
+import textwrap
+import sympy as sp
+
+module = 'lin_gen.py'
+
+# inputs of the evaluators (in this order)
+cool_args = ('m', 'mo', 'β', 'Kθ', 'Kw', 'θo', 'wo', 'θIsp', 'wIsp',
+             'mi', 'UA', 'Qsa', 'Qla', 'wsp', 'b_s')
+ad_hum_args = ('m', 'α', 'β', 'Kθ', 'Kw', 'θO', 'wO', 'θIsp', 'wIsp',
+               'mi', 'UA', 'Qsa', 'Qla', 'wsp', 'b_s')
+
+# signs of the parameters (the other inputs are real)
+_positive = ('m', 'wsp')
+_nonnegative = ('mo', 'α', 'β', 'Kθ', 'Kw', 'mi', 'UA')
+
+
+def _symbols(names):
+    return {k: sp.Symbol(k, positive=True) if k in _positive else
+            sp.Symbol(k, nonnegative=True) if k in _nonnegative else
+            sp.Symbol(k, real=True) for k in names}
+
+
+def cool_system():
+    """
+    Matrix A and vector b of cool.MxCcRhTzBl (see cool.system) with
+    the tangent to the saturation curve in row 4.
+
+    Returns
+    -------
+    A, b    sp.Matrix (16, 16) and (16, 1)
+    s       dict of the symbols of cool_args
+    """
+    s = _symbols(cool_args)
+    m, mo, β, Kθ, Kw, θo, wo, θIsp, wIsp, mi, UA, Qsa, Qla, wsp, b_s = (
+        s[k] for k in cool_args)
+    c, l = sp.Symbol('c', positive=True), sp.Symbol('l', positive=True)
+    Aij = [
+        # MX1
+        (0, 0, m * c), (0, 8, -(m - mo) * c),
+        (1, 1, m * l), (1, 9, -(m - mo) * l),
+        # CC
+        (2, 0, (1 - β) * m * c), (2, 2, -(1 - β) * m * c), (2, 11, 1),
+        (3, 1, (1 - β) * m * l), (3, 3, -(1 - β) * m * l), (3, 12, 1),
+        (4, 2, wsp), (4, 3, -1),
+        (5, 10, -1), (5, 11, 1), (5, 12, 1),
+        # MX2
+        (6, 0, β * m * c), (6, 2, (1 - β) * m * c), (6, 4, -m * c),
+        (7, 1, β * m * l), (7, 3, (1 - β) * m * l), (7, 5, -m * l),
+        # HC
+        (8, 4, m * c), (8, 6, -m * c), (8, 13, 1),
+        (9, 5, m * l), (9, 7, -m * l),
+        # TZ
+        (10, 6, m * c), (10, 8, -m * c), (10, 14, 1),
+        (11, 7, m * l), (11, 9, -m * l), (11, 15, 1),
+        # BL
+        (12, 8, UA + mi * c), (12, 14, 1),
+        (13, 9, mi * l), (13, 15, 1),
+        # Kθ, Kw
+        (14, 8, Kθ), (14, 10, 1),
+        (15, 9, Kw), (15, 13, 1)]
+    bi = [(0, mo * c * θo), (1, mo * l * wo), (4, b_s),
+          (12, (UA + mi * c) * θo + Qsa), (13, mi * l * wo + Qla),
+          (14, Kθ * θIsp), (15, Kw * wIsp)]
+    return _matrices(Aij, bi) + (s,)
+
+
+def ad_hum_system():
+    """
+    Matrix A and vector b of ad_hum.ModelRecAir (see ad_hum._lu_RecAir)
+    with the tangent to the saturation curve in row 5.
+
+    Returns
+    -------
+    A, b    sp.Matrix (16, 16) and (16, 1)
+    s       dict of the symbols of ad_hum_args
+    """
+    s = _symbols(ad_hum_args)
+    m, α, β, Kθ, Kw, θO, wO, θIsp, wIsp, mi, UA, Qsa, Qla, wsp, b_s = (
+        s[k] for k in ad_hum_args)
+    c, l = sp.Symbol('c', positive=True), sp.Symbol('l', positive=True)
+    Aij = [
+        # MX1
+        (0, 0, m * c), (0, 10, -(1 - α) * m * c),
+        (1, 1, m * l), (1, 11, -(1 - α) * m * l),
+        # HC1
+        (2, 0, m * c), (2, 2, -m * c), (2, 12, 1),
+        (3, 1, m * l), (3, 3, -m * l),
+        # AH
+        (4, 2, c), (4, 3, l), (4, 4, -c), (4, 5, -l),
+        (5, 4, wsp), (5, 5, -1),
+        # MX2
+        (6, 2, β * m * c), (6, 4, (1 - β) * m * c), (6, 6, -m * c),
+        (7, 3, β * m * l), (7, 5, (1 - β) * m * l), (7, 7, -m * l),
+        # HC2
+        (8, 6, m * c), (8, 8, -m * c), (8, 13, 1),
+        (9, 7, m * l), (9, 9, -m * l),
+        # TZ
+        (10, 8, m * c), (10, 10, -m * c), (10, 14, 1),
+        (11, 9, m * l), (11, 11, -m * l), (11, 15, 1),
+        # BL
+        (12, 10, UA + mi * c), (12, 14, 1),
+        (13, 11, mi * l), (13, 15, 1),
+        # Kθ, Kw
+        (14, 10, Kθ), (14, 12, 1),
+        (15, 11, Kw), (15, 13, 1)]
+    bi = [(0, α * m * c * θO), (1, α * m * l * wO), (5, b_s),
+          (12, (UA + mi * c) * θO + Qsa), (13, mi * l * wO + Qla),
+          (14, Kθ * θIsp), (15, Kw * wIsp)]
+    return _matrices(Aij, bi) + (s,)
+
+
+def _matrices(Aij, bi):
+    A, b = sp.zeros(16, 16), sp.zeros(16, 1)
+    for i, j, a in Aij:
+        A[i, j] = a
+    for i, v in bi:
+        b[i] = v
+    return A, b
+
+
+def _safe(p):
+    """
+    True if the sign of the pivot p is known (p cannot be zero).
+    The bounds 0 <= β < 1, 0 <= α <= 1 and 0 <= mo <= m are introduced
+    by ratios of nonnegative symbols, e.g. β = β1 / (β1 + β2), β2 > 0;
+    for α and mo, two ratios cover the interval, e.g. mo = m μ1 / (μ1 + μ2)
+    with μ2 > 0 for [0, m) and with μ1 > 0 for (0, m].
+    """
+    a = _symbols(('m', 'mo', 'α', 'β'))
+
+    def ratio(name, positive):
+        x1, x2 = (sp.Symbol(name + k, positive=True) if k == positive
+                  else sp.Symbol(name + k, nonnegative=True) for k in '12')
+        return x1 / (x1 + x2)
+
+    signs = set()
+    for α, μ in itertools.product('12', repeat=2):
+        z = {a['β']: ratio('β', '2'), a['α']: ratio('α', α),
+             a['mo']: a['m'] * ratio('μ', μ)}
+        q = sp.factor(sp.together(p.subs(z)))
+        signs.add(q.is_positive or (False if q.is_negative else None))
+    return signs in ({True}, {False})
+
+
+def eliminate(A, b):
+    """
+    Solves A x = b by Gaussian elimination on the sparse structure:
+    at each step, the pivot is a safe entry (*_safe*) of minimal
+    Markowitz cost (r - 1)(c - 1) (fill-in); the last pivot is zero only
+    if A is singular. Back substitution gives each unknown as an
+    expression of the inputs (not expanded: the steps of elimination).
+
+    Returns
+    -------
+    x       list of n sympy expressions
+    """
+    A, b = A.copy(), b.copy()
+    n = A.shape[0]
+    rows, cols = set(range(n)), set(range(n))
+    order = []                      # (row, column) of the pivots
+    while rows:
+        nr = {i: sum(A[i, j] != 0 for j in cols) for i in rows}
+        nc = {j: sum(A[i, j] != 0 for i in rows) for j in cols}
+        cost = sorted(((nr[i] - 1) * (nc[j] - 1), sp.count_ops(A[i, j]), i, j)
+                      for i in rows for j in cols if A[i, j] != 0)
+        if len(rows) == 1:          # last pivot: zero iff A singular
+            _, _, i, j = cost[0]
+        else:
+            i, j = next((i, j) for _, _, i, j in cost if _safe(A[i, j]))
+        for k in rows - {i}:
+            if A[k, j] != 0:
+                f = A[k, j] / A[i, j]
+                for jj in cols:
+                    if A[i, jj] != 0:
+                        A[k, jj] = A[k, jj] - f * A[i, jj]
+                b[k] = b[k] - f * b[i]
+        rows.remove(i)
+        cols.remove(j)
+        order.append((i, j))
+    x = [None] * n
+    solved = set()
+    for i, j in reversed(order):
+        x[j] = (b[i] - sum(A[i, jj] * x[jj] for jj in solved
+                           if A[i, jj] != 0)) / A[i, j]
+        solved.add(j)
+    return x
+
+
+def _ideal(A, b, s, rows, cols, sp_names):
+    """
+    Ideal controllers: equations *rows* replaced by x[col] = set point.
+    """
+    A, b = A.copy(), b.copy()
+    for i, j, name in zip(rows, cols, sp_names):
+        A[i, :] = sp.zeros(1, A.shape[1])
+        A[i, j], b[i] = 1, s[name]
+    return A, b
+
+
+def _wrap(prefix, code, end=''):
+    """
+    Line prefix + code + end; if longer than 79 characters, code is put
+    in parentheses and wrapped at the spaces (between terms).
+    """
+    if len(prefix + code + end) <= 79:
+        return prefix + code + end
+    return textwrap.fill(code, 78 - len(end), initial_indent=prefix + '(',
+                         subsequent_indent=' ' * (len(prefix) + 1),
+                         break_long_words=False,
+                         break_on_hyphens=False) + ')' + end
+
+
+def _function(name, args, x, doc):
+    """
+    Source of the evaluator *name*.
+    """
+    repl, red = sp.cse(x, symbols=sp.numbered_symbols('t'))
+    lines = [f'def {name}({", ".join(args)}):',
+             f'    """\n{textwrap.indent(doc, "    ")}\n    """']
+    lines += [_wrap(f'    {t} = ', sp.pycode(e)) for t, e in repl]
+    lines += ['    return np.stack(np.broadcast_arrays(']
+    lines += [_wrap('        ', sp.pycode(e), ',') for e in red[:-1]]
+    lines += [_wrap('        ', sp.pycode(red[-1]), '), axis=-1)')]
+    return '\n'.join(lines)
+
+
+def generate(path=module):
+    """
+    Writes the module *path* of the evaluators of cool and ad_hum.
+    """
+    models = [('cool', cool_system, cool_args, [14, 15], [8, 9],
+               'θM, wM, θs, ws, θC, wC, θS, wS, θI, wI, '
+               'QtCC, QsCC, QlCC, QsHC, QsTZ, QlTZ'),
+              ('ad_hum', ad_hum_system, ad_hum_args, [14, 15], [10, 11],
+               'θ0, w0, θ1, w1, θ2, w2, θ3, w3, θ4, w4, θ5, w5, '
+               'QHC1, QHC2, QsTZ, QlTZ')]
+    kinds = {(False, False): 'KK', (True, False): 'IK',
+             (False, True): 'KI', (True, True): 'II'}
+    functions = []
+    for name, system, args, rows, cols, unknowns in models:
+        A, b, s = system()
+        for ideal in itertools.product([False, True], repeat=2):
+            k = [i for i in range(2) if ideal[i]]
+            Ai, bi = _ideal(A, b, s, [rows[i] for i in k],
+                            [cols[i] for i in k],
+                            [('θIsp', 'wIsp')[i] for i in k])
+            x = eliminate(Ai, bi)
+            doc = textwrap.fill(
+                f'{name}, controllers {kinds[ideal]} (K: finite gain, '
+                f'I: ideal).', 75) + '\n' + textwrap.fill(
+                f'Returns (..., 16) np.array: {unknowns}', 75)
+            functions.append(_function(f'{name}_{kinds[ideal]}',
+                                       args, x, doc))
+    header = '''#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generated by codegen.py: do not edit.
+
+Straight-line evaluators of the linear models of cool.MxCcRhTzBl and
+ad_hum.ModelRecAir (16 unknowns), vectorized; see codegen.py.
+"""
+import numpy as np
+
+c = 1e3         # J/kg K, air specific heat
+l = 2496e3      # J/kg, latent heat
+'''
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(header + '\n\n' + '\n\n\n'.join(functions) + '\n')
+
+
+if __name__ == '__main__':
+    generate()
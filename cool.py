@@ -121,6 +121,7 @@ VAV System with linear & least-squares controllers for  & θS
 ------------------------------------------------------------------
 
 linear controller (Kθ & Kw) for θI, φI
+(Kθ, Kw = np.inf: ideal controllers, θI & wI imposed, see solvers.py)
 non-linear controller (ls) for θS
 
 <=4================================m==========================
@@ -168,20 +169,42 @@ CONTENTS (methods)
 __init__    Initialization of CcTZ object.
 lin_model   Solves the set of linear equations
             with saturation curve linearized around ts0
+system      Matrix and vector of the linear equations (w/o saturation)
 solve_lin   Solves iteratively the lin_model s.t. the error of
             humid. ratio between two iterrations is approx. zero
-            (i.e. solves ws = f(θs) for saturation curve).
+            (i.e. solves ws = f(θs) for saturation curve by Newton,
+            warm start from the previous solution).
+dx_dp       Derivatives of the unknowns with respect to m or β
+            (implicit differentiation of the last solve_lin).
 m_ls        Finds m s.t. θS = θSsp (solves θS - θSsp = 0 for m).
             Uses least-squares to find m that minimizes θS - θSsp
-psy_chart   Draws psychrometric chart (imported from psychro)
+            (analytic derivative given by dx_dp).
+β_ls        Finds β s.t. θS = θSsp (idem, for the by-pass factor).
+β_roots     All the values of β s.t. value = sp (scan and regula falsi).
+result      Structured result (points, heat flows, m, β, iterations).
+psy_chart   Draws psychrometric chart and prints results (psy.show).
+CAV, VAV, VBP   Compute only: return the result, no chart, no printing.
+VBP_all     VBP, all the solutions and their energy use.
+sequence    Ordered sequence of points with warm start / continuation.
 CAV_wd      CAV to be used in Jupyter widgets.
             solve_lin and draws psy_chart.
 VAV_wd      VAV to be used in Jupyter widgets.
             m_ls and draws psy_chart.
+
+CONTENTS (functions)
+========================================================================
+system      Vectorized matrix and vector of the linear equations
+            (w/o saturation) for N operating points.
+ideal       Ideal controllers (Kθ, Kw = np.inf) to be eliminated.
+solve_batch Solves the model for N operating points at once.
 """
+import time
 import numpy as np
-import pandas as pd
+from scipy.linalg import lu_factor, lu_solve
 import psychro as psy
+import solvers
+import instrument
+import lin_gen
 
 # constants
 c = 1e3         # J/kg K, air specific heat
@@ -190,6 +213,7 @@ l = 2496e3      # J/kg, latent heat
 # to be used in self.m_ls / least_squares
 m_max = 100     # ks/s, max dry air mass flow rate
 θs_0 = 5        # °C, initial guess for saturation temperature
+β_max = 0.999   # max by-pass factor scanned by β_roots (β = 1: singular)
 
 
 class MxCcRhTzBl:
@@ -208,6 +232,12 @@ class MxCcRhTzBl:
         self.actual = np.array([m, mo, β, Kθ, Kw,
                                 θo, φo, θIsp, φIsp,
                                 mi, UA, Qsa, Qla])
+        self.θs = θs_0          # °C, last saturation temp. (warm start)
+        self.n_iter = 0         # no. iterations of last solve_lin
+        self.n_total = 0        # total no. iterations of solve_lin
+        self.lin = None         # last linear system of solve_lin (dx_dp)
+        self.status = None      # status of the iterations of solve_lin
+        self.ls_status = None   # success, nfev, cost of m_ls or β_ls
 
     def lin_model(self, θs0):
         """
@@ -259,86 +289,149 @@ class MxCcRhTzBl:
                             |                 |<------[K]-----------+<-wI
                             |<------------------------[K]-----------+<-θI
         """
-        m, mo, β, Kθ, Kw, θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla = self.actual
-        wo = psy.w(θo, φo)      # hum. out
-
-        A = np.zeros((16, 16))  # coefficents of unknowns
-        b = np.zeros(16)        # vector of inputs
-        # MX1
-        A[0, 0], A[0, 8], b[0] = m * c, -(m - mo) * c, mo * c * θo
-        A[1, 1], A[1, 9], b[1] = m * l, -(m - mo) * l, mo * l * wo
-        # CC
-        A[2, 0], A[2, 2], A[2, 11], b[2] = (1 - β) * m * c, -(1 - β) * m * c,\
-            1, 0
-        A[3, 1], A[3, 3], A[3, 12], b[3] = (1 - β) * m * l, -(1 - β) * m * l,\
-            1, 0
-        A[4, 2], A[4, 3], b[4] = psy.wsp(θs0), -1,\
-            psy.wsp(θs0) * θs0 - psy.w(θs0, 1)
-        A[5, 10], A[5, 11], A[5, 12], b[5] = -1, 1, 1, 0
-        # MX2
-        A[6, 0], A[6, 2], A[6, 4], b[6] = β * m * c, (1 - β) * m * c,\
-            - m * c, 0
-        A[7, 1], A[7, 3], A[7, 5], b[7] = β * m * l, (1 - β) * m * l,\
-            - m * l, 0
-        # HC
-        A[8, 4], A[8, 6], A[8, 13], b[8] = m * c, -m * c, 1, 0
-        A[9, 5], A[9, 7], b[9] = m * l, -m * l, 0
-        # TZ
-        A[10, 6], A[10, 8], A[10, 14], b[10] = m * c, -m * c, 1, 0
-        A[11, 7], A[11, 9], A[11, 15], b[11] = m * l, -m * l, 1, 0
-        # BL
-        A[12, 8], A[12, 14], b[12] = (UA + mi * c), 1, (UA + mi * c) * θo + Qsa
-        A[13, 9], A[13, 15], b[13] = mi * l, 1, mi * l * wo + Qla
-        # Kθ indoor temperature controller
-        A[14, 8], A[14, 10], b[14] = Kθ, 1, Kθ * θIsp
-        # Kw indoor humidity ratio controller
-        A[15, 9], A[15, 13], b[15] = Kw, 1, Kw * psy.w(θIsp, φIsp)
-        x = np.linalg.solve(A, b)
+        A, b = self.system()
+        ws0, wsp0, _ = psy.wsat(θs0)
+        A[4, 2], A[4, 3], b[4] = wsp0, -1, wsp0 * θs0 - ws0
+        x = solvers.solve(A, b, *ideal(self.actual[:5], self.actual[5:]))
         return x
 
-    def solve_lin(self, θs0):
+    def system(self):
+        """
+        Matrix A and vector b of the linear model for self.actual,
+        without the tangent to the saturation curve
+        (row 4 is set by *lin_model* or *solve_lin*).
+
+        Returns
+        -------
+        A       16 x 16 np.array, coefficients of unknowns
+        b       16 np.array, vector of inputs
+        """
+        return system(self.actual[:5], self.actual[5:])
+
+    def solve_lin(self, θs0=None, tol=0.01e-3, max_iter=20, accel='picard'):
         """
         Finds saturation point on saturation curve ws = f(θs).
-            Solves iterativelly *lin_model(θs0)*:
-            θs -> θs0 until ws = psy(θs, 1).
+            Newton iterations on the saturation point (θs, ws), the only
+            nonlinear unknown: the linear model is solved with the
+            saturation curve replaced by its exact tangent in θs0
+            (*psy.wsat*), then θs -> θs0 until ws = psy(θs, 1).
+            Only the tangent row is updated between iterations.
 
         Parameters
         ----------
-        θs0     initial guess saturation temperature
-
-        Method from object
-        ---------------------
-        *self.lin_model(θs0)*
+        θs0     initial guess saturation temperature;
+                default None: warm start from the solution of the previous
+                call (self.θs)
+        tol     kg/kg, tolerance on |psy.w(θs, 1) - ws|
+        max_iter    maximum number of iterations
+        accel   acceleration of the iterations, see *solvers.fixed_point*
+
+        Attributes updated
+        ------------------
+        self.θs         saturation temperature of the solution
+        self.n_iter     number of iterations
+        self.status     status of the iterations (*solvers.fixed_point*)
+        self.n_total    total number of iterations (all calls)
+        self.lin        LU factorization of the reduced matrix of the
+                        last iteration, reduction and solution x
+                        (used by *dx_dp*)
 
         Returns (16 unknowns)
         ---------------------
         x of *self.lin_model(self, θs0)*
         """
-        Δ_ws = 10e-3  # kg/kg, initial difference to start the iterations
-        while Δ_ws > 0.01e-3:
-            x = self.lin_model(θs0)
-            Δ_ws = abs(psy.w(x[2], 1) - x[3])   # psy.w(θs, 1) = ws
-            θs0 = x[2]                          # actualize θs0
+        if θs0 is None:
+            θs0 = self.θs
+        t0 = time.perf_counter()
+        A, b = self.system()
+        A[4, 3] = -1
+        # ideal controllers eliminated (rows 14, 15, unknowns 8, 9);
+        # row 4 and unknown 2 keep their index in the reduced system
+        rows, cols, x_sp = ideal(self.actual[:5], self.actual[5:])
+        A, Ac, eqs, free = solvers.reduce(A, rows, cols)
+        b = solvers.rhs(b, Ac, eqs, x_sp)
+        t1 = time.perf_counter()
+
+        def g(θs0):
+            ws0, wsp0, _ = psy.wsat(θs0)
+            A[4, 2], b[4] = wsp0, wsp0 * θs0 - ws0
+            lu = lu_factor(A, check_finite=False)
+            x = solvers.restore(lu_solve(lu, b, check_finite=False),
+                                free, cols, x_sp)
+            return x[2], (x, lu)                # actualize θs0
+
+        def Δ_ws(θs0, θs, y):
+            x = y[0]
+            return abs(psy.w(x[2], 1) - x[3])   # psy.w(θs, 1) = ws
+
+        θs0, (x, lu), status = solvers.fixed_point(
+            g, θs0, tol, max_iter, accel, error=Δ_ws)
+        k = status['n_iter']
+        if not status['converged']:
+            θs0 = θs_0                  # no warm start from divergence
+        instrument.record('cool.solve_lin', A=A, time_assembly=t1 - t0,
+                          time_solve=time.perf_counter() - t1,
+                          n_iter=k, converged=status['converged'])
+        self.θs, self.n_iter, self.status = θs0, k, status
+        self.n_total += k
+        self.lin = (lu, eqs, free, x)
         return x
 
-    def m_ls(self, value, sp):
+    def dx_dp(self, k):
+        """
+        Derivatives of the unknowns with respect to the parameter
+        self.actual[k] (0: m, 2: β) at the solution of the last
+        *solve_lin*, by implicit differentiation of A x = b:
+            dx/dp = -A⁻¹ (dA/dp x - db/dp)
+        A is the matrix of the last iteration (tangent to the saturation
+        curve in θs, i.e. the Jacobian of the non-linear model) already
+        factorized by *solve_lin*. A and b are affine in m and in β:
+        dA/dp = A(p + 1) - A(p), db/dp = b(p + 1) - b(p).
+
+        Parameters
+        ----------
+        k       index of the parameter in self.actual: 0 (m) or 2 (β)
+
+        Returns
+        -------
+        dx      16 np.array, derivatives of the unknowns of *solve_lin*
+                (zero for the unknowns imposed by ideal controllers)
+        """
+        lu, eqs, free, x = self.lin
+        p = self.actual.copy()
+        A0, b0 = system(p[:5], p[5:])
+        p[k] += 1
+        A1, b1 = system(p[:5], p[5:])
+        # rows eqs only: the rows of ideal controllers contain np.inf
+        r = (A1[eqs] - A0[eqs]) @ x - (b1[eqs] - b0[eqs])
+        dx = np.zeros(16)
+        dx[free] = -lu_solve(lu, r)
+        return dx
+
+    def m_ls(self, value, sp, m0=None):
         """
         Mass flow rate m controls supply temperature θS or indoor humidity wI.
             Finds m which solves value = sp, i.e. minimizes ε = value - sp.
-            Uses *scipy.optimize.least_squares* to solve the non-linear system.
+            Uses *scipy.optimize.least_squares* to solve the non-linear system;
+            the derivative dε/dm is analytic (*self.dx_dp*), not by finite
+            differences, and ε is signed (smooth at the solution).
 
         Parameters
         ----------
         value   string: 'θS' od 'wI' type of controlled variable
         sp      float: value of setpoint
+        m0      initial guess of m; default None: actual m (warm start
+                from the previous call)
 
         Calls
         -----
         *ε(m)*  gives (value - sp) to be minimized for m
+        *dε(m)* gives dε/dm
 
         Returns (16 unknowns)
         ---------------------
         x           given by *self.lin_model(self, θs0)*
+        self.ls_status  dict 'success', 'nfev', 'cost' of least_squares
         """
         from scipy.optimize import least_squares
 
@@ -359,53 +452,67 @@ class MxCcRhTzBl:
             -------
             ε = value - sp: difference between value and its set point
             """
-            self.actual[0] = m
-            x = self.solve_lin(θs_0)
+            self.actual[0] = m[0]
+            x = self.solve_lin()
             if value == 'θS':
                 θS = x[6]       # supply air
-                return abs(sp - θS)
+                return θS - sp
             elif value == 'φI':
                 wI = x[9]       # indoor air
-                return abs(sp - wI)
+                return wI - sp
             else:
                 print('ERROR in ε(m): value not in {"θS", "wI"}')
 
-        m0 = self.actual[0]     # initial guess
+        def dε(m):
+            """
+            Derivative dε/dm by implicit differentiation of the linear
+            model solved by the last ε(m) (see *self.dx_dp*)
+            """
+            if self.actual[0] != m[0]:
+                ε(m)
+            return self.dx_dp(0)[[6 if value == 'θS' else 9]][None]
+
+        if m0 is None:
+            m0 = self.actual[0]     # initial guess
+        m0 = np.clip(m0, 0, m_max)
         if value == 'φI':
             self.actual[4] = 0
             sp = psy.w(self.actual[7], sp)
         # gives m for min(θSsp - θS); θs_0 is the initial guess of θs
-        res = least_squares(ε, m0, bounds=(0, m_max))
-
-        if res.cost < 0.1e-3:
-            m = float(res.x)
-            # print(f'm = {m: 5.3f} kg/s')
-        else:
-            print('RecAirVAV: No solution for m')
+        t0 = time.perf_counter()
+        res = least_squares(ε, m0, jac=dε, bounds=(0, m_max))
+        self.ls_status = {'success': res.cost < 0.1e-3, 'nfev': res.nfev,
+                          'cost': res.cost}
+        instrument.record('cool.m_ls', time=time.perf_counter() - t0,
+                          **self.ls_status)
 
-        self.actual[0] = m
+        self.actual[0] = res.x[0]
 
-        x = self.solve_lin(θs_0)
+        x = self.solve_lin()
         return x
 
-    def β_ls(self, value, sp):
+    def β_ls(self, value, sp, β0=None):
         """
         Bypass β controls supply temperature θS or indoor humidity wI.
             Finds β which solves value = sp, i.e. minimizes ε = value - sp.
-            Uses *scipy.optimize.least_squares* to solve the non-linear system.
+            Uses *scipy.optimize.least_squares* to solve the non-linear system;
+            the derivative dε/dβ is analytic (*self.dx_dp*).
 
         Parameters
         ----------
         value   string: 'θS' od 'wI' type of controlled variable
         sp      float: value of setpoint
+        β0      initial guess of β; default None: 0.1
 
         Calls
         -----
-        *ε(m)*  gives (value - sp) to be minimized for m
+        *ε(β)*  gives (value - sp) to be minimized for β
+        *dε(β)* gives dε/dβ
 
         Returns (16 unknowns)
         ---------------------
         x           given by *self.lin_model(self, θs0)*
+        self.ls_status  dict 'success', 'nfev', 'cost' of least_squares
         """
         from scipy.optimize import least_squares
 
@@ -426,38 +533,144 @@ class MxCcRhTzBl:
             -------
             ε = value - sp: difference between value and its set point
             """
-            self.actual[2] = β
-            x = self.solve_lin(θs_0)
+            self.actual[2] = β[0]
+            x = self.solve_lin()
             if value == 'θS':
                 θS = x[6]       # supply air
-                return abs(sp - θS)
+                return θS - sp
             elif value == 'φI':
                 wI = x[9]       # indoor air
-                return abs(sp - wI)
+                return wI - sp
             else:
                 print('ERROR in ε(β): value not in {"θS", "wI"}')
 
-        β0 = self.actual[2]     # initial guess
-        β0 = 0.1
+        def dε(β):
+            """
+            Derivative dε/dβ by implicit differentiation of the linear
+            model solved by the last ε(β) (see *self.dx_dp*)
+            """
+            if self.actual[2] != β[0]:
+                ε(β)
+            return self.dx_dp(2)[[6 if value == 'θS' else 9]][None]
+
+        if β0 is None:
+            β0 = 0.1                # initial guess
+        β0 = np.clip(β0, 0, 1)
         if value == 'φI':
             self.actual[4] = 0
             sp = psy.w(self.actual[7], sp)
         # gives m for min(θSsp - θS); θs_0 is the initial guess of θs
-        res = least_squares(ε, β0, bounds=(0, 1))
+        t0 = time.perf_counter()
+        res = least_squares(ε, β0, jac=dε, bounds=(0, 1))
+        self.ls_status = {'success': res.cost < 1e-5, 'nfev': res.nfev,
+                          'cost': res.cost}
+        instrument.record('cool.β_ls', time=time.perf_counter() - t0,
+                          **self.ls_status)
+
+        self.actual[2] = res.x[0]
+        x = self.solve_lin()
+        return x
 
-        if res.cost < 1e-5:
-            β = float(res.x)
-            # print(f'm = {m: 5.3f} kg/s')
-        else:
-            print('RecAirVBP: No solution for β')
+    def β_roots(self, value, sp, n=41, xtol=1e-9, max_iter=30):
+        """
+        All the values of β which solve value = sp (β_ls finds only the
+        root closest to its initial guess).
+            1. Scan: ε = value - sp for n values of β in [0, β_max],
+               solved at once by *solve_batch*.
+            2. Bracket: each sign change of ε between two feasible points
+               (converged, θs in the range of psy.t_table) brackets a root.
+            3. Refine: all the brackets at once by regula falsi (Illinois)
+               with *solve_batch*, at most max_iter batched solves.
+        The cost does not depend on the initial guess: n + max_iter
+        batched evaluations at most.
 
-        self.actual[2] = β
-        x = self.solve_lin(θs_0)
-        return x
+        Parameters
+        ----------
+        value   string: 'θS' od 'φI' type of controlled variable
+        sp      float: value of setpoint
+        n       number of values of β of the scan
+        xtol    tolerance on β
+        max_iter    maximum number of iterations of regula falsi
 
-    def psy_chart(self, x, θo, φo):
+        Returns
+        -------
+        β       np.array, roots in increasing order (empty: no solution)
         """
-        Plot results on psychrometric chart.
+        if value not in ('θS', 'φI'):
+            print('ERROR in β_roots: value not in {"θS", "φI"}')
+            return np.array([])
+        if value == 'φI':
+            self.actual[4] = 0
+            sp = psy.w(self.actual[7], sp)
+        k = 6 if value == 'θS' else 9
+
+        def ε(β, θs0):
+            p = self.actual.copy()
+            with np.errstate(invalid='ignore'):     # β -> 1: θs < -273 °C
+                x, _, converged = solve_batch([p[0], p[1], β, p[3], p[4]],
+                                              p[5:], θs0, full_output=True)
+            θs = x[:, 2]
+            feasible = (converged & (θs >= psy.t_table[0])
+                        & (θs <= psy.t_table[1]))
+            return np.where(feasible, x[:, k] - sp, np.nan), θs
+
+        # scan and brackets
+        β = np.linspace(0, β_max, n)
+        f, θs = ε(β, self.θs)
+        i = np.flatnonzero(f[:-1] * f[1:] <= 0)
+        a, b, fa, fb, θs = β[i], β[i + 1], f[i], f[i + 1], θs[i]
+        roots = a[fa == 0]
+        a, b, fa, fb, θs = (y[fa != 0] for y in (a, b, fa, fb, θs))
+
+        # regula falsi (Illinois) on all brackets at once
+        c = a.copy()
+        for _ in range(max_iter):
+            if c.size == 0:
+                break
+            c_old, c = c, b - fb * (b - a) / (fb - fa)
+            fc, θs = ε(c, θs)
+            ok = ~np.isnan(fc)                  # brackets still feasible
+            a, b, c, c_old, fa, fb, fc, θs = (
+                y[ok] for y in (a, b, c, c_old, fa, fb, fc, θs))
+            side = fc * fb < 0
+            a, fa = np.where(side, b, a), np.where(side, fb, fa / 2)
+            b, fb = c, fc
+            if np.all((abs(c - c_old) < xtol) | (fc == 0)):
+                break
+        return np.sort(np.append(roots, c))
+
+    def VBP_all(self, value='φI', sp=0.5, θo=32, φo=0.5, θIsp=24, φIsp=0.5,
+                mi=1.35, UA=675, Qsa=34_000, Qla=4_000, n=41):
+        """
+        Variable by-pass (VBP), all the solutions (see *self.β_roots*),
+        computation only (no chart, no printing).
+
+        Parameters
+        ----------
+        value       {"θS", "φI"}' type of value controlled
+        sp          set point for the controlled value
+        θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla
+        n           number of values of β of the scan
+
+        Returns
+        -------
+        res     list of dict, see *self.result*, one for each β in
+                increasing order, with the key
+                'energy'    W, |QtCC| + |QsHC|, power of the coils
+        """
+        self.actual[5:] = θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla
+
+        res = []
+        for β in self.β_roots(value, sp, n):
+            self.actual[2] = β
+            x = self.solve_lin()
+            res.append(self.result(x, θo, φo))
+            res[-1]['energy'] = abs(x[10]) + abs(x[13])
+        return res
+
+    def result(self, x, θo, φo):
+        """
+        Structured result of the model (no chart, no printing).
 
         Parameters
         ----------
@@ -468,12 +681,18 @@ class MxCcRhTzBl:
 
         Returns
         -------
-        None.
-
+        res     dict
+            'x'         16 unknowns
+            'θ', 'w'    points o, M, s, C, S, I
+            'A'         adjacency matrix of processes MR, CC, MX, HC, TZ
+            'points'    names of the points
+            'Q'         {QtCC, QsCC, QlCC, QsHC, QsTZ, QlTZ} [W]
+            'm', 'mo', 'β'  actual mass flow rates and by-pass factor
+            'n_iter'    no. iterations of the last solve_lin
+            'converged' bool, the last solve_lin converged
         """
-        # Processes on psychrometric chart
         wo = psy.w(θo, φo)
-        # Points: O, s, S, I
+        # Points: o, M, s, C, S, I
         θ = np.append(θo, x[0:10:2])
         w = np.append(wo, x[1:10:2])
         # Points       0   1  2  3  4  5       Elements
@@ -482,27 +701,133 @@ class MxCcRhTzBl:
                       [0, 0, -1, 1, -1, 0],     # MX
                       [0, 0, 0, -1, 1, 0],      # HC
                       [0, 0, 0, 0, -1, 1]])     # TZ
-        psy.chartA(θ, w, A)
-
-        θ = pd.Series(θ)
-        w = 1000 * pd.Series(w)         # kg/kg -> g/kg
-        P = pd.concat([θ, w], axis=1)   # points
-        P.columns = ['θ [°C]', 'w [g/kg]']
-
-        output = P.to_string(formatters={
-            'θ [°C]': '{:,.2f}'.format,
-            'w [g/kg]': '{:,.2f}'.format})
-        print()
-        print(output)
-
-        Q = pd.Series(x[10:], index=['QtCC', 'QsCC', 'QlCC', 'QsHC',
-                                     'QsTZ', 'QlTZ'])
-        # Q.columns = ['kW']
-        pd.options.display.float_format = '{:,.2f}'.format
-        print()
-        print(Q.to_frame().T / 1000, 'kW')
+        Q = dict(zip(['QtCC', 'QsCC', 'QlCC', 'QsHC', 'QsTZ', 'QlTZ'],
+                     x[10:]))
+        return {'x': x, 'θ': θ, 'w': w, 'A': A,
+                'points': ['o', 'M', 's', 'C', 'S', 'I'], 'Q': Q,
+                'm': self.actual[0], 'mo': self.actual[1],
+                'β': self.actual[2], 'n_iter': self.n_iter,
+                'converged': self.status['converged']}
+
+    def psy_chart(self, x, θo, φo):
+        """
+        Plot results on psychrometric chart.
+
+        Parameters
+        ----------
+        x : θM, wM, θs, ws, θC, wC, θS, wS, θI, wI,
+            QtCC, QsCC, QlCC, QsHC, QsTZ, QlTZ
+                    results of self.solve_lin or self.m_ls
+        θo, φo      outdoor point
+
+        Returns
+        -------
+        None.
+
+        """
+        psy.show(self.result(x, θo, φo))
         return None
 
+    def CAV(self, θo=32, φo=0.80, θIsp=26, φIsp=0.5,
+            mi=1.35, UA=675, QsBL=34_000, QlBL=4_000):
+        """
+        Constant air volume (CAV), computation only (no chart, no printing).
+
+        Returns
+        -------
+        res     dict, see *self.result*
+        """
+        self.actual[5:] = np.array([θo, φo, θIsp, φIsp,
+                                    mi, UA, QsBL, QlBL])
+        # self.actual[5:] = θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla
+
+        x = self.solve_lin()        # warm start from previous θs
+        return self.result(x, θo, φo)
+
+    def VAV(self, value='θS', sp=18, θo=32, φo=0.5, θIsp=24, φIsp=0.5,
+            mi=1.35, UA=675, QsBL=34_000, QlBL=4_000, m0=None):
+        """
+        Variable air volume (VAV), computation only (no chart, no printing).
+
+        Parameters
+        ----------
+        value       {"θS", "wI"}' type of value controlled
+        sp          set point for the controlled value
+        θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla
+        m0          initial guess of m, see *self.m_ls*
+
+        Returns
+        -------
+        res     dict, see *self.result*, and
+            'success'   bool, m solves value = sp (else m minimizes the error)
+            'nfev'      number of evaluations of ε(m) by least_squares
+            'cost'      cost of least_squares, ε²/2
+        """
+        self.actual[5:] = θo, φo, θIsp, φIsp, mi, UA, QsBL, QlBL
+
+        x = self.m_ls(value, sp, m0)
+        return self.result(x, θo, φo) | self.ls_status
+
+    def VBP(self, value='θS', sp=18, θo=32, φo=0.5, θIsp=24, φIsp=0.5,
+            mi=1.35, UA=675, Qsa=34_000, Qla=4_000, β0=None):
+        """
+        Variable by-pass (VBP), computation only (no chart, no printing).
+
+        Parameters
+        ----------
+        value       {"θS", "wI"}' type of value controlled
+        sp          set point for the controlled value
+        θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla
+        β0          initial guess of β, see *self.β_ls*
+
+        Returns
+        -------
+        res     dict, see *self.result*, and
+            'success'   bool, β solves value = sp (else β minimizes the error)
+            'nfev'      number of evaluations of ε(β) by least_squares
+            'cost'      cost of least_squares, ε²/2
+        """
+        self.actual[5:] = θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla
+
+        x = self.β_ls(value, sp, β0)
+        return self.result(x, θo, φo) | self.ls_status
+
+    def sequence(self, kind, points, predictor='last'):
+        """
+        Ordered sequence of operating points (hours of a day, positions
+        of a slider, grid of a sweep) solved by CAV, VAV or VBP.
+            The initial guesses of each point, θs and m (VAV) or β (VBP),
+            are predicted from the solutions of the previous points
+            (*solvers.predict*): warm start or secant continuation.
+
+        Parameters
+        ----------
+        kind        'CAV', 'VAV' or 'VBP'
+        points      list of dict, keyword arguments of self.CAV, self.VAV
+                    or self.VBP for each point
+        predictor   'last' or 'secant', see *solvers.predict*
+
+        Returns
+        -------
+        res         list of dict, see *self.result*; self.n_total gives
+                    the total number of iterations of solve_lin
+        """
+        if kind not in ('CAV', 'VAV', 'VBP'):
+            print('ERROR in sequence: kind not in {"CAV", "VAV", "VBP"}')
+            return None
+        solve = getattr(self, kind)
+        guess = {'VAV': 'm0', 'VBP': 'β0'}.get(kind)
+        θs, p, res = [], [], []
+        for point in points:
+            if θs:
+                self.θs = solvers.predict(θs, predictor)
+            if guess and p:
+                point = point | {guess: solvers.predict(p, predictor)}
+            res.append(solve(**point))
+            θs.append(res[-1]['x'][2])
+            p.append(res[-1][{'m0': 'm', 'β0': 'β'}.get(guess, 'm')])
+        return res
+
     def CAV_wd(self, θo=32, φo=0.80, θIsp=26, φIsp=0.5,
                mi=1.35, UA=675, QsBL=34_000, QlBL=4_000):
         """
@@ -515,20 +840,12 @@ class MxCcRhTzBl:
         -------
         None.
         """
-        # To use fewer variables in Jupyter widget:
-        # select what to be updated in self.actual, e.g.:
-        # self.actual[[0, 1, 2, 5, 6]] = m, θo, φo, 1000 * QsTZ, 1000 * QlTZ
-        self.actual[5:] = np.array([θo, φo, θIsp, φIsp,
-                                    mi, UA, QsBL, QlBL])
-        # self.actual[5:] = θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla
-
-        θ0 = 40
-        x = self.solve_lin(θ0)
-        # print(f'm = {self.actual[0]: .3f} kg/s,\
-        #       mo = {self.actual[1]: .3f} kg/s')
+        res = self.CAV(θo, φo, θIsp, φIsp, mi, UA, QsBL, QlBL)
+        if not res['converged']:
+            print(f'solve_lin: no convergence in {res["n_iter"]} iterations')
         print('m = {m: .3f} kg/s, mo = {mo: .3f} kg/s'.format(
-            m=self.actual[0], mo=self.actual[1]))
-        self.psy_chart(x, self.actual[5], self.actual[6])
+            m=res['m'], mo=res['mo']))
+        psy.show(res)
 
     def VAV_wd(self, value='θS', sp=18, θo=32, φo=0.5, θIsp=24, φIsp=0.5,
                mi=1.35, UA=675, QsBL=34_000, QlBL=4_000):
@@ -584,13 +901,12 @@ class MxCcRhTzBl:
                              |<-----------------------[K]-------------|<-θI
 
         """
-        # Design values
-        self.actual[5:] = θo, φo, θIsp, φIsp, mi, UA, QsBL, QlBL
-
-        x = self.m_ls(value, sp)
+        res = self.VAV(value, sp, θo, φo, θIsp, φIsp, mi, UA, QsBL, QlBL)
+        if not res['success']:
+            print('RecAirVAV: No solution for m')
         print('m = {m: .3f} kg/s, mo = {mo: .3f} kg/s'.format(
-            m=self.actual[0], mo=self.actual[1]))
-        self.psy_chart(x, θo, φo)
+            m=res['m'], mo=res['mo']))
+        psy.show(res)
 
     def VBP_wd(self, value='θS', sp=18, θo=32, φo=0.5, θIsp=24, φIsp=0.5,
                mi=1.35, UA=675, Qsa=34_000, Qla=4_000):
@@ -646,15 +962,196 @@ class MxCcRhTzBl:
                              |                 |<-----[K]-------------|<-wI
                              |<-----------------------[K]-------------|<-θI
         """
-        # Design values
-        self.actual[5:] = θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla
-
-        x = self.β_ls(value, sp)
+        res = self.VBP(value, sp, θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla)
+        if not res['success']:
+            print('RecAirVBP: No solution for β')
         print('m = {m: .3f} kg/s, mo = {mo: .3f} kg/s, β = {β: .3f}'.format(
-            m=self.actual[0], mo=self.actual[1], β=self.actual[2]))
-        self.psy_chart(x, θo, φo)
+            m=res['m'], mo=res['mo'], β=res['β']))
+        psy.show(res)
 
-        return x
+        return res['x']
+
+
+def system(parameters, inputs):
+    """
+    Matrix A and vector b of the linear model of MxCcRhTzBl,
+    without the tangent to the saturation curve (row 4 is zero).
+    Vectorized: parameters and inputs can be scalars or arrays of N
+    operating points (broadcasted).
+
+    Parameters
+    ----------
+    parameters  m, mo, β, Kθ, Kw
+    inputs      θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla
+
+    Returns
+    -------
+    A       (16, 16) or (N, 16, 16) np.array, coefficients of unknowns
+    b       (16,) or (N, 16) np.array, vector of inputs
+    """
+    m, mo, β, Kθ, Kw, θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla = \
+        np.broadcast_arrays(*parameters, *inputs)
+    wo = psy.w(θo, φo)      # hum. out
+    wIsp = psy.w(θIsp, φIsp)
+
+    # Non-zero coefficients of unknowns (row, column, value)
+    Aij = [
+        # MX1
+        (0, 0, m * c), (0, 8, -(m - mo) * c),
+        (1, 1, m * l), (1, 9, -(m - mo) * l),
+        # CC
+        (2, 0, (1 - β) * m * c), (2, 2, -(1 - β) * m * c), (2, 11, 1),
+        (3, 1, (1 - β) * m * l), (3, 3, -(1 - β) * m * l), (3, 12, 1),
+        (5, 10, -1), (5, 11, 1), (5, 12, 1),
+        # MX2
+        (6, 0, β * m * c), (6, 2, (1 - β) * m * c), (6, 4, -m * c),
+        (7, 1, β * m * l), (7, 3, (1 - β) * m * l), (7, 5, -m * l),
+        # HC
+        (8, 4, m * c), (8, 6, -m * c), (8, 13, 1),
+        (9, 5, m * l), (9, 7, -m * l),
+        # TZ
+        (10, 6, m * c), (10, 8, -m * c), (10, 14, 1),
+        (11, 7, m * l), (11, 9, -m * l), (11, 15, 1),
+        # BL
+        (12, 8, UA + mi * c), (12, 14, 1),
+        (13, 9, mi * l), (13, 15, 1),
+        # Kθ indoor temperature controller
+        (14, 8, Kθ), (14, 10, 1),
+        # Kw indoor humidity ratio controller
+        (15, 9, Kw), (15, 13, 1)]
+    # Non-zero inputs (row, value)
+    bi = [(0, mo * c * θo),                     # MX1
+          (1, mo * l * wo),
+          (12, (UA + mi * c) * θo + Qsa),       # BL
+          (13, mi * l * wo + Qla),
+          (14, Kθ * θIsp),                      # Kθ
+          (15, Kw * wIsp)]                      # Kw
+
+    i, j, a = zip(*Aij)
+    A = np.zeros(m.shape + (16, 16))    # coefficents of unknowns
+    A[..., i, j] = np.stack(np.broadcast_arrays(m, *a), axis=-1)[..., 1:]
+    i, v = zip(*bi)
+    b = np.zeros(m.shape + (16,))       # vector of inputs
+    b[..., i] = np.stack(v, axis=-1)
+    return A, b
+
+
+def ideal(parameters, inputs):
+    """
+    Ideal controllers of MxCcRhTzBl: Kθ and/or Kw = np.inf.
+        The controller equations (rows 14, 15) are removed and the
+        indoor temperature θI and humidity ratio wI (unknowns 8, 9) are
+        imposed, θI = θIsp and wI = w(θIsp, φIsp) (see solvers.py).
+
+    Parameters
+    ----------
+    parameters  m, mo, β, Kθ, Kw
+    inputs      θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla
+
+    Returns
+    -------
+    rows, cols, x_sp    given by *solvers.ideal*
+    """
+    Kθ, Kw = parameters[3:5]
+    θIsp, φIsp = inputs[2:4]
+    return solvers.ideal([Kθ, Kw], [14, 15], [8, 9],
+                         [θIsp, psy.w(θIsp, φIsp)])
+
+
+def solve_batch(parameters, inputs, θs0=θs_0, tol=0.01e-3, max_iter=20,
+                full_output=False, method='lapack'):
+    """
+    Solves MxCcRhTzBl for N operating points at once.
+        The N systems are stacked in an (N, 16, 16) array and the
+        saturation point is found by Newton iterations (as in
+        *MxCcRhTzBl.solve_lin*) for all points simultaneously; only the
+        points which did not converge are solved again.
+
+    Parameters
+    ----------
+    parameters  m, mo, β, Kθ, Kw; scalars or arrays of N values
+    inputs      θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla; scalars or arrays
+    θs0         initial guess saturation temperature, scalar or N values
+    tol         kg/kg, tolerance on |psy.w(θs, 1) - ws|
+    max_iter    maximum number of iterations
+    full_output if True, returns also the no. of iterations and convergence
+    method      'lapack': np.linalg.solve of the stacked systems;
+                'gen': straight-line evaluators of lin_gen.py (symbolic
+                elimination, see codegen.py), faster, no matrices
+
+    Returns
+    -------
+    x           (N, 16) np.array, for each point:
+                θM, wM, θs, ws, θC, wC, θS, wS, θI, wI,
+                QtCC, QsCC, QlCC, QsHC, QsTZ, QlTZ
+                NaN for the points with a singular system (e.g. m = 0)
+    If full_output is True, returns (x, n_iter, converged)
+    n_iter      (N,) np.array, number of iterations of each point
+    converged   (N,) np.array of bool (False for singular points)
+    """
+    t0 = time.perf_counter()
+    parameters = np.atleast_1d(*parameters)
+    inputs = np.atleast_1d(*inputs)
+    if method == 'gen':
+        A = None
+        m, mo, β, Kθ, Kw, θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla = \
+            np.broadcast_arrays(*parameters, *inputs)
+        v = (m, mo, β, Kθ, Kw, θo, psy.w(θo, φo),
+             θIsp, psy.w(θIsp, φIsp), mi, UA, Qsa, Qla)
+        f = getattr(lin_gen, 'cool_' + ''.join(
+            'I' if k else 'K' for k in solvers.is_ideal([Kθ, Kw])))
+        N = m.shape[0]
+
+        def lin(active, wsp0, b4):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return f(*(vk[active] for vk in v), wsp0, b4)
+    else:
+        A, b = system(parameters, inputs)
+        N = A.shape[0]
+        A[:, 4, 3] = -1
+        rows, cols, x_sp = ideal(parameters, inputs)
+        A, Ac, eqs, free = solvers.reduce(A, rows, cols)
+        b = solvers.rhs(b, Ac, eqs, x_sp)
+        x_sp = np.broadcast_to(x_sp, (N, len(cols)))
+
+        def lin(active, wsp0, b4):
+            A[active, 4, 2] = wsp0
+            b[active, 4] = b4
+            Aa, ba = A[active], b[active]
+            try:
+                xr = np.linalg.solve(Aa, ba[..., None])[..., 0]
+            except np.linalg.LinAlgError:   # point by point, singular: NaN
+                xr = np.full(ba.shape, np.nan)
+                for i in range(len(Aa)):
+                    try:
+                        xr[i] = np.linalg.solve(Aa[i], ba[i])
+                    except np.linalg.LinAlgError:
+                        pass
+            return solvers.restore(xr, free, cols, x_sp[active])
+    θs = np.broadcast_to(np.asarray(θs0, dtype=float), (N,)).copy()
+    x = np.zeros((N, 16))
+    n_iter = np.zeros(N, dtype=int)
+    converged = np.zeros(N, dtype=bool)
+    singular = np.zeros(N, dtype=bool)      # no solution: x is NaN
+
+    t1 = time.perf_counter()
+    for k in range(1, max_iter + 1):
+        active = ~(converged | singular)
+        ws0, wsp0, _ = psy.wsat(θs[active])
+        x[active] = lin(active, wsp0, wsp0 * θs[active] - ws0)
+        n_iter[active] = k
+        singular[active] = ~np.isfinite(x[active]).all(axis=-1)
+        x[singular] = np.nan
+        θs[active] = x[active, 2]
+        converged[active] = abs(psy.w(x[active, 2], 1) - x[active, 3]) < tol
+        if (converged | singular).all():
+            break
+    instrument.record('cool.solve_batch', A=A, time_assembly=t1 - t0,
+                      time_solve=time.perf_counter() - t1, N=N,
+                      n_iter=n_iter.sum(), converged=converged.all())
+    if full_output:
+        return x, n_iter, converged
+    return x
 
 
 # TESTS: uncomment
@@ -722,6 +1219,8 @@ class MxCcRhTzBl:
 # Explanation
 # The thermal zone characteristics cuts the saturation curve in two points.
 # """
+# # all the solutions at once:
+# cool.VBP_all('φI', φI, θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla)
 
 # """
 # Controlling θS with β: NO SOLUTION
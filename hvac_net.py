@@ -0,0 +1,706 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+
+HVAC networks: elements assembled and solved automatically
+
+An HVAC system is a list of elements connected by points of moist air
+(θ, w). Each element gives its equations (blocks of the elementary
+processes, see README.md). *Network* assembles the equations once into
+index arrays of the matrix A and vector b of A x = b and solves the
+system for scalar inputs or for arrays of N operating points.
+
+Elements
+--------
+MX      mixing of air flows (2 eq.)
+CC      cooling coil, outlet on the saturation curve (4 eq.)
+HC      heating coil (2 eq.)
+VH      vapor humidifier (2 eq.)
+AH      adiabatic humidifier, outlet on the saturation curve (2 eq.)
+TZ      thermal zone (2 eq.)
+BL      building: sensible & latent loads of the thermal zone (2 eq.)
+Kθ, Kw  indoor temperature & humidity ratio controllers (1 eq.)
+F       fan (2 eq., outlet = inlet)
+
+Points
+------
+Unknown points: outlets of the elements (2 unknowns: θ, w).
+Boundary points (e.g. outdoor air 'o'): points which are not outlets;
+they are inputs given by θ<point>, φ<point> in the values.
+
+Values of the elements (mass flow rates, gains, set points, loads) are:
+    str         name of a value, e.g. 'm'
+    number      constant
+    function    of the dict of values, e.g. lambda v: (1 - v['β']) * v['m']
+Values are scalars or arrays of N operating points (broadcasted).
+
+Unknowns
+--------
+θ, w of the points in the order of the elements, then the heat flow
+rates Q in the order of the elements, e.g. for cool.MxCcRhTzBl:
+θM, wM, θs, ws, θC, wC, θS, wS, θI, wI, QtCC, QsCC, QlCC, QsHC, QsTZ, QlTZ
+
+The saturation points (CC, AH) are found by Newton iterations on the
+tangent to the saturation curve (as in cool.MxCcRhTzBl.solve_lin).
+Controllers with K = np.inf are ideal (see solvers.py).
+
+Large networks (e.g. many thermal zones served by one AHU, *zones*) are
+solved with Network(elements, sparse=True): A is stored as
+scipy.sparse CSC with the structure (indices, indptr) computed once; its
+LU factorization (splu) is reused while A does not change and the
+saturation points are found by low-rank (Woodbury) updates of the
+factorization, as in ad_hum.ModelRecAir. One operating point per call.
+
+Example
+-------
+net = hn.cool()             # layout of cool.MxCcRhTzBl
+x = net.solve(dict(m=3.1, mo=1, β=0.2, Kθ=1e10, Kw=0,
+                   θo=θo, φo=0.8, θIsp=26, φIsp=0.5,    # θo: np.array
+                   mi=1.35, UA=675, Qsa=34_000, Qla=4_000))
+x[:, net.index['QtCC']]
+psy.show(net.result(x[0], values))
+"""
+import time
+import numpy as np
+import psychro as psy
+import solvers
+import instrument
+from functools import lru_cache
+from scipy import sparse
+from scipy.sparse.linalg import splu
+
+# constants
+c = 1e3         # J/kg K, air specific heat
+l = 2496e3      # J/kg, latent heat
+
+θs_ref = 10     # °C, tangent to saturation curve in the factorized matrix
+_, wsp_ref, _ = psy.wsat(θs_ref)
+
+
+def _fn(value):
+    """
+    Function of the dict of values from a name, a constant or a function.
+    """
+    if callable(value):
+        return value
+    if isinstance(value, str):
+        return lambda v: v[value]
+    return lambda v: value
+
+
+def _k(k, f):
+    """
+    Function k * f(v).
+    """
+    return lambda v: k * f(v)
+
+
+def _one(v):
+    return 1
+
+
+class _Saturation:
+    """
+    Equation of the tangent to the saturation curve in point.
+    """
+
+    def __init__(self, point):
+        self.point = point
+
+
+class Element:
+    """
+    Element of an HVAC network.
+
+    Attributes
+    ----------
+    name        str, used in the names of the heat flow rates
+    inlets      list of inlet points
+    outlet      outlet point; None for BL and controllers
+    Q           list of names of heat flow rates (unknowns)
+    """
+    inlets, outlet, Q = [], None, []
+
+    def equations(self):
+        """
+        Rows of the element. A row is a list of terms (variable, f),
+        i.e. f(v) * variable, with variable:
+            ('θ', point), ('w', point), ('Q', name) on the left side;
+            None for the right side (b).
+        """
+        return []
+
+    def _balance(self, x, m, Q=None):
+        """
+        Balance of a flow m: m k x_in - m k x_out + Q = 0, k = c or l
+        """
+        k = c if x == 'θ' else l
+        row = [((x, self.inlets[0]), _k(k, m)),
+               ((x, self.outlet), _k(-k, m))]
+        if Q is not None:
+            row.append((('Q', Q), _one))
+        return row
+
+
+class MX(Element):
+    """
+    Mixing: Σ mi xi - (Σ mi) x = 0, x = θ, w
+
+    inlets      list of (point, mass flow rate)
+    outlet      point
+    """
+
+    def __init__(self, name, inlets, outlet):
+        self.name, self.outlet = name, outlet
+        self.inlets = [p for p, _ in inlets]
+        self.m = [_fn(m) for _, m in inlets]
+
+    def equations(self):
+        def m(v):
+            return sum(mi(v) for mi in self.m)
+        rows = []
+        for x, k in (('θ', c), ('w', l)):
+            rows.append([((x, p), _k(k, mi))
+                         for p, mi in zip(self.inlets, self.m)]
+                        + [((x, self.outlet), _k(-k, m))])
+        return rows
+
+
+class HC(Element):
+    """
+    Heating coil: sensible heat flow rate Qs<name>
+    """
+
+    def __init__(self, name, inlet, outlet, m):
+        self.name, self.inlets, self.outlet = name, [inlet], outlet
+        self.m = _fn(m)
+        self.Q = ['Qs' + name]
+
+    def equations(self):
+        return [self._balance('θ', self.m, self.Q[0]),
+                self._balance('w', self.m)]
+
+
+class VH(Element):
+    """
+    Vapor humidifier: latent heat flow rate Ql<name>
+    """
+
+    def __init__(self, name, inlet, outlet, m):
+        self.name, self.inlets, self.outlet = name, [inlet], outlet
+        self.m = _fn(m)
+        self.Q = ['Ql' + name]
+
+    def equations(self):
+        return [self._balance('θ', self.m),
+                self._balance('w', self.m, self.Q[0])]
+
+
+class TZ(Element):
+    """
+    Thermal zone: sensible & latent loads Qs<name>, Ql<name>
+    """
+
+    def __init__(self, name, inlet, outlet, m):
+        self.name, self.inlets, self.outlet = name, [inlet], outlet
+        self.m = _fn(m)
+        self.Q = ['Qs' + name, 'Ql' + name]
+
+    def equations(self):
+        return [self._balance('θ', self.m, self.Q[0]),
+                self._balance('w', self.m, self.Q[1])]
+
+
+class CC(Element):
+    """
+    Cooling coil: outlet on the saturation curve (apparatus dew point),
+    total, sensible & latent heat flow rates Qt<name>, Qs<name>, Ql<name>
+    """
+
+    def __init__(self, name, inlet, outlet, m):
+        self.name, self.inlets, self.outlet = name, [inlet], outlet
+        self.m = _fn(m)
+        self.Q = ['Qt' + name, 'Qs' + name, 'Ql' + name]
+
+    def equations(self):
+        Qt, Qs, Ql = self.Q
+        return [self._balance('θ', self.m, Qs),
+                self._balance('w', self.m, Ql),
+                _Saturation(self.outlet),
+                [(('Q', Qt), lambda v: -1), (('Q', Qs), _one),
+                 (('Q', Ql), _one)]]
+
+
+class AH(Element):
+    """
+    Adiabatic humidifier: isenthalpic, outlet on the saturation curve
+    """
+
+    def __init__(self, name, inlet, outlet):
+        self.name, self.inlets, self.outlet = name, [inlet], outlet
+
+    def equations(self):
+        i, o = self.inlets[0], self.outlet
+        return [[(('θ', i), lambda v: c), (('w', i), lambda v: l),
+                 (('θ', o), lambda v: -c), (('w', o), lambda v: -l)],
+                _Saturation(o)]
+
+
+class F(Element):
+    """
+    Fan: outlet = inlet (heat gain neglected)
+    """
+
+    def __init__(self, name, inlet, outlet):
+        self.name, self.inlets, self.outlet = name, [inlet], outlet
+
+    def equations(self):
+        return [self._balance(x, _one) for x in ('θ', 'w')]
+
+
+class BL(Element):
+    """
+    Building: (UA + mi c)(θo - θI) + Qsa = QsTZ
+              mi l (wo - wI) + Qla = QlTZ
+
+    zone, outdoor   points of indoor and outdoor air
+    TZ              name of the thermal zone (loads QsTZ, QlTZ)
+    """
+
+    def __init__(self, name, zone, outdoor, TZ='TZ',
+                 UA='UA', mi='mi', Qsa='Qsa', Qla='Qla'):
+        self.name, self.zone, self.outdoor = name, zone, outdoor
+        self.TZ = TZ
+        self.UA, self.mi = _fn(UA), _fn(mi)
+        self.Qsa, self.Qla = _fn(Qsa), _fn(Qla)
+
+    def equations(self):
+        def G(v):
+            return self.UA(v) + self.mi(v) * c
+
+        def Gl(v):
+            return self.mi(v) * l
+        return [[(('θ', self.zone), G), (('Q', 'Qs' + self.TZ), _one),
+                 (('θ', self.outdoor), _k(-1, G)), (None, self.Qsa)],
+                [(('w', self.zone), Gl), (('Q', 'Ql' + self.TZ), _one),
+                 (('w', self.outdoor), _k(-1, Gl)), (None, self.Qla)]]
+
+
+class Kθ(Element):
+    """
+    Temperature controller: K θ + Q = K θsp; K = np.inf: ideal
+    """
+
+    def __init__(self, name, point, Q, K='Kθ', sp='θIsp'):
+        self.name, self.point, self.Qc = name, point, Q
+        self.K, self.sp = _fn(K), _fn(sp)
+        self.control = ('θ', point)
+
+    def equations(self):
+        return [[(self.control, self.K), (('Q', self.Qc), _one),
+                 (None, lambda v: self.K(v) * self.sp(v))]]
+
+
+class Kw(Kθ):
+    """
+    Humidity ratio controller: K w + Q = K wsp, wsp = w(θsp, φsp);
+    K = np.inf: ideal
+    """
+
+    def __init__(self, name, point, Q, K='Kw', θsp='θIsp', φsp='φIsp'):
+        θsp, φsp = _fn(θsp), _fn(φsp)
+        super().__init__(name, point, Q, K,
+                         sp=lambda v: psy.w(θsp(v), φsp(v)))
+        self.control = ('w', point)
+
+
+class Network:
+    """
+    HVAC network compiled from a list of elements.
+
+    Attributes
+    ----------
+    elements    list of elements
+    points      all points (boundary and unknown), for the chart
+    boundary    boundary points (inputs θ<point>, φ<point>)
+    unknowns    names of the unknowns, e.g. ['θM', 'wM', ..., 'QtCC', ...]
+    Q           names of the heat flow rates
+    index       dict {name of unknown: index in x}
+    sparse      bool, sparse matrix & LU factorization (one point / call)
+    """
+
+    def __init__(self, elements, sparse=False):
+        self.elements = elements
+        self.sparse = sparse
+        outlets = [e.outlet for e in elements if e.outlet is not None]
+        inlets = [p for e in elements for p in e.inlets]
+        self.boundary = list(dict.fromkeys(
+            p for p in inlets if p not in outlets))
+        self.points = self.boundary + outlets
+        self.Q = Q = list(dict.fromkeys(q for e in elements for q in e.Q))
+        col = {(x, p): 2 * k + i
+               for k, p in enumerate(outlets) for i, x in enumerate('θw')}
+        col.update({('Q', q): 2 * len(outlets) + k for k, q in enumerate(Q)})
+        self.unknowns = [x + p for p in outlets for x in 'θw'] + Q
+        self.index = {name: j for j, name in enumerate(self.unknowns)}
+        n = len(self.unknowns)
+
+        # Assembly: terms of A and b, saturation rows, controllers
+        Aij, bi = {}, {}
+        self.sat, self.ctrl = [], []
+        rows = [row for e in elements for row in e.equations()]
+        if len(rows) != n:
+            raise ValueError(f'Network: {len(rows)} equations '
+                             f'for {n} unknowns')
+        for i, row in enumerate(rows):
+            if isinstance(row, _Saturation):
+                self.sat.append((i, col[('θ', row.point)],
+                                 col[('w', row.point)]))
+                Aij[(i, col[('θ', row.point)])] = [lambda v: wsp_ref]
+                Aij[(i, col[('w', row.point)])] = [lambda v: -1]
+                continue
+            for var, f in row:
+                if var is None:
+                    bi.setdefault(i, []).append(f)
+                elif var in col:
+                    Aij.setdefault((i, col[var]), []).append(f)
+                else:               # boundary point: moved to b
+                    bi.setdefault(i, []).append(
+                        lambda v, f=f, x=var[0] + var[1]: -f(v) * v[x])
+        for i, e in enumerate(e for e in elements for _ in e.equations()):
+            if hasattr(e, 'control'):
+                self.ctrl.append((i, col[e.control], e.K, e.sp))
+
+        def total(fs):
+            return fs[0] if len(fs) == 1 else lambda v: sum(f(v) for f in fs)
+        self._Ai, self._Aj = (np.array(k) for k in zip(*Aij))
+        self._Af = [total(fs) for fs in Aij.values()]
+        self._bi = np.array(list(bi), dtype=int)
+        self._bf = [total(fs) for fs in bi.values()]
+
+        self._r, self._jθ, self._jw = np.array(
+            self.sat, dtype=int).reshape(-1, 3).T
+
+        # CSC structure: data = coefficients[self._perm]
+        self._perm = np.lexsort((self._Ai, self._Aj))
+        self._indices = self._Ai[self._perm]
+        self._indptr = np.append(0, np.cumsum(np.bincount(self._Aj,
+                                                          minlength=n)))
+        self._lu = None         # last factorization (sparse)
+
+    def values(self, values):
+        """
+        Dict of values completed with w<point> of the boundary points.
+        """
+        v = dict(values)
+        for p in self.boundary:
+            v['w' + p] = psy.w(v['θ' + p], v['φ' + p])
+        return v
+
+    def system(self, values):
+        """
+        Matrix A and vector b; saturation rows are the tangent in θs_ref.
+
+        Returns
+        -------
+        A       (n, n) or (N, n, n) np.array;
+                scipy.sparse.csc_matrix (n, n) if self.sparse
+        b       (n,) or (N, n) np.array
+        """
+        return self._system(self.values(values))
+
+    def _system(self, v):
+        n = len(self.unknowns)
+        if self.sparse:
+            data = np.array([f(v) for f in self._Af], dtype=float)
+            A = sparse.csc_matrix(
+                (data[self._perm], self._indices, self._indptr), (n, n))
+            b = np.zeros(n)
+            b[self._bi] = [f(v) for f in self._bf]
+            return A, b
+        a = np.broadcast_arrays(*[f(v) for f in self._Af])
+        A = np.zeros(a[0].shape + (n, n))
+        A[..., self._Ai, self._Aj] = np.stack(a, axis=-1)
+        b = np.zeros(n)
+        if len(self._bf):
+            s = np.broadcast_arrays(*[f(v) for f in self._bf])
+            b = np.zeros(s[0].shape + (n,))
+            b[..., self._bi] = np.stack(s, axis=-1)
+        return A, b
+
+    def _ideal(self, v):
+        """
+        Ideal controllers (K = np.inf), see solvers.ideal.
+        """
+        if not self.ctrl:
+            return np.zeros(0, int), np.zeros(0, int), np.zeros(0)
+        rows, cols, K, sp = zip(*self.ctrl)
+        return solvers.ideal([Ki(v) for Ki in K], rows, cols,
+                             [spi(v) for spi in sp])
+
+    def solve(self, values, θs0=5, tol=0.01e-3, max_iter=20,
+              full_output=False):
+        """
+        Solves the network for scalar values or arrays of N values
+        (one operating point if self.sparse).
+
+        Parameters
+        ----------
+        values      dict of values of the elements and θ<p>, φ<p> of
+                    the boundary points
+        θs0         °C, initial guess of the saturation temperatures
+        tol         kg/kg, tolerance on |psy.w(θs, 1) - ws|
+        max_iter    maximum number of iterations
+        full_output if True, returns also no. iterations and convergence
+
+        Returns
+        -------
+        x           (n,) or (N, n) np.array, see *self.unknowns*
+        If full_output is True, returns (x, n_iter, converged)
+        """
+        t0 = time.perf_counter()
+        v = self.values(values)
+        A, b = self._system(v)
+        rows, cols, x_sp = self._ideal(v)
+        t1 = time.perf_counter()
+        if self.sparse:
+            x, n_iter, converged = self._solve_sparse(
+                A, b, rows, cols, x_sp, θs0, tol, max_iter)
+            instrument.record('hvac_net.Network.solve', A=A,
+                              time_assembly=t1 - t0,
+                              time_solve=time.perf_counter() - t1,
+                              N=1, n_iter=n_iter, converged=converged)
+            if full_output:
+                return x, n_iter, converged
+            return x
+        shape = np.broadcast_shapes(A.shape[:-2], b.shape[:-1],
+                                    x_sp.shape[:-1])
+        n = len(self.unknowns)
+        if not self.sat:
+            x = solvers.solve(A, b, rows, cols, x_sp)
+            x = np.broadcast_to(x, shape + (n,))
+            n_iter, converged = np.zeros(shape, int), np.ones(shape, bool)
+        else:
+            x, n_iter, converged = self._newton(
+                A, b, rows, cols, x_sp, shape, θs0, tol, max_iter)
+        instrument.record('hvac_net.Network.solve', A=A,
+                          time_assembly=t1 - t0,
+                          time_solve=time.perf_counter() - t1,
+                          N=int(np.prod(shape)), n_iter=np.sum(n_iter),
+                          converged=np.all(converged))
+        if full_output:
+            return x, n_iter[()], converged[()]
+        return x
+
+    def _newton(self, A, b, rows, cols, x_sp, shape, θs0, tol, max_iter):
+        """
+        Newton iterations on the saturation points for N points at once;
+        only the points which did not converge are solved again.
+        """
+        n = len(self.unknowns)
+        N = int(np.prod(shape))
+        A = np.broadcast_to(A, shape + (n, n)).reshape(N, n, n)
+        b = np.broadcast_to(b, shape + (n,)).reshape(N, n)
+        x_sp = np.broadcast_to(x_sp, shape + x_sp.shape[-1:]).reshape(N, -1)
+        A, Ac, eqs, free = solvers.reduce(A, rows, cols)
+        b = solvers.rhs(b, Ac, eqs, x_sp)
+        r, jθ, jw = self._r, self._jθ, self._jw
+        ri, jθi = np.searchsorted(eqs, r), np.searchsorted(free, jθ)
+
+        θs = np.broadcast_to(np.asarray(θs0, dtype=float),
+                             (N, len(r))).copy()
+        x = np.zeros((N, n))
+        n_iter = np.zeros(N, dtype=int)
+        converged = np.zeros(N, dtype=bool)
+        for k in range(1, max_iter + 1):
+            a = np.flatnonzero(~converged)[:, None]
+            ws0, wsp0, _ = psy.wsat(θs[a[:, 0]])
+            A[a, ri, jθi] = wsp0
+            b[a, ri] = wsp0 * θs[a[:, 0]] - ws0
+            xr = np.linalg.solve(A[a[:, 0]], b[a[:, 0]][..., None])[..., 0]
+            x[a[:, 0]] = solvers.restore(xr, free, cols, x_sp[a[:, 0]])
+            n_iter[a[:, 0]] = k
+            θs[a[:, 0]] = x[a, jθ]
+            converged[a[:, 0]] = np.all(
+                abs(psy.w(x[a, jθ], 1) - x[a, jw]) < tol, axis=-1)
+            if converged.all():
+                break
+        else:
+            print(f'Network: {np.sum(~converged)} points did not converge '
+                  f'in {max_iter} iterations')
+        return (x.reshape(shape + (n,)), n_iter.reshape(shape),
+                converged.reshape(shape))
+
+    def _solve_sparse(self, A, b, rows, cols, x_sp, θs0, tol, max_iter):
+        """
+        Sparse LU of A0 (tangents in θs_ref), reused while A0 and the
+        ideal controllers do not change. The tangents in θs are the
+        rank-k update A = A0 + U diag(wsp - wsp_ref) V', U = e[r],
+        V = e[jθ], solved by the Woodbury formula in O(n k) per iteration.
+        """
+        key = (A.data.tobytes(), cols.tobytes())
+        if self._lu is None or self._lu[0] != key:
+            Ar, Ac, eqs, free = solvers.reduce(A, rows, cols)
+            lu = splu(Ar)
+            k = len(self.sat)
+            U = np.zeros((len(eqs), k))
+            U[np.searchsorted(eqs, self._r), np.arange(k)] = 1
+            Z = lu.solve(U) if k else U                 # A0⁻¹ U
+            self._lu = (key, lu, Z, Ac, eqs, free,
+                        np.searchsorted(free, self._jθ))
+        _, lu, Z, Ac, eqs, free, jθi = self._lu
+        jθ, jw = self._jθ, self._jw
+
+        y = lu.solve(solvers.rhs(b, Ac, eqs, x_sp))   # A0⁻¹ b0
+        if not self.sat:
+            return solvers.restore(y, free, cols, x_sp), 0, True
+        θs = np.broadcast_to(np.asarray(θs0, dtype=float), jθ.shape).copy()
+        I = np.eye(len(jθ))
+        for k in range(1, max_iter + 1):
+            ws0, wsp0, _ = psy.wsat(θs)
+            u = y + Z @ (wsp0 * θs - ws0)           # A0⁻¹ b
+            d = wsp0 - wsp_ref
+            xr = u - Z @ np.linalg.solve(I + d[:, None] * Z[jθi],
+                                         d * u[jθi])
+            x = solvers.restore(xr, free, cols, x_sp)
+            θs = x[jθ]
+            if np.all(abs(psy.w(θs, 1) - x[jw]) < tol):
+                return x, k, True
+        print(f'Network: no convergence in {max_iter} iterations')
+        return x, max_iter, False
+
+    def result(self, x, values):
+        """
+        Result of one operating point for *psy.show*.
+
+        Returns
+        -------
+        res     dict
+            'x'         unknowns
+            'θ', 'w'    all points (self.points)
+            'A'         adjacency matrix [elements with outlet, points]
+            'points'    names of the points
+            'Q'         {name: heat flow rate} [W]
+        """
+        v = self.values(values)
+        θ = np.array([x[self.index['θ' + p]] if p not in self.boundary
+                      else v['θ' + p] for p in self.points], dtype=float)
+        w = np.array([x[self.index['w' + p]] if p not in self.boundary
+                      else v['w' + p] for p in self.points], dtype=float)
+        processes = [e for e in self.elements if e.outlet is not None]
+        A = np.zeros((len(processes), len(self.points)), dtype=int)
+        for k, e in enumerate(processes):
+            A[k, [self.points.index(p) for p in e.inlets]] = -1
+            A[k, self.points.index(e.outlet)] = 1
+        Q = {q: x[self.index[q]] for q in self.Q}
+        return {'x': x, 'θ': θ, 'w': w, 'A': A,
+                'points': self.points, 'Q': Q}
+
+
+# Layouts of the models of the tutorials (compiled once)
+@lru_cache(maxsize=None)
+def cool():
+    """
+    Cooling & dehumidification, cool.MxCcRhTzBl.
+    Values: m, mo, β, Kθ, Kw, θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla
+    """
+    return Network([
+        MX('MX1', [('o', 'mo'), ('I', lambda v: v['m'] - v['mo'])], 'M'),
+        CC('CC', 'M', 's', lambda v: (1 - v['β']) * v['m']),
+        MX('MX2', [('M', lambda v: v['β'] * v['m']),
+                   ('s', lambda v: (1 - v['β']) * v['m'])], 'C'),
+        HC('HC', 'C', 'S', 'm'),
+        TZ('TZ', 'S', 'I', 'm'),
+        BL('BL', 'I', 'o'),
+        Kθ('Kθ', 'I', 'QtCC'),
+        Kw('Kw', 'I', 'QsHC')])
+
+
+@lru_cache(maxsize=None)
+def RecAirAH():
+    """
+    Heating & adiabatic humidification, recycled air, ad_hum.ModelRecAir.
+    Values: m, α, β, Kθ, Kw, θO, φO, θIsp, φIsp, mi, UA, Qsa, Qla
+    """
+    return Network([
+        MX('MX1', [('O', lambda v: v['α'] * v['m']),
+                   ('5', lambda v: (1 - v['α']) * v['m'])], '0'),
+        HC('HC1', '0', '1', 'm'),
+        AH('AH', '1', '2'),
+        MX('MX2', [('1', lambda v: v['β'] * v['m']),
+                   ('2', lambda v: (1 - v['β']) * v['m'])], '3'),
+        HC('HC2', '3', '4', 'm'),
+        TZ('TZ', '4', '5', 'm'),
+        BL('BL', '5', 'O'),
+        Kθ('Kθ', '5', 'QsHC1'),
+        Kw('Kw', '5', 'QsHC2')])
+
+
+@lru_cache(maxsize=None)
+def AllOutAirVH():
+    """
+    Heating & vapor humidification, all out air, va_hum.ModelAllOutAir.
+    Values: m, Kθ, Kw, θO, φO, θIsp, φIsp, mi, UA, Qsa, Qla
+    """
+    return Network([
+        HC('HC', 'O', '0', 'm'),
+        VH('VH', '0', '1', 'm'),
+        TZ('TZ', '1', '2', 'm'),
+        BL('BL', '2', 'O'),
+        Kθ('Kθ', '2', 'QsHC'),
+        Kw('Kw', '2', 'QlVH')])
+
+
+@lru_cache(maxsize=None)
+def RecAirVH():
+    """
+    Heating & vapor humidification, recycled air, va_hum.ModelRecAir.
+    Values: m, α, Kθ, Kw, θO, φO, θIsp, φIsp, mi, UA, Qsa, Qla
+    """
+    return Network([
+        MX('MX', [('O', lambda v: v['α'] * v['m']),
+                  ('3', lambda v: (1 - v['α']) * v['m'])], '0'),
+        HC('HC', '0', '1', 'm'),
+        VH('VH', '1', '2', 'm'),
+        TZ('TZ', '2', '3', 'm'),
+        BL('BL', '3', 'O'),
+        Kθ('Kθ', '3', 'QsHC'),
+        Kw('Kw', '3', 'QlVH')])
+
+
+def zones(n, sparse=True):
+    """
+    Cooling AHU (as in cool.MxCcRhTzBl) serving n thermal zones with
+    reheating coils (VAV boxes), as in 2zones.py. The temperature of
+    each zone is controlled by its reheating coil, the humidity of
+    zone 0 by the cooling coil.
+
+    Values: mo, β, Kθ, Kw, θo, φo, φIsp (zone 0) and arrays of n values
+            mz (mass flow rates of the zones), θIsp, UA, mi, Qsa, Qla
+
+    Points: o, R (return), M, s, C, S<k>, I<k> (k = 0 ... n-1)
+    """
+    def m(v):
+        return np.sum(v['mz'])
+
+    def zone(key, k):
+        return lambda v: v[key][k]
+
+    elements = [
+        MX('MX1', [('o', 'mo'), ('R', lambda v: m(v) - v['mo'])], 'M'),
+        CC('CC', 'M', 's', lambda v: (1 - v['β']) * m(v)),
+        MX('MX2', [('M', lambda v: v['β'] * m(v)),
+                   ('s', lambda v: (1 - v['β']) * m(v))], 'C')]
+    for k in range(n):
+        elements += [
+            HC(f'HC{k}', 'C', f'S{k}', zone('mz', k)),
+            TZ(f'TZ{k}', f'S{k}', f'I{k}', zone('mz', k)),
+            BL(f'BL{k}', f'I{k}', 'o', TZ=f'TZ{k}',
+               UA=zone('UA', k), mi=zone('mi', k),
+               Qsa=zone('Qsa', k), Qla=zone('Qla', k)),
+            Kθ(f'Kθ{k}', f'I{k}', f'QsHC{k}', sp=zone('θIsp', k))]
+    elements += [
+        MX('MXR', [(f'I{k}', zone('mz', k)) for k in range(n)], 'R'),
+        Kw('Kw', 'I0', 'QtCC', θsp=zone('θIsp', 0))]
+    return Network(elements, sparse)
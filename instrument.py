@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+
+Instrumentation of the solvers: timings, iterations and conditioning
+
+The solvers (cool, ad_hum, va_hum, mix, hvac_net) report each call by
+*record*: name of the solver, wall times of the phases (time_assembly,
+time_solve, ..., in s), number of iterations, number of evaluations of
+the outer optimizer (nfev), convergence... When no collector is active,
+*record* returns at once: the only cost for the solvers is a few calls
+of time.perf_counter.
+
+Condition numbers of the matrices are computed only if the collector is
+created with cond=True (costly: one SVD per call).
+
+CONTENTS
+========================================================================
+Collector   Context manager which collects the records of the calls.
+    frame   pd.DataFrame of the records, one row per call.
+    summary pd.DataFrame of the totals and means by solver.
+record      Records a call of a solver (used by the solvers).
+
+Example
+-------
+import instrument
+with instrument.Collector(cond=True) as col:
+    ahu.VAV(sp=16)
+    ad_hum.RecAirVAV_compute()
+col.summary()       # calls, total time, iterations, cond. by solver
+col.frame()         # one row per call
+"""
+import numpy as np
+import pandas as pd
+
+active = None       # collector in use; None: instrumentation off
+
+
+class Collector:
+    """
+    Collects the records of the calls of the solvers in a *with* block.
+    """
+
+    def __init__(self, cond=False):
+        """
+        cond    if True, condition number of the matrices (np.linalg.cond)
+        """
+        self.cond = cond
+        self.records = []
+
+    def __enter__(self):
+        global active
+        self._previous, active = active, self
+        return self
+
+    def __exit__(self, *exc):
+        global active
+        active = self._previous
+        return False
+
+    def add(self, name, A=None, **values):
+        """
+        Adds the record of a call (see *record*).
+        """
+        if self.cond and A is not None:
+            A = A.toarray() if hasattr(A, 'toarray') else A
+            values['cond'] = np.linalg.cond(A).max()
+        self.records.append({'name': name} | values)
+
+    def frame(self):
+        """
+        Records, one row per call (NaN: value not given by the solver).
+        """
+        return pd.DataFrame(self.records)
+
+    def summary(self):
+        """
+        By solver: number of calls, sums of times and of counts
+        (n_iter, nfev, N), mean and max of the other values.
+        """
+        df = self.frame()
+        if df.empty:
+            return df
+        g = df.groupby('name', sort=False)
+        res = pd.DataFrame({'calls': g.size()})
+        for k in df.columns.drop('name'):
+            if not pd.api.types.is_numeric_dtype(df[k]):
+                continue
+            if k.startswith('time') or k in ('n_iter', 'nfev', 'N'):
+                res[k] = g[k].sum()
+            else:
+                res[k + '_mean'] = g[k].mean()
+                res[k + '_max'] = g[k].max()
+        return res
+
+
+def record(name, A=None, **values):
+    """
+    Records a call of a solver in the active collector (if any).
+
+    Parameters
+    ----------
+    name        name of the solver, e.g. 'cool.solve_lin'
+    A           matrix of the system (for the condition number)
+    values      time_<phase> (s), n_iter, nfev, converged, ...
+    """
+    if active is not None:
+        active.add(name, A, **values)
@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Generated by codegen.py: do not edit.
+
+Straight-line evaluators of the linear models of cool.MxCcRhTzBl and
+ad_hum.ModelRecAir (16 unknowns), vectorized; see codegen.py.
+"""
+import numpy as np
+
+c = 1e3         # J/kg K, air specific heat
+l = 2496e3      # J/kg, latent heat
+
+
+def cool_KK(m, mo, β, Kθ, Kw, θo, wo, θIsp, wIsp, mi, UA, Qsa, Qla, wsp, b_s):
+    """
+    cool, controllers KK (K: finite gain, I: ideal).
+    Returns (..., 16) np.array: θM, wM, θs, ws, θC, wC, θS, wS, θI, wI, QtCC,
+    QsCC, QlCC, QsHC, QsTZ, QlTZ
+    """
+    t0 = c*mo*θo
+    t1 = -m + mo
+    t2 = c*t1
+    t3 = c*m
+    t4 = UA + c*mi
+    t5 = t3 + t4
+    t6 = 1/(-t2*β - t5)
+    t7 = l*t1
+    t8 = l*m
+    t9 = l*mi
+    t10 = t8 + t9
+    t11 = -t10 - t7*β
+    t12 = 1/wsp
+    t13 = 1/l
+    t14 = c*t12*t13
+    t15 = -Kw - t11*t14
+    t16 = β - 1
+    t17 = -t16
+    t18 = 1/t17
+    t19 = t12*t3
+    t20 = 1/m
+    t21 = t13*t20
+    t22 = t18*t21*(-t16*t19 - t16*t8)
+    t23 = t6*(Kθ - t16*t2)
+    t24 = l*mo*wo
+    t25 = Qla + t9*wo
+    t26 = t24*β + t25
+    t27 = -t26
+    t28 = Kw*wIsp
+    t29 = Qsa + t4*θo
+    t30 = b_s*t17*t19 + t0*β + t14*t27 + t28 + t29
+    t31 = ((Kθ*θIsp + b_s*c*m*t12*t16 - t0*t16 - t16*t24 - t22*t27 +
+           t23*t30)/(-t11*t22 - t15*t23 - t16*t7))
+    t32 = t6*(-t15*t31 - t30)
+    t33 = t0 - t2*t32
+    t34 = t20/c
+    t35 = t24 - t31*t7
+    t36 = t18*(-t11*t31 - t26)
+    t37 = t21*t36
+    t38 = t12*(b_s + t37)
+    t39 = -Kw*t31 + t28
+    t40 = t29 - t32*t5
+    t41 = t21*(t10*t31 - t25)
+    return np.stack(np.broadcast_arrays(
+        t33*t34,
+        t21*t35,
+        t38,
+        t37,
+        t34*(-t39 - t40),
+        t41,
+        -t34*t40,
+        t41,
+        t32,
+        t31,
+        -Kθ*t32 + Kθ*θIsp,
+        -t16*t3*t38 - t17*t33,
+        -t16*t36 - t17*t35,
+        t39,
+        t29 - t32*t4,
+        t25 - t31*t9), axis=-1)
+
+
+def cool_KI(m, mo, β, Kθ, Kw, θo, wo, θIsp, wIsp, mi, UA, Qsa, Qla, wsp, b_s):
+    """
+    cool, controllers KI (K: finite gain, I: ideal).
+    Returns (..., 16) np.array: θM, wM, θs, ws, θC, wC, θS, wS, θI, wI, QtCC,
+    QsCC, QlCC, QsHC, QsTZ, QlTZ
+    """
+    t0 = c*mo*θo
+    t1 = β - 1
+    t2 = -m + mo
+    t3 = c*t2
+    t4 = 1/(Kθ - t1*t3)
+    t5 = Kθ*θIsp
+    t6 = -t1
+    t7 = l*wo
+    t8 = l*wIsp
+    t9 = mo*t7 - t2*t8
+    t10 = Qla + mi*t7 - mi*t8
+    t11 = -l*m*wIsp + t10
+    t12 = (-t11 - t9*β)/t6
+    t13 = 1/m
+    t14 = t13/l
+    t15 = t12*t14
+    t16 = (b_s + t15)/wsp
+    t17 = c*m*t16
+    t18 = t1*t17
+    t19 = t1*t12 + t6*t9
+    t20 = -t0*t1 + t18 + t19 + t5
+    t21 = t20*t4
+    t22 = t0 - t21*t3
+    t23 = t13/c
+    t24 = t17*t6 + t22*β
+    t25 = -t11*t14
+    t26 = UA + c*mi
+    t27 = Qsa - t21*t26 + t26*θo
+    t28 = -c*m*t20*t4 + t27
+    return np.stack(np.broadcast_arrays(
+        t22*t23,
+        t14*t9,
+        t16,
+        t15,
+        t23*t24,
+        t25,
+        -t23*t28,
+        t25,
+        t21,
+        wIsp,
+        -Kθ*t21 + t5,
+        -t18 - t22*t6,
+        -t19,
+        -t24 - t28,
+        t27,
+        t10), axis=-1)
+
+
+def cool_IK(m, mo, β, Kθ, Kw, θo, wo, θIsp, wIsp, mi, UA, Qsa, Qla, wsp, b_s):
+    """
+    cool, controllers IK (K: finite gain, I: ideal).
+    Returns (..., 16) np.array: θM, wM, θs, ws, θC, wC, θS, wS, θI, wI, QtCC,
+    QsCC, QlCC, QsHC, QsTZ, QlTZ
+    """
+    t0 = -m + mo
+    t1 = c*θIsp
+    t2 = c*mo*θo - t0*t1
+    t3 = 1/m
+    t4 = t3/c
+    t5 = l*mo*wo
+    t6 = l*t0
+    t7 = l*mi
+    t8 = l*m + t7
+    t9 = -t6*β - t8
+    t10 = 1/l
+    t11 = 1/wsp
+    t12 = c*t11
+    t13 = t10*t12
+    t14 = Qla + t7*wo
+    t15 = t14 + t5*β
+    t16 = β - 1
+    t17 = -t16
+    t18 = b_s*m*t12*t17 + t2*β
+    t19 = UA + c*mi
+    t20 = Qsa - t19*θIsp + t19*θo
+    t21 = -m*t1 + t20
+    t22 = (Kw*wIsp - t13*t15 + t18 + t21)/(Kw + t13*t9)
+    t23 = -t22*t6 + t5
+    t24 = t10*t3
+    t25 = -t15 - t22*t9
+    t26 = t25/t17
+    t27 = t24*t26
+    t28 = t11*(b_s + t27)
+    t29 = t13*t25 + t18
+    t30 = t24*(-t14 + t22*t8)
+    t31 = c*m*t16*t28 + t17*t2
+    t32 = t16*t26 + t17*t23
+    return np.stack(np.broadcast_arrays(
+        t2*t4,
+        t23*t24,
+        t28,
+        t27,
+        t29*t4,
+        t30,
+        -t21*t4,
+        t30,
+        θIsp,
+        t22,
+        -t31 - t32,
+        -t31,
+        -t32,
+        -t21 - t29,
+        t20,
+        t14 - t22*t7), axis=-1)
+
+
+def cool_II(m, mo, β, Kθ, Kw, θo, wo, θIsp, wIsp, mi, UA, Qsa, Qla, wsp, b_s):
+    """
+    cool, controllers II (K: finite gain, I: ideal).
+    Returns (..., 16) np.array: θM, wM, θs, ws, θC, wC, θS, wS, θI, wI, QtCC,
+    QsCC, QlCC, QsHC, QsTZ, QlTZ
+    """
+    t0 = -m + mo
+    t1 = c*mo*θo - c*t0*θIsp
+    t2 = 1/m
+    t3 = t2/c
+    t4 = l*wo
+    t5 = l*wIsp
+    t6 = mo*t4 - t0*t5
+    t7 = t2/l
+    t8 = β - 1
+    t9 = -t8
+    t10 = Qla + mi*t4 - mi*t5
+    t11 = -l*m*wIsp + t10
+    t12 = (-t11 - t6*β)/t9
+    t13 = t12*t7
+    t14 = (b_s + t13)/wsp
+    t15 = c*m*t14
+    t16 = t1*β + t15*t9
+    t17 = -t11*t7
+    t18 = UA + c*mi
+    t19 = Qsa - t18*θIsp + t18*θo
+    t20 = -c*m*θIsp + t19
+    t21 = t1*t9 + t15*t8
+    t22 = t12*t8 + t6*t9
+    return np.stack(np.broadcast_arrays(
+        t1*t3,
+        t6*t7,
+        t14,
+        t13,
+        t16*t3,
+        t17,
+        -t20*t3,
+        t17,
+        θIsp,
+        wIsp,
+        -t21 - t22,
+        -t21,
+        -t22,
+        -t16 - t20,
+        t19,
+        t10), axis=-1)
+
+
+def ad_hum_KK(m, α, β, Kθ, Kw, θO, wO, θIsp, wIsp, mi, UA, Qsa, Qla, wsp, b_s):
+    """
+    ad_hum, controllers KK (K: finite gain, I: ideal).
+    Returns (..., 16) np.array: θ0, w0, θ1, w1, θ2, w2, θ3, w3, θ4, w4, θ5, w5,
+    QHC1, QHC2, QsTZ, QlTZ
+    """
+    t0 = c*m
+    t1 = t0*α*θO
+    t2 = α - 1
+    t3 = t0*t2
+    t4 = -Kθ - t3
+    t5 = UA + c*mi
+    t6 = t0 + t5
+    t7 = 1/(t4*β - t6)
+    t8 = l*t2
+    t9 = m*t8
+    t10 = l*m
+    t11 = l*mi
+    t12 = t10 + t11
+    t13 = -t12 - t9*β
+    t14 = 1/l
+    t15 = 1/wsp
+    t16 = c*t15
+    t17 = t14*t16
+    t18 = -Kw - t13*t17
+    t19 = 1 - β
+    t20 = 1/m
+    t21 = t14*t20
+    t22 = t21/t19
+    t23 = t22*(-l - t16)
+    t24 = t20*t4*t7
+    t25 = wO*α
+    t26 = Kθ*θIsp
+    t27 = t1 + t26
+    t28 = -t27
+    t29 = t10*t25
+    t30 = Qla + t11*wO
+    t31 = t29*β + t30
+    t32 = -t31
+    t33 = Kw*wIsp
+    t34 = Qsa + t5*θO
+    t35 = b_s*t0*t15*t19 + t17*t32 - t28*β + t33 + t34
+    t36 = ((b_s*c*t15 - l*t25 + t20*t28 - t23*t32 + t24*t35)/(-t13*t23 -
+           t18*t24 - t8))
+    t37 = t7*(-t18*t36 - t35)
+    t38 = t20/c
+    t39 = t29 - t36*t9
+    t40 = t22*(-t13*t36 - t31)
+    t41 = -Kw*t36 + t33
+    t42 = t34 - t37*t6
+    t43 = t21*(t12*t36 - t30)
+    return np.stack(np.broadcast_arrays(
+        t38*(t1 - t3*t37),
+        t21*t39,
+        -t38*(-t27 - t37*t4),
+        t21*t39,
+        t15*(b_s + t40),
+        t40,
+        t38*(-t41 - t42),
+        t43,
+        -t38*t42,
+        t43,
+        t37,
+        t36,
+        -Kθ*t37 + t26,
+        t41,
+        t34 - t37*t5,
+        -t11*t36 + t30), axis=-1)
+
+
+def ad_hum_KI(m, α, β, Kθ, Kw, θO, wO, θIsp, wIsp, mi, UA, Qsa, Qla, wsp, b_s):
+    """
+    ad_hum, controllers KI (K: finite gain, I: ideal).
+    Returns (..., 16) np.array: θ0, w0, θ1, w1, θ2, w2, θ3, w3, θ4, w4, θ5, w5,
+    QHC1, QHC2, QsTZ, QlTZ
+    """
+    t0 = c*m
+    t1 = t0*α*θO
+    t2 = α - 1
+    t3 = t0*t2
+    t4 = 1/(Kθ + t3)
+    t5 = 1/m
+    t6 = l*wO
+    t7 = l*wIsp
+    t8 = m*t7
+    t9 = -m*t6*α + t2*t8
+    t10 = t5*t9
+    t11 = 1 - β
+    t12 = mi*t7
+    t13 = mi*t6
+    t14 = t5*(-Qla + t12 - t13 + t8 + t9*β)/t11
+    t15 = 1/l
+    t16 = t14*t15
+    t17 = (b_s + t16)/wsp
+    t18 = c*t17 + t10 + t14
+    t19 = m*t18
+    t20 = Kθ*θIsp + t1 - t19
+    t21 = t20*t4
+    t22 = t21*t3
+    t23 = 1/c
+    t24 = t23*t5
+    t25 = t15*t5
+    t26 = t0*t11*t17 + t19*β
+    t27 = Qla - t12 + t13
+    t28 = t25*(l*m*wIsp - t27)
+    t29 = UA + c*mi
+    t30 = Qsa - t21*t29 + t29*θO
+    t31 = -c*m*t20*t4 + t30
+    return np.stack(np.broadcast_arrays(
+        t24*(t1 - t22),
+        -t25*t9,
+        t18*t23,
+        -t10*t15,
+        t17,
+        t16,
+        t24*t26,
+        t28,
+        -t24*t31,
+        t28,
+        t21,
+        wIsp,
+        -t1 + t19 + t22,
+        -t26 - t31,
+        t30,
+        t27), axis=-1)
+
+
+def ad_hum_IK(m, α, β, Kθ, Kw, θO, wO, θIsp, wIsp, mi, UA, Qsa, Qla, wsp, b_s):
+    """
+    ad_hum, controllers IK (K: finite gain, I: ideal).
+    Returns (..., 16) np.array: θ0, w0, θ1, w1, θ2, w2, θ3, w3, θ4, w4, θ5, w5,
+    QHC1, QHC2, QsTZ, QlTZ
+    """
+    t0 = c*m
+    t1 = t0*α*θO
+    t2 = α - 1
+    t3 = t0*θIsp
+    t4 = t2*t3
+    t5 = 1/m
+    t6 = 1/c
+    t7 = t5*t6
+    t8 = l*m
+    t9 = t8*wO*α
+    t10 = t2*t8
+    t11 = t10*β
+    t12 = l*mi
+    t13 = t12 + t8
+    t14 = -t11 - t13
+    t15 = 1/wsp
+    t16 = c*t15
+    t17 = 1 - β
+    t18 = m*t17
+    t19 = -l - t16
+    t20 = m*β
+    t21 = 1/l
+    t22 = t21*t5
+    t23 = t22/t17
+    t24 = t23*(t16*t18 - t19*t20)
+    t25 = Kw*wIsp
+    t26 = b_s*t16
+    t27 = t9*β
+    t28 = Qla + t12*wO
+    t29 = t27 + t28
+    t30 = UA + c*mi
+    t31 = Qsa - t30*θIsp + t30*θO
+    t32 = -t3 + t31
+    t33 = ((-t18*t26 - t20*t26 + t24*t29 - t25 + t27 - t32)/(-Kw + t11 -
+           t14*t24))
+    t34 = -t10*t33 + t9
+    t35 = -t34*t5
+    t36 = t23*(-t14*t33 - t29)
+    t37 = -t19*t36 + t26 + t35
+    t38 = -Kw*t33 + t25
+    t39 = t22*(t13*t33 - t28)
+    return np.stack(np.broadcast_arrays(
+        t7*(t1 - t4),
+        t22*t34,
+        t37*t6,
+        -t21*t35,
+        t15*(b_s + t36),
+        t36,
+        -t7*(t32 + t38),
+        t39,
+        -t32*t7,
+        t39,
+        θIsp,
+        t33,
+        m*t37 - t1 + t4,
+        t38,
+        t31,
+        -t12*t33 + t28), axis=-1)
+
+
+def ad_hum_II(m, α, β, Kθ, Kw, θO, wO, θIsp, wIsp, mi, UA, Qsa, Qla, wsp, b_s):
+    """
+    ad_hum, controllers II (K: finite gain, I: ideal).
+    Returns (..., 16) np.array: θ0, w0, θ1, w1, θ2, w2, θ3, w3, θ4, w4, θ5, w5,
+    QHC1, QHC2, QsTZ, QlTZ
+    """
+    t0 = c*m
+    t1 = t0*α*θO
+    t2 = α - 1
+    t3 = t0*t2*θIsp
+    t4 = 1/m
+    t5 = 1/c
+    t6 = t4*t5
+    t7 = l*wIsp
+    t8 = m*t7
+    t9 = -l*m*wO*α + t2*t8
+    t10 = 1/l
+    t11 = t10*t4
+    t12 = t4*t9
+    t13 = 1 - β
+    t14 = mi*t7
+    t15 = l*mi*wO
+    t16 = (-Qla + t14 - t15 + t8 + t9*β)/t13
+    t17 = t11*t16
+    t18 = (b_s + t17)/wsp
+    t19 = c*t18
+    t20 = t12 + t16*t4 + t19
+    t21 = m*t20
+    t22 = m*t13*t19 + t21*β
+    t23 = Qla - t14 + t15
+    t24 = t11*(l*m*wIsp - t23)
+    t25 = UA + c*mi
+    t26 = Qsa - t25*θIsp + t25*θO
+    t27 = -c*m*θIsp + t26
+    return np.stack(np.broadcast_arrays(
+        t6*(t1 - t3),
+        -t11*t9,
+        t20*t5,
+        -t10*t12,
+        t18,
+        t17,
+        t22*t6,
+        t24,
+        -t27*t6,
+        t24,
+        θIsp,
+        wIsp,
+        -t1 + t21 + t3,
+        -t22 - t27,
+        t26,
+        t23), axis=-1)
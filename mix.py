@@ -32,9 +32,17 @@ for: x = [θ2, w2, θ3, w3]. (Note: point 3 is on saturation curve)
 The systems is solved iterativelly till abs(psy.w(θ30, 1) - x[3]) is small.
 
 Plot results on psychrometric chart
+
+mixing_vec: the same model for arrays of (θ0, φ0, θ1, φ1, α), e.g. a
+whole mixing line or the hours of a weather file, in one call:
+mixing in closed form, then Newton iterations on the saturation curve
+only for the supersaturated points.
 """
+import time
 import numpy as np
 import psychro as psy
+import solvers
+import instrument
 
 
 # A * x = b ==> x = inv(A) * b
@@ -43,10 +51,23 @@ c = 1e3                     # J/(kg·K), air specific heat
 l = 2496e3                  # J/kg, latent heat
 
 
-def mixing(m=1, θ0=3, φ0=0.8, θ1=32, φ1=0.95, α=0.5):
+def mixing_compute(m=1, θ0=3, φ0=0.8, θ1=32, φ1=0.95, α=0.5,
+                   max_iter=20, accel='picard'):
     """
+    Computation of *mixing*, without chart and printing.
     Adiabatic mixing.
     If the point is in oversaturation, then adiabatic condensation.
+    max_iter, accel: iterations on θ3, see *solvers.fixed_point*
+
+    Returns
+    -------
+    res     dict
+        'x'     θ2, w2, θ3, w3 (with condensation) or θ2, w2
+        'θ', 'w'    points 0, 1, 2 (and 3) on psychrometric chart
+        'A'     adjacency matrix of processes MX (and AD)
+        'condensation'  bool, point 2 is oversaturated
+        'n_iter'    number of iterations of MX_AD
+        'status'    status of the iterations (None w/o condensation)
     """
     w0 = psy.w(θ0, φ0)
     w1 = psy.w(θ1, φ1)
@@ -73,7 +94,7 @@ def mixing(m=1, θ0=3, φ0=0.8, θ1=32, φ1=0.95, α=0.5):
         x = np.linalg.solve(A, b)
         return x
 
-    def MX_AD():
+    def MX_AD(θs0):
         """
         Mixing with given ration
         Adiabatic humidification / condensation
@@ -85,7 +106,7 @@ def mixing(m=1, θ0=3, φ0=0.8, θ1=32, φ1=0.95, α=0.5):
         c * θ2 + l * w2  - c * θ3 - l * w3 = 0          # [AH] h const.
         ws'(θ3) * θ3 - w3 = ws'(θ30) * θ30 - ws(θ30)    # [AH] saturation curve
 
-        where x = [θ2, w2, θ3, w3]
+        where x = [θ2, w2, θ3, w3]; saturation curve linearized in θs0
         """
         A = np.zeros((4, 4))            # coefficents of unknowns
         b = np.zeros(4)                 # vector of inputs
@@ -98,24 +119,27 @@ def mixing(m=1, θ0=3, φ0=0.8, θ1=32, φ1=0.95, α=0.5):
         A[2, 0], A[2, 1], A[2, 2], A[2, 3] = c, l, -c, -l
         b[2] = 0
 
-        A[3, 2], A[3, 3] = psy.wsp(θs0), -1
-        b[3] = psy.wsp(θs0) * θs0 - psy.w(θs0, 1)
+        ws0, wsp0, _ = psy.wsat(θs0)
+        A[3, 2], A[3, 3] = wsp0, -1
+        b[3] = wsp0 * θs0 - ws0
 
         x = np.linalg.solve(A, b)
         return x
 
-    θs0, Δ_θs = (θ0 + θ1) / 2, 2        # initial guess saturation temp.
+    t0 = time.perf_counter()
+    θs0, Δ_θs = (θ0 + θ1) / 2, 0.01     # initial guess, tolerance θs
 
-    x = MX_AD()
-    if x[1] > psy.w(x[0], 1):
+    x = MX_AD(θs0)
+    n_iter, status = 1, None
+    condensation = x[1] > psy.w(x[0], 1)
+    if condensation:
         # Model MX & AD
-        while Δ_θs > 0.01:
-            x = MX_AD()
-            Δ_θs = abs(θs0 - x[2])
-            θs0 = x[2]
+        def g(θs0):
+            x = MX_AD(θs0)
+            return x[2], x
 
-        print(f'θ2 = {x[0]:5.2f} °C, w2 = {1000*x[1]:5.2f} g/kg')
-        print(f'θ3 = {x[2]:5.2f} °C, w3 = {1000*x[3]:5.2f} g/kg')
+        _, x, status = solvers.fixed_point(g, x[2], Δ_θs, max_iter, accel)
+        n_iter += status['n_iter']
 
         # Processes on psychrometric chart
         # Points        0   1  2  3     Elements
@@ -123,17 +147,93 @@ def mixing(m=1, θ0=3, φ0=0.8, θ1=32, φ1=0.95, α=0.5):
                       [0, 0, -1, 1]])   # AD
         θ = np.append([θ0, θ1], x[0:4:2])   # θ0, θ1, θ2, θ3
         w = np.append([w0, w1], x[1:4:2])   # w0, w1, w2, w3
-        psy.chartA(θ, w, A)
     else:
         x = MX()
-        print(f'θ2 = {x[0]:5.2f} °C, w2 = {1000*x[1]:5.2f} g/kg')
-        print('---')
         # Processes on psychrometric chart
         # Points        0   1  2        Elements
         A = np.array([[-1, -1, 1]])     # MX
         θ = np.array([θ0, θ1, x[0]])    # θ0, θ1, θ2
         w = np.array([w0, w1, x[1]])    # w0, w1, w2
-        psy.chartA(θ, w, A)
+    instrument.record('mix.mixing', time_solve=time.perf_counter() - t0,
+                      n_iter=n_iter, condensation=condensation)
+    return {'x': x, 'θ': θ, 'w': w, 'A': A,
+            'condensation': condensation, 'n_iter': n_iter,
+            'status': status}
+
+
+def mixing_vec(θ0, φ0, θ1, φ1, α, tol=1e-6, max_iter=20):
+    """
+    Adiabatic mixing, vectorized: arrays in, arrays out (broadcasted).
+    If the mixed point 2 is oversaturated, then adiabatic condensation
+    to point 3 on the saturation curve, with the enthalpy of point 2:
+        c θ3 + l ws(θ3) = c θ2 + l w2
+    solved by Newton iterations (as MX_AD of *mixing_compute*) on the
+    oversaturated points only.
+
+    Parameters
+    ----------
+    θ0, φ0      temperature, relative humidity of flow 0
+    θ1, φ1      temperature, relative humidity of flow 1
+    α           ratio of flow 0 in the mixture
+    tol         °C, tolerance on θ3 between two iterations
+    max_iter    maximum number of iterations
+
+    Returns
+    -------
+    res     dict of np.arrays of the shape of the inputs
+        'θ2', 'w2'      mixing point
+        'θ3', 'w3'      point after condensation (= point 2 w/o condensation)
+        'condensation'  bool, point 2 is oversaturated
+        'n_iter'        number of Newton iterations
+        'converged'     bool, the iterations converged
+    """
+    t0 = time.perf_counter()
+    θ0, φ0, θ1, φ1, α = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (θ0, φ0, θ1, φ1, α)))
+    w0, w1 = psy.w(θ0, φ0), psy.w(θ1, φ1)
+    θ2 = α * θ0 + (1 - α) * θ1                  # [MX] sensible
+    w2 = α * w0 + (1 - α) * w1                  # [MX] latent
+
+    condensation = w2 > psy.w(θ2, 1)
+    θ3, w3 = θ2.copy(), w2.copy()
+    θs, h = θ2[condensation], c * θ2[condensation] + l * w2[condensation]
+    n_iter, converged = 0, True
+    for n_iter in range(1, max_iter + 1):
+        if θs.size == 0:
+            n_iter = 0
+            break
+        ws, wsp, _ = psy.wsat(θs)
+        Δ_θs = (h - c * θs - l * ws) / (c + l * wsp)    # [AH] Newton
+        θs = θs + Δ_θs
+        if np.all(abs(Δ_θs) < tol):
+            break
+    else:
+        converged = False
+    θ3[condensation] = θs
+    w3[condensation] = psy.w(θs, 1)
+    instrument.record('mix.mixing_vec', time_solve=time.perf_counter() - t0,
+                      N=θ2.size, n_iter=n_iter,
+                      condensation=condensation.sum())
+    return {'θ2': θ2, 'w2': w2, 'θ3': θ3, 'w3': w3,
+            'condensation': condensation, 'n_iter': n_iter,
+            'converged': converged}
+
+
+def mixing(m=1, θ0=3, φ0=0.8, θ1=32, φ1=0.95, α=0.5):
+    """
+    Adiabatic mixing.
+    If the point is in oversaturation, then adiabatic condensation.
+    """
+    res = mixing_compute(m, θ0, φ0, θ1, φ1, α)
+    if res['status'] and not res['status']['converged']:
+        print(f'mixing: no convergence in {res["n_iter"]} iterations')
+    x = res['x']
+    print(f'θ2 = {x[0]:5.2f} °C, w2 = {1000*x[1]:5.2f} g/kg')
+    if res['condensation']:
+        print(f'θ3 = {x[2]:5.2f} °C, w3 = {1000*x[3]:5.2f} g/kg')
+    else:
+        print('---')
+    psy.chartA(res['θ'], res['w'], res['A'])
     return
 
 
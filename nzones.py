@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+
+N thermal zones served by one air handling unit (AHU)
+Generalization of 2zones.py: the characteristics of the zones are arrays
+of n values and the computation is vectorized (no loop on zones).
+
+Summer: cooling and dehumidification
+    mixing of recycled air of the zones (MR) and outdoor air (MX),
+    cooling coil (CC) with by-pass factor b, reheating coils (HC<k>).
+    The supply temperature θS of the reference zone (0) is given; the
+    supply humidity ratio wS is the same for all zones.
+Winter: heating and vapor humidification
+    mass flow rates of zones from summer design,
+    heating coils (HC<k>) and vapor humidifiers (VH<k>) of each zone.
+
+CONTENTS (functions)
+========================================================================
+loads   Sensible and latent loads of the zones.
+summer  Cooling and dehumidification, mass flow rates of the zones.
+winter  Heating and humidification for the mass flow rates of summer.
+
+Example
+-------
+import nzones
+s = nzones.summer(θO=29, φO=0.6, mO=0.7, θTZ=θTZ, φTZ=φTZ,
+                  A=A, mi=mi, n_p=n_p, θS0=13, b=0.3)   # arrays of n zones
+w = nzones.winter(θO=0, φO=1, mO=0.7, θTZ=θTZ, φTZ=φTZ,
+                  A=A, mi=mi, n_p=n_p, m=s['m'])
+"""
+import numpy as np
+import psychro as psy
+
+# constants
+ca = 1e3                    # J/(kg·K), dry air specific heat
+lv = 2496e3                 # J/kg, latent heat of vaporisation
+
+# characteristics of the building (2zones.py)
+U = 0.22                    # W/(m²K)
+qsp = 83                    # W, sensible heat per person
+mvp = 71e-3 / 3600          # kg/s, vapor mass flow per person
+
+
+def loads(θO, φO, θTZ, φTZ, A, mi, n_p, step=None, rnd=np.ceil):
+    """
+    Sensible and latent loads of the thermal zones.
+
+    Parameters
+    ----------
+    θO, φO      outdoor air, °C, -
+    θTZ, φTZ    arrays (n,), indoor air of the zones, °C, -
+    A           arrays (n,), surface area of the zones, m²
+    mi          arrays (n,), mass flow rate of outdoor air, kg/s
+    n_p         arrays (n,), number of persons
+    step        W, loads rounded to multiples of step (None: no rounding)
+    rnd         rounding function, np.ceil (summer) or np.floor (winter)
+
+    Returns
+    -------
+    QsTZ, QlTZ  arrays (n,), sensible & latent loads, W
+    """
+    wTZ = psy.w(θTZ, φTZ)
+    wO = psy.w(θO, φO)
+    QsTZ = (U * A + mi * ca) * (θO - θTZ) + n_p * qsp
+    QlTZ = mi * lv * (wO - wTZ) + n_p * mvp * lv
+    if step is not None:
+        QsTZ = rnd(QsTZ / step) * step
+        QlTZ = rnd(QlTZ / step) * step
+    return QsTZ, QlTZ
+
+
+def summer(θO, φO, mO, θTZ, φTZ, A, mi, n_p, θS0, b, step=250):
+    """
+    Cooling and dehumidification of n zones.
+
+    Parameters
+    ----------
+    θO, φO      outdoor air, °C, -
+    mO          kg/s, mass flow rate of outdoor air
+    θTZ, φTZ, A, mi, n_p    arrays (n,), see *loads*
+    θS0         °C, supply air temperature of zone 0
+    b           -, by-pass factor of cooling coil
+    step        W, rounding of loads (see *loads*)
+
+    Returns
+    -------
+    res     dict
+        QsTZ, QlTZ      loads of the zones, W
+        m               mass flow rates of the zones, kg/s
+        θS, wS          supply air of the zones
+        θM1, wM1        mixing of the zones (recycled air)
+        θM2, wM2        mixing of recycled and outdoor air
+        θh, wh          apparatus dew point (effective surface of CC)
+        θCC, wCC        outlet of cooling coil
+        QsCC, QlCC, QtCC    loads of the cooling coil, W
+        QHC             loads of the reheating coils of the zones, W
+        Qtot            W, total energy
+    """
+    θTZ, φTZ = np.asarray(θTZ, dtype=float), np.asarray(φTZ, dtype=float)
+    QsTZ, QlTZ = loads(θO, φO, θTZ, φTZ, A, mi, n_p, step, np.ceil)
+    wTZ = psy.w(θTZ, φTZ)
+    wO = psy.w(θO, φO)
+
+    # Supply air: zone 0 from θS0, the others from the latent load
+    m0 = QsTZ[0] / (ca * (θTZ[0] - θS0))
+    wS = (m0 * lv * wTZ[0] - QlTZ[0]) / (m0 * lv)
+    m = QlTZ / (lv * (wTZ - wS))
+    m[0] = m0
+    θS = θTZ - QsTZ / (m * ca)
+
+    # Cooling coil
+    θM1, wM1 = m @ θTZ / m.sum(), m @ wTZ / m.sum()   # MR zones
+    M = m.sum()
+    θM2 = ((M - mO) * θM1 + mO * θO) / M                # MX outdoor
+    wM2 = ((M - mO) * wM1 + mO * wO) / M
+    wh = (wS - b * wM2) / (1 - b)
+    θh = psy.t(wh, phi=1)
+    θCC = (1 - b) * θh + b * θM2
+    wCC = (1 - b) * wh + b * wM2
+    QsCC = M * ca * (θCC - θM2)
+    QlCC = M * lv * (wS - wM2)
+    QtCC = QsCC + QlCC
+
+    # Reheating coils
+    QHC = m * ca * (θS - θCC)
+    return {'QsTZ': QsTZ, 'QlTZ': QlTZ, 'm': m,
+            'θS': θS, 'wS': np.full_like(θS, wS),
+            'θM1': θM1, 'wM1': wM1, 'θM2': θM2, 'wM2': wM2,
+            'θh': θh, 'wh': wh, 'θCC': θCC, 'wCC': wCC,
+            'QsCC': QsCC, 'QlCC': QlCC, 'QtCC': QtCC, 'QHC': QHC,
+            'Qtot': abs(QtCC) + QHC.sum()}
+
+
+def winter(θO, φO, mO, θTZ, φTZ, A, mi, n_p, m, step=250):
+    """
+    Heating and vapor humidification of n zones.
+
+    Parameters
+    ----------
+    θO, φO      outdoor air, °C, -
+    mO          kg/s, mass flow rate of outdoor air
+    θTZ, φTZ, A, mi, n_p    arrays (n,), see *loads*
+    m           arrays (n,), mass flow rates of the zones (from *summer*)
+    step        W, rounding of loads (see *loads*)
+
+    Returns
+    -------
+    res     dict
+        QsTZ, QlTZ      loads of the zones, W
+        θS, wS          supply air of the zones
+        θM1, wM1        mixing of the zones (recycled air)
+        θM2, wM2        mixing of recycled and outdoor air
+        QsHC, QlVH      loads of heating coils and vapor humidifiers, W
+        mv              kg/s, vapor mass flow rates of the humidifiers
+    """
+    θTZ, φTZ = np.asarray(θTZ, dtype=float), np.asarray(φTZ, dtype=float)
+    m = np.asarray(m, dtype=float)
+    QsTZ, QlTZ = loads(θO, φO, θTZ, φTZ, A, mi, n_p, step, np.floor)
+    wTZ = psy.w(θTZ, φTZ)
+    wO = psy.w(θO, φO)
+
+    # Supply air
+    θS = θTZ - QsTZ / (m * ca)
+    wS = wTZ - QlTZ / (m * lv)
+
+    # Mixing
+    M = m.sum()
+    θM1, wM1 = m @ θTZ / M, m @ wTZ / M
+    θM2 = ((M - mO) * θM1 + mO * θO) / M
+    wM2 = ((M - mO) * wM1 + mO * wO) / M
+
+    # Heating coils & vapor humidifiers
+    QsHC = m * ca * (θS - θM2)
+    QlVH = m * lv * (wS - wM2)
+    return {'QsTZ': QsTZ, 'QlTZ': QlTZ, 'θS': θS, 'wS': wS,
+            'θM1': θM1, 'wM1': wM1, 'θM2': θM2, 'wM2': wM2,
+            'QsHC': QsHC, 'QlVH': QlVH, 'mv': QlVH / lv}
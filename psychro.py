@@ -4,29 +4,58 @@ Created on Wed May 25 21:01:26 2022
 
 Psychrometry
 pvs(t)      pressure of saturated vapor
+dpvs(t)     derivative of pvs(t) with respect to temperature
+pvs_table(t)    pvs(t) interpolated in a precomputed table
+wsat(ts)    humidity ratio at saturation, its derivative and pvs
+show(res)   psychrometric chart and tables of the results of a model
 v(t, r)     specific volume
+t(w, phi)   temperature (inverse of w(t, phi)), vectorized Newton
 """
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.optimize import fsolve
 
 # Constants
 Mv = 18.015_286             # [kg/kmol] vapor molaire mass
 Mda = 28.966                # [kg/kmol] air molaire mass
 R = 8_314.462_618_153_24    # [J/(kmol*K)] ideal gaz constant
 
+# Saturation pressure backend used by pvs(t) & dpvs(t) when backend=None:
+# 'exact'   Hyland-Wexler equation
+# 'table'   cubic Hermite interpolation in a table (see pvs_table); same
+#           values within 1e-10; faster only in compiled code
+#           (psychro_jit: pvs about 3x, w about 2x), not with NumPy
+pvs_backend = 'exact'
+
+# Table of pvs & dpvs, built once per process at first use of pvs_table
+t_table = (-60, 200, 0.1)   # [°C] t_min, t_max, step of the table
+_table = None
+
 
 def p(Z):
     # Atmospheric pressure function of altitude (-500 .. 10000 m):
     return 101325 * (1 - 2.25577e-5 * Z)**5.2559     # [Pa]
 
 
-def pvs(t):
+def _backend(backend):
+    """
+    Backend of pvs: psychro.pvs_backend if None; unknown: reported,
+    'exact' used.
+    """
+    backend = pvs_backend if backend is None else backend
+    if backend not in ('exact', 'table'):
+        print(f'pvs: unknown backend {backend}; exact used')
+        return 'exact'
+    return backend
+
+
+def pvs(t, backend=None):
     """
     Saturation vapor pressure as a function of tempetature
     t [°C]
+    backend : 'exact' or 'table'; default None, i.e. psychro.pvs_backend
     """
-    import numpy as np
+    if _backend(backend) == 'table':
+        return pvs_table(t)
     T = t + 273.15      # [K] Temperature
     # pws(T) [Pa] saturation pressure over liquid water
     # for temp range [0 200] °C eq. (6)
@@ -41,14 +70,106 @@ def pvs(t):
     return pws
 
 
-def w(t, phi, Z=0):
+def dlnpvs(t):
+    """
+    Derivative of the logarithm of saturation vapor pressure
+    d(ln pvs)/dt [1/K] (analytic derivative of the exponent of pvs)
+    t [°C]
+    """
+    T = t + 273.15      # [K] Temperature
+    C8 = -5.800_220_6e3
+    C10 = -4.864_023_9e-2
+    C11 = 4.176_476_8e-5
+    C12 = -1.445_209_3e-8
+    C13 = 6.545_967_3e0
+    return -C8 / T**2 + C10 + 2 * C11 * T + 3 * C12 * T**2 + C13 / T
+
+
+def dpvs(t, backend=None):
+    """
+    Derivative of saturation vapor pressure with respect to temperature
+    dpvs/dt [Pa/K]
+    t [°C]
+    backend : 'exact' or 'table'; default None, i.e. psychro.pvs_backend
+    """
+    if _backend(backend) == 'table':
+        return pvs_table(t, derivative=True)
+    return pvs(t, 'exact') * dlnpvs(t)
+
+
+def pvs_table(t, derivative=False):
+    """
+    Saturation vapor pressure interpolated in a precomputed table.
+
+    The table of pvs(t) and dpvs(t) (Hyland-Wexler) is built once per
+    process on the grid t_table = (t_min, t_max, step), default
+    (-60, 200, 0.1) °C. Values are interpolated by cubic Hermite
+    polynomials. The relative error with respect to the exact equation
+    is bounded by step**4 / 384 * max(dlnpvs)**4 (Hermite remainder);
+    for the default grid, the maximum relative error is < 1e-10 for
+    pvs and < 1e-8 for dpvs (checked in test_psychro.py). Outside
+    [t_min, t_max] the exact equation is used.
+
+    Parameters
+    ----------
+    t : temperature [°C], float or np.array
+    derivative : if True, returns dpvs/dt [Pa/K], i.e. the derivative of
+        the interpolating polynomial (consistent with the values of pvs)
+
+    Returns
+    -------
+    pvs [Pa] or dpvs/dt [Pa/K]
+    """
+    t_min, t_max, h = t_table
+    c0, c1, c2, c3 = _hermite()
+
+    t = np.asarray(t, dtype=float)
+    nan = np.isnan(t)
+    # NaN: indexed by a finite stand-in, then set back to NaN
+    s = np.clip((np.where(nan, t_min, t) - t_min) / h, 0, len(c0) - 1e-9)
+    i = s.astype(np.intp)
+    u = s - i
+    if derivative:
+        y = (c1[i] + u * (2 * c2[i] + 3 * u * c3[i])) / h
+    else:
+        y = ((c3[i] * u + c2[i]) * u + c1[i]) * u + c0[i]
+    y = np.where(nan, np.nan, y)
+
+    out = (t < t_min) | (t > t_max)
+    if out.any():
+        y = np.where(out, dpvs(t, 'exact') if derivative
+                     else pvs(t, 'exact'), y)
+    return y[()]
+
+
+def _hermite():
+    """
+    Coefficients c0, c1, c2, c3 of the Hermite polynomials of pvs_table,
+    c0 + c1*u + c2*u² + c3*u³ on each interval of t_table (u in [0, 1)).
+    Built once per process (again if t_table is changed).
+    """
+    global _table
+    t_min, t_max, h = t_table
+    if _table is None or _table[0] != t_table:
+        tk = np.linspace(t_min, t_max, int(round((t_max - t_min) / h)) + 1)
+        P, hdP = pvs(tk, 'exact'), h * dpvs(tk, 'exact')
+        ΔP = P[1:] - P[:-1]
+        _table = (t_table, P[:-1], hdP[:-1],
+                  3 * ΔP - 2 * hdP[:-1] - hdP[1:],
+                  -2 * ΔP + hdP[:-1] + hdP[1:])
+    return _table[1:]
+
+
+def w(t, phi, Z=0, backend=None):
     """
     Humidity ratio as a function of temperature and relative humidity
     t : temperature [°C]
     phi : relative humidity [-]
     Z : altitude [m]; default value = 0
+    backend : of pvs, 'exact' or 'table'; default psychro.pvs_backend
     """
-    w = Mv / Mda * phi * pvs(t) / (p(Z) - phi * pvs(t))
+    pv = phi * pvs(t, backend)
+    w = Mv / Mda * pv / (p(Z) - pv)
     return w
 
 
@@ -77,6 +198,43 @@ def wsp(ts, Z=0):
     return wp
 
 
+def wsat(ts, Z=0, backend=None):
+    """
+    Saturation curve and its tangent, in one evaluation.
+    Humidity ratio at saturation, ws = w(ts, 1, Z), its exact derivative
+    dws/dts and the saturation pressure pvs(ts), from the same pvs model
+    (Hyland-Wexler or its table, see pvs).
+
+    Parameters
+    ----------
+    ts : temperature on saturation curve [°C], float or np.array
+    Z  : altitude [m]; default value = 0
+    backend : of pvs, 'exact' or 'table'; default psychro.pvs_backend
+
+    Returns
+    -------
+    ws  : humidity ratio at saturation [kg/kg_da]
+    wsp : derivative dws/dts [kg/(kg_da·K)]
+    ps  : saturation vapor pressure [Pa]
+
+    Example
+    -------
+    Saturation curve linearized in θs0:
+    ws, wsp, _ = psy.wsat(θs0)
+    w = wsp * (θ - θs0) + ws
+    """
+    backend = _backend(backend)
+    ps = pvs(ts, backend)
+    if backend == 'table':
+        dps = dpvs(ts, backend)
+    else:
+        dps = ps * dlnpvs(ts)
+    pZ = p(Z)
+    ws = Mv / Mda * ps / (pZ - ps)
+    wsp = Mv / Mda * pZ * dps / (pZ - ps)**2
+    return ws, wsp, ps
+
+
 def v(t, w, Z=0):
     """
     Specific volume as a function of température and humidity ratio
@@ -89,44 +247,73 @@ def v(t, w, Z=0):
     return v
 
 
-def phi(t, w, Z=0):
+def phi(t, w, Z=0, backend=None):
     """
     Relative humidity as a function of temperature and humidity ratio
     for a given altitude (default 0 m)
     t : temperature [°C]
     w : humidity ratio [kg/kg_da]
     Z : altitude [m]; default value = 0
+    backend : of pvs, 'exact' or 'table'; default psychro.pvs_backend
     """
-    phi = p(Z) / pvs(t) * w / (Mv / Mda + w)
+    phi = p(Z) / pvs(t, backend) * w / (Mv / Mda + w)
     return phi
 
 
-def t(w, phi, Z=0, tol=1e-6, max_iter=100):
+def t(w, phi, Z=0, tol=1e-6, max_iter=100, full_output=False):
     """
     Temperature as a function of humidity ratio and relative humidity
     (Inverse function of w(t, phi, Z))
 
+    w, phi and Z can be scalars or NumPy arrays (broadcasted).
+    The equation pvs(t) = pv / phi, where pv is the vapor pressure
+    given by w, is solved for ln(pvs) by Newton iterations on the
+    whole array at once, with the analytic derivative dlnpvs(t).
+    The initial guess is given by the inverse of Tetens' equation.
+
     w : humidity ratio [kg/kg]
     phi : relative humidity [-]
     Z : altitude [m]; default value = 0
-    tol : tolerance for convergence
+    tol : tolerance for convergence [°C]
     max_iter : maximum number of iterations
+    full_output : if True, returns also the convergence of each element
 
     Returns temperature t in °C
+    (float for scalar inputs, np.array otherwise);
+    NaN where there is no solution (phi <= 0, w <= 0 or NaN inputs)
+    If full_output is True, returns (t, converged)
+    converged : bool or np.array of bool, |Δt| < tol for each element
+                (False where t is NaN)
     """
-
-    def equation(t_guess):
-        p_ws = pvs(t_guess)
-        return (Mv / Mda) * phi * p_ws / (p(Z) - phi * p_ws) - w
-
-    # Initial guess (20°C in Kelvin)
-    t_initial_guess = 20.0
-
-    # Solve numerically
-    t_solution = fsolve(equation, t_initial_guess,
-                        xtol=tol, maxfev=max_iter)[0]
-
-    return t_solution
+    w, phi, Z = np.broadcast_arrays(*(np.asarray(x, dtype=float)
+                                      for x in (w, phi, Z)))
+    pv = p(Z) * w / (Mv / Mda + w)      # [Pa] vapor pressure
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ln_pvs = np.log(pv / phi)       # saturation pressure at t
+    # no solution (phi <= 0, w <= 0, NaN): NaN, not iterated
+    ln_pvs = np.where(np.isfinite(ln_pvs), ln_pvs, np.nan)
+    none = np.isnan(ln_pvs)
+
+    # Initial guess: inverse of Tetens' equation
+    a, b, C = 17.2693882, 273.16 - 35.86, 610.78
+    ln_r = ln_pvs - np.log(C)
+    t_sol = b * ln_r / (a - ln_r)
+
+    converged = np.zeros(t_sol.shape, dtype=bool)
+    for _ in range(max_iter):
+        if none.all():
+            break
+        Δt = (np.log(pvs(t_sol)) - ln_pvs) / dlnpvs(t_sol)
+        t_sol = t_sol - Δt
+        converged = np.abs(Δt) < tol
+        if (converged | none).all():
+            break
+
+    if t_sol.ndim == 0:
+        t_sol, converged = float(t_sol), bool(converged)
+    if full_output:
+        return t_sol, converged
+    return t_sol
 
 
 def chart(t, w,
@@ -231,3 +418,45 @@ def chartA(t, wv, A,
     plt.draw()
     plt.show()
     return None
+
+
+def show(res):
+    """
+    Plots the processes on psychrometric chart and prints the points and
+    the heat flow rates of a model result.
+
+    Parameters
+    ----------
+    res : dict, result of the compute functions of the models, with keys
+        'θ', 'w'    np.array, temperature and humidity ratio of points
+        'A'         np.array, adjacency matrix [processes, points]
+        'Q'         dict {name: heat flow rate [W]}; optional
+        'points'    list, names of the points; optional
+
+    Returns
+    -------
+    None.
+    """
+    import pandas as pd
+
+    chartA(res['θ'], res['w'], res['A'])
+
+    θ = pd.Series(res['θ'])
+    w = 1000 * pd.Series(res['w'])      # kg/kg -> g/kg
+    P = pd.concat([θ, w], axis=1)       # points
+    P.columns = ['θ [°C]', 'w [g/kg]']
+    if 'points' in res:
+        P.index = res['points']
+
+    output = P.to_string(formatters={
+        'θ [°C]': '{:,.2f}'.format,
+        'w [g/kg]': '{:,.2f}'.format})
+    print()
+    print(output)
+
+    if 'Q' in res:
+        Q = pd.Series(res['Q'])
+        pd.options.display.float_format = '{:,.2f}'.format
+        print()
+        print(Q.to_frame().T / 1000, 'kW')
+    return None
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+
+Linear systems of the HVAC models with ideal controllers
+
+A controller of gain K is modelled by the equation
+    K x[col] + Q = K x_sp
+where Q is the heat flow rate of the controlled element. For K -> ∞,
+the equation becomes x[col] = x_sp, i.e. an exact constraint. Instead of
+a row with a huge gain (e.g. K = 1e10, badly conditioned matrix), the
+ideal controllers (K = np.inf) are eliminated: their equations are
+removed and the controlled unknowns are moved to the right-hand side.
+The reduced system has the same unknowns Q; it is smaller and well
+conditioned.
+
+CONTENTS (functions)
+========================================================================
+is_ideal    Type of each controller: ideal (K = np.inf) or finite gain.
+ideal       Equations, unknowns and set points of the ideal controllers.
+reduce      Reduced matrix (cacheable: does not depend on set points).
+rhs         Right-hand side of the reduced system.
+restore     Vector of all unknowns from the solution of reduced system.
+solve       Solves A x = b with ideal controllers (single or batch).
+predict     Initial guess for the next point of a sequence (continuation).
+fixed_point Bounded fixed-point iterations x = g(x) with acceleration
+            (saturation loops of cool, ad_hum and mix).
+
+All functions work for a single system A (n, n), b (n,) or a stack of
+systems A (N, n, n), b (N, n); reduce, rhs and restore also for sparse A.
+
+Example
+-------
+rows, cols, x_sp = ideal([Kθ, Kw], [14, 15], [8, 9], [θIsp, wIsp])
+x = solve(A, b, rows, cols, x_sp)
+"""
+import numpy as np
+from scipy import sparse
+
+
+def is_ideal(K):
+    """
+    Type of each controller: ideal if its gain is np.inf.
+    A controller is either ideal or with finite gain for all the points
+    of a batch (the ideal controllers change the structure of the system).
+
+    Parameters
+    ----------
+    K       list of controller gains (scalars or arrays)
+
+    Returns
+    -------
+    k       np.array of bool, True for the ideal controllers
+
+    Raises
+    ------
+    ValueError  if an array of gains mixes np.inf and finite values
+    """
+    k = []
+    for i, Ki in enumerate(K):
+        inf = np.isinf(Ki)
+        if np.any(inf) and not np.all(inf):
+            raise ValueError(f'gain {i}: np.inf and finite values in the '
+                             'same batch; solve them in separate batches')
+        k.append(np.all(inf))
+    return np.array(k, dtype=bool)
+
+
+def ideal(K, rows, cols, sp):
+    """
+    Selects the ideal controllers, i.e. with K = np.inf (see *is_ideal*;
+    ValueError if a controller is ideal only for some points).
+
+    Parameters
+    ----------
+    K       list of controller gains (scalars or arrays)
+    rows    list, equation of each controller
+    cols    list, unknown controlled by each controller
+    sp      list, set point of each controller (scalars or arrays of N)
+
+    Returns
+    -------
+    rows    np.array, equations of the ideal controllers
+    cols    np.array, unknowns imposed by the ideal controllers
+    x_sp    np.array (k,) or (N, k), values of the imposed unknowns
+    """
+    k = is_ideal(K)
+    sp = np.stack(np.broadcast_arrays(*sp), axis=-1)
+    return np.array(rows)[k], np.array(cols)[k], sp[..., k]
+
+
+def reduce(A, rows, cols):
+    """
+    Removes the equations *rows* and the unknowns *cols* from A
+    (np.array or scipy.sparse matrix).
+
+    Returns
+    -------
+    Ar      A[eqs, free], matrix of the reduced system
+    Ac      A[eqs, cols], coefficients of the imposed unknowns
+    eqs     np.array, equations kept
+    free    np.array, unknowns of the reduced system
+    """
+    n = A.shape[-1]
+    eqs = np.delete(np.arange(n), rows)
+    free = np.delete(np.arange(n), cols)
+    if sparse.issparse(A):
+        A = A.tocsr()[eqs].tocsc()
+        return A[:, free], A[:, cols], eqs, free
+    return (A[..., eqs[:, None], free], A[..., eqs[:, None], cols],
+            eqs, free)
+
+
+def rhs(b, Ac, eqs, x_sp):
+    """
+    Right-hand side of the reduced system: b[eqs] - A[eqs, cols] x_sp
+    """
+    return b[..., eqs] - (Ac @ x_sp[..., None])[..., 0]
+
+
+def restore(xr, free, cols, x_sp):
+    """
+    Vector of all unknowns: x[free] = xr, x[cols] = x_sp
+    """
+    x_sp = np.broadcast_to(x_sp, xr.shape[:-1] + x_sp.shape[-1:])
+    x = np.empty(xr.shape[:-1] + (len(free) + len(cols),))
+    x[..., free] = xr
+    x[..., cols] = x_sp
+    return x
+
+
+def solve(A, b, rows, cols, x_sp):
+    """
+    Solves A x = b in which the equations *rows* are replaced by the
+    exact constraints x[cols] = x_sp.
+
+    Returns
+    -------
+    x       (n,) or (N, n) np.array
+    """
+    if len(cols) == 0:
+        return np.linalg.solve(A, b[..., None])[..., 0]
+    Ar, Ac, eqs, free = reduce(A, rows, cols)
+    xr = np.linalg.solve(Ar, rhs(b, Ac, eqs, x_sp)[..., None])[..., 0]
+    return restore(xr, free, cols, x_sp)
+
+
+def predict(p, predictor='secant'):
+    """
+    Initial guess for the next point of an ordered sequence of operating
+    points (hours of a day, positions of a slider, ...) from the
+    solutions of the previous points (natural-parameter continuation,
+    equal steps of the parameter).
+
+    Parameters
+    ----------
+    p           list of the solutions of the previous points (scalars or
+                arrays, e.g. θs, m, β), at least one
+    predictor   'last': p[-1] (warm start)
+                'secant': 2 p[-1] - p[-2] (linear extrapolation)
+
+    Returns
+    -------
+    p0          initial guess for the next point
+    """
+    if predictor not in ('last', 'secant'):
+        print(f'predict: unknown predictor {predictor}; last used')
+    if predictor == 'secant' and len(p) > 1:
+        return 2 * np.asarray(p[-1]) - np.asarray(p[-2])
+    return p[-1]
+
+
+def fixed_point(g, x0, tol, max_iter=20, accel='anderson', m=2,
+                error=None):
+    """
+    Fixed-point iterations x = g(x) with acceleration, a maximum number
+    of iterations and divergence detection.
+
+    Parameters
+    ----------
+    g           function x -> (g(x), y): new iterate and solution y of
+                the model for x (e.g. θs -> x[2], x of the linear model
+                with the saturation curve linearized in θs)
+    x0          initial guess (scalar or array)
+    tol         tolerance on the error
+    max_iter    maximum number of iterations (evaluations of g)
+    accel       'picard': x <- g(x)
+                'aitken': element-wise Aitken (secant) extrapolation
+                'anderson': Anderson mixing of the last m + 1 iterates
+    m           depth of the history of Anderson mixing
+    error       function (x, g(x), y) -> error compared to tol;
+                default None: max |g(x) - x|
+
+    Returns
+    -------
+    x           last iterate g(x) (solution if converged)
+    y           solution of the model for the last iterate
+    status      dict
+        'n_iter'    number of evaluations of g
+        'converged' bool, error < tol
+        'diverged'  bool, non-finite iterate or error increasing in
+                    three successive iterations
+        'error'     last error
+    """
+    if accel not in ('picard', 'aitken', 'anderson'):
+        print(f'fixed_point: unknown accel {accel}; picard used')
+        accel = 'picard'
+    x = np.asarray(x0, dtype=float)
+    G, R = [], []                   # history of g(x) and of g(x) - x
+    e_old, n_up = np.inf, 0
+    converged = diverged = False
+    for k in range(1, max_iter + 1):
+        gx, y = g(x)
+        gx = np.asarray(gx, dtype=float)
+        r = gx - x
+        e = np.max(abs(r)) if error is None else error(x, gx, y)
+        if not np.all(np.isfinite(gx)) or not np.isfinite(e):
+            diverged = True
+            break
+        if e < tol:
+            converged = True
+            break
+        n_up = n_up + 1 if e > e_old else 0
+        if n_up == 3:
+            diverged = True
+            break
+        e_old = e
+        G, R = (G + [gx])[-(m + 1):], (R + [r])[-(m + 1):]
+        if accel == 'picard' or len(R) == 1:
+            x = gx
+        elif accel == 'aitken':
+            dr = R[-1] - R[-2]
+            x = gx - np.divide(r * (G[-1] - G[-2]), dr,
+                               out=np.zeros_like(r), where=dr != 0)
+        else:
+            dR = np.diff(np.reshape(R, (len(R), -1)), axis=0)
+            dG = np.diff(np.reshape(G, (len(G), -1)), axis=0)
+            γ = np.linalg.lstsq(dR.T, r.ravel(), rcond=None)[0]
+            x = gx - np.reshape(γ @ dG, gx.shape)
+        if not np.all(np.isfinite(x)):
+            x = gx                  # extrapolation failed: plain step
+    return gx, y, {'n_iter': k, 'converged': converged,
+                   'diverged': diverged, 'error': e}
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+
+Columnar store of simulation results on disk (memory-mapped .npy files)
+
+A store is a directory with one .npy file per output of the model
+(θM.npy, wM.npy, ..., QtCC.npy, ...) and the file columns.txt (names of
+the columns, in order). Blocks of results (e.g. yielded by
+annual.simulate) are appended chunk by chunk: the data are written at
+the end of the files and the fixed-size header of 128 bytes (shape of
+the array) is rewritten. The columns are reopened without copy by
+np.load(..., mmap_mode='r'): only the pages used are read from disk.
+
+CONTENTS
+========================================================================
+Store           class
+    append      Appends a block of results (pd.DataFrame or dict).
+    columns     Names of the columns.
+    __getitem__ Column as a read-only memory map (np.memmap).
+    frame       pd.DataFrame of some columns and rows.
+    __len__     Number of rows.
+
+Example
+-------
+import annual
+from store import Store
+model = annual.cool_model()
+res = Store('Paris_cool', columns=model[1])
+annual.run('Paris.epw', model, out=res)     # or res.append(block)
+res['QtCC'].mean()          # memory-mapped, not loaded in RAM
+Store('Paris_cool').frame(['θI', 'wI'], rows=slice(4000, 4744))
+"""
+import os
+import numpy as np
+import pandas as pd
+
+_header_len = 128           # bytes, .npy header (magic, version, dict)
+
+
+def _header(dtype, n):
+    """
+    Header of .npy file (version 1.0) of n values of dtype, padded to
+    _header_len bytes, so that it can be rewritten in place.
+    """
+    d = repr({'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+              'fortran_order': False, 'shape': (n,)})
+    d = d.ljust(_header_len - 10 - 1) + '\n'
+    return (np.lib.format.MAGIC_PREFIX + b'\x01\x00'
+            + np.uint16(len(d)).tobytes() + d.encode('latin1'))
+
+
+class Store:
+    """
+    Directory of columns of results, appended block by block.
+    """
+
+    def __init__(self, path, columns=None, dtype=float):
+        """
+        path        directory of the store
+        columns     list of names of the columns: creates a new store
+                    (existing columns are overwritten);
+                    None: opens the existing store *path*
+        dtype       type of the values of the new columns
+        """
+        self.path = path
+        if columns is not None:
+            os.makedirs(path, exist_ok=True)
+            with open(os.path.join(path, 'columns.txt'), 'w',
+                      encoding='utf-8') as f:
+                f.write('\n'.join(columns) + '\n')
+            for name in columns:
+                with open(self._file(name), 'wb') as f:
+                    f.write(_header(dtype, 0))
+        with open(os.path.join(path, 'columns.txt'), encoding='utf-8') as f:
+            self.columns = f.read().splitlines()
+        self.dtype = {name: self._read_header(name)[0]
+                      for name in self.columns}
+
+    def _file(self, name):
+        return os.path.join(self.path, name + '.npy')
+
+    def _read_header(self, name):
+        """
+        dtype and number of values of the column *name*
+        """
+        with open(self._file(name), 'rb') as f:
+            np.lib.format.read_magic(f)
+            shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+        return dtype, shape[0]
+
+    def __len__(self):
+        return self._read_header(self.columns[0])[1]
+
+    def append(self, block):
+        """
+        Appends a block of results.
+
+        Parameters
+        ----------
+        block   pd.DataFrame or dict of arrays of the same length
+                with (at least) all the columns of the store
+        """
+        missing = [name for name in self.columns if name not in block]
+        if missing:
+            print(f'Store.append: columns {missing} missing; not appended')
+            return
+        for name in self.columns:
+            y = np.ascontiguousarray(block[name], dtype=self.dtype[name])
+            with open(self._file(name), 'r+b') as f:
+                n = self._read_header(name)[1]
+                f.seek(_header_len + n * y.itemsize)
+                f.write(y.tobytes())
+                f.seek(0)
+                f.write(_header(y.dtype, n + y.size))
+
+    def __getitem__(self, name):
+        """
+        Column *name*, read-only memory map of the .npy file.
+        """
+        return np.load(self._file(name), mmap_mode='r')
+
+    def frame(self, columns=None, rows=slice(None)):
+        """
+        pd.DataFrame of *columns* (default: all) for *rows* (slice or
+        array of indexes or of bool); only these values are read.
+        """
+        columns = self.columns if columns is None else columns
+        index = np.arange(len(self))[rows]
+        return pd.DataFrame({name: self[name][rows] for name in columns},
+                            index=index)
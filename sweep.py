@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+
+Parametric sweeps of the HVAC models (design exploration)
+
+The points of the sweep (grid of values or list of samples) are split
+in chunks; each chunk is solved by the vectorized version of the model
+(one call for all the points of the chunk) in a process of a
+ProcessPoolExecutor. The results are gathered in a pd.DataFrame with
+one row per point: the values of the parameters, then the outputs of
+the model.
+
+Models (name: parameters with default values, solver)
+------
+cool            cool.MxCcRhTzBl, CAV:
+                m, mo, β, Kθ, Kw, θo, φo, θIsp, φIsp, mi, UA, Qsa, Qla
+                (cool.solve_batch)
+AllOutAirVAV    va_hum, all out air, VAV: m s.t. θS = θSsp
+                θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA
+                (va_hum.m_AllOutAirVAV)
+RecAirVAV       va_hum, recycled air, VAV: m s.t. θS = θSsp
+                α, θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA
+                (va_hum.m_RecAirVAV)
+RecAirAH        ad_hum.ModelRecAir, CAV, m for the design supply θS:
+                α, β, θS, Kθ, Kw, θO, φO, θIsp, φIsp, mi, UA, Qsa, Qla
+                (hvac_net.RecAirAH)
+
+CONTENTS (functions)
+========================================================================
+grid        Points of the grid of values (cartesian product).
+sweep       Solves the model for the points; results and throughput.
+
+Example
+-------
+import sweep
+points = sweep.grid(α=np.linspace(0, 1, 101),
+                    UA=np.linspace(500, 1500, 101),
+                    θO=np.linspace(-10, 10, 21))    # 214 221 points
+res, perf = sweep.sweep('RecAirVAV', points, workers=8)
+res.groupby('α')['QsHC'].max()
+perf['rate']        # points / s
+"""
+import os
+import time
+import multiprocessing
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+import cool
+import va_hum
+import ad_hum
+import hvac_net as hn
+
+
+def _cool(v):
+    return cool.solve_batch(
+        [v['m'], v['mo'], v['β'], v['Kθ'], v['Kw']],
+        [v['θo'], v['φo'], v['θIsp'], v['φIsp'],
+         v['mi'], v['UA'], v['Qsa'], v['Qla']])
+
+
+def _AllOutAirVAV(v):
+    m, x = va_hum.m_AllOutAirVAV(v['θSsp'], v['θIsp'], v['φIsp'],
+                                 v['θO'], v['φO'], v['Qsa'], v['Qla'],
+                                 v['mi'], v['UA'])
+    return np.column_stack([m, x])
+
+
+def _RecAirVAV(v):
+    m, x = va_hum.m_RecAirVAV(v['α'], v['θSsp'], v['θIsp'], v['φIsp'],
+                              v['θO'], v['φO'], v['Qsa'], v['Qla'],
+                              v['mi'], v['UA'])
+    return np.column_stack([m, x])
+
+
+def _RecAirAH(v):
+    # mass flow rate for design conditions (as in ad_hum.RecAirCAV)
+    m = ((v['UA'] + ad_hum.mid * ad_hum.c) * (v['θIsp'] - ad_hum.θOd)
+         / (ad_hum.c * (v['θS'] - v['θIsp'])))
+    x = hn.RecAirAH().solve(v | {'m': m})
+    return np.column_stack([np.broadcast_to(m, x.shape[:-1]), x])
+
+
+# name: (solver, default values, outputs)
+models = {
+    'cool': (_cool,
+             dict(m=3.1, mo=1, β=0.2, Kθ=1e10, Kw=1e10, θo=32, φo=0.5,
+                  θIsp=26, φIsp=0.5, mi=1.35, UA=675,
+                  Qsa=34_000, Qla=4_000),
+             hn.cool().unknowns),
+    'AllOutAirVAV': (_AllOutAirVAV,
+                     dict(θSsp=30, θIsp=18, φIsp=0.5, θO=-1, φO=1,
+                          Qsa=0, Qla=0, mi=2.12, UA=935.83),
+                     ['m'] + hn.AllOutAirVH().unknowns),
+    'RecAirVAV': (_RecAirVAV,
+                  dict(α=0.5, θSsp=30, θIsp=18, φIsp=0.5, θO=-1, φO=1,
+                       Qsa=0, Qla=0, mi=2.12, UA=935.83),
+                  ['m'] + hn.RecAirVH().unknowns),
+    'RecAirAH': (_RecAirAH,
+                 dict(α=1, β=0.1, θS=30, Kθ=1e10, Kw=1e10, θO=-1, φO=1,
+                      θIsp=18, φIsp=0.49, mi=2.18, UA=935.83,
+                      Qsa=0, Qla=0),
+                 ['m'] + hn.RecAirAH().unknowns)}
+
+
+def grid(**values):
+    """
+    Cartesian product of the values of the parameters.
+
+    Example
+    -------
+    grid(α=[0, 0.5, 1], θO=[-10, 0])    # 6 points
+    """
+    names = list(values)
+    x = np.meshgrid(*[np.atleast_1d(values[k]) for k in names],
+                    indexing='ij')
+    return pd.DataFrame({k: xk.ravel() for k, xk in zip(names, x)})
+
+
+def _solve(model, chunk):
+    """
+    Outputs of the model for a chunk of points (run in a worker).
+    """
+    solve, defaults, _ = models[model]
+    x = solve(defaults | chunk)
+    return np.broadcast_to(x, (len(next(iter(chunk.values()))),
+                               x.shape[-1]))
+
+
+def sweep(model, points, chunksize=10_000, workers=None):
+    """
+    Solves the model for each point of the sweep.
+
+    Parameters
+    ----------
+    model       name of the model, see *models*
+    points      pd.DataFrame, one column per parameter which varies,
+                one row per point (e.g. from *grid*); the other
+                parameters have the default values of the model
+    chunksize   number of points solved at once by a worker
+    workers     number of processes; None: os.cpu_count();
+                1: solved in the current process (no pool)
+
+    Returns
+    -------
+    res         pd.DataFrame, points and outputs of the model
+    perf        dict, n (points), chunks, workers, time (s),
+                rate (points / s)
+    """
+    if model not in models:
+        print(f'sweep: unknown model {model}; models: {list(models)}')
+        return None, None
+    unknown = set(points.columns) - set(models[model][1])
+    if unknown:
+        print(f'sweep: {sorted(unknown)} are not parameters of {model}')
+        return None, None
+    workers = os.cpu_count() if workers is None else workers
+    values = {k: points[k].to_numpy(dtype=float) for k in points.columns}
+    chunks = [{k: v[i:i + chunksize] for k, v in values.items()}
+              for i in range(0, len(points), chunksize)]
+
+    t0 = time.perf_counter()
+    if workers == 1:
+        x = [_solve(model, chunk) for chunk in chunks]
+    else:
+        # spawn: fork is unsafe after threads were started (BLAS, numba)
+        ctx = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(workers, mp_context=ctx) as pool:
+            x = list(pool.map(_solve, [model] * len(chunks), chunks))
+    t = time.perf_counter() - t0
+
+    res = pd.concat([points.reset_index(drop=True),
+                     pd.DataFrame(np.vstack(x), columns=models[model][2])],
+                    axis=1)
+    perf = {'n': len(points), 'chunks': len(chunks), 'workers': workers,
+            'time': t, 'rate': len(points) / t}
+    return res, perf
@@ -4,10 +4,10 @@
 Created on Wed Apr 22 18:37:10 2020
 Updated on Sat Apr  2 18:57:50 2022
 @author: cghiaus
-test winter_AdHum.py
+test ad_hum.py
 https://www.spyder-ide.org/blog/introducing-unittest-plugin/
 """
-import winter_AdHum as ah
+import ad_hum as ah
 import numpy as np
 
 
@@ -58,3 +58,66 @@ def test_ahModelRecAir():
         ah.ModelRecAir(m, alpha, beta, tS, tIsp, phiIsp, tO, phiO,
                        Qsa, Qla, mi, UA),
         y, rtol=1e-3)
+
+
+def test_ahModelRecAir_cache():
+    """
+    Factorization reused for the same m, α, β, mi, UA
+    (m given as array by least_squares in RecAirVAV), not for another
+    θs_ref
+    """
+    m, alpha, beta, mi, UA = 4.9334, 1, 0.1, 2.18, 935.83
+    x0 = ah.ModelRecAir(m, alpha, beta, 30, 18, 0.49, -1, 1, 0, 0, mi, UA)
+    hits = ah._lu_RecAir.cache_info().hits
+    x1 = ah.ModelRecAir(np.array([m]), alpha, beta, 30, 18, 0.49, -1, 1,
+                        0, 0, mi, UA)
+
+    assert ah._lu_RecAir.cache_info().hits == hits + 1
+    np.testing.assert_allclose(x1, x0)
+
+    # other tangent θs_ref: new factorization, same solution
+    θs_ref, misses = ah.θs_ref, ah._lu_RecAir.cache_info().misses
+    try:
+        ah.θs_ref = 0
+        x2 = ah.ModelRecAir(m, alpha, beta, 30, 18, 0.49, -1, 1, 0, 0,
+                            mi, UA)
+    finally:
+        ah.θs_ref = θs_ref
+    assert ah._lu_RecAir.cache_info().misses == misses + 1
+    np.testing.assert_allclose(x2, x0, rtol=1e-6)
+
+
+def test_ahModelRecAir_ideal():
+    """
+    Ideal controllers (Kθ, Kw = np.inf) vs. the limit of high gains
+    (with Kw = 1e10, wI - wIsp = QHC2 / Kw gives 0.3 % error on θ1)
+    """
+    inputs = 4.9334, 1, 0.1, 30, 18, 0.49, -1, 1, 0, 0, 2.18, 935.83
+    Kθ, Kw = ah.Kθ, ah.Kw
+    try:
+        ah.Kθ, ah.Kw = 1e14, 1e14
+        x = ah.ModelRecAir(*inputs)
+        ah.Kθ, ah.Kw = np.inf, np.inf
+        xi = ah.ModelRecAir(*inputs)
+    finally:
+        ah.Kθ, ah.Kw = Kθ, Kw
+
+    assert xi[10] == 18
+    np.testing.assert_allclose(xi[11], ah.psy.w(18, 0.49), rtol=1e-12)
+    np.testing.assert_allclose(xi, x, rtol=1e-6)
+
+
+def test_RecAirVAV_sequence():
+    """
+    VAV for a sequence of outdoor temperatures: warm start / continuation
+    gives the solutions of the independent points with fewer evaluations
+    """
+    points = [dict(α=0.5, θO=θO) for θO in np.linspace(-10, 5, 12)]
+    res0 = [ah.RecAirVAV_compute(**point) for point in points]
+
+    for predictor in ['last', 'secant']:
+        res = ah.RecAirVAV_sequence(points, predictor)
+        np.testing.assert_allclose([r['x'] for r in res],
+                                   [r['x'] for r in res0], rtol=1e-6)
+        assert (sum(r['nfev'] for r in res)
+                < sum(r['nfev'] for r in res0))
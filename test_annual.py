@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+test annual.py
+"""
+import numpy as np
+import pandas as pd
+import annual
+import cool
+import va_hum
+import ad_hum
+
+# one week of hourly weather
+t = np.arange(168)
+θo = 28 + 6 * np.sin(2 * np.pi * t / 24)
+φo = 0.5 - 0.2 * np.sin(2 * np.pi * t / 24)
+
+
+def test_cool_csv(tmp_path):
+    """
+    Blocks of annual.simulate (chunks of weather) vs. one solve_batch;
+    energy and results written by annual.run
+    """
+    path, out = tmp_path / 'weather.csv', tmp_path / 'results.csv'
+    pd.DataFrame({'time': t, 'T': θo, 'RH': φo}).to_csv(path, index=False)
+    model = annual.cool_model()
+
+    blocks = list(annual.simulate(
+        model, annual.weather(path, chunksize=50, θ='T', φ='RH')))
+    E = annual.run(path, model, out=out, chunksize=50, θ='T', φ='RH')
+
+    x = cool.solve_batch([3.1, 1, 0.2, 1e10, 1e10],
+                         [θo, φo, 26, 0.5, 1.35, 675, 34_000, 4_000])
+    assert [len(block) for block in blocks] == [50, 50, 50, 18]
+    np.testing.assert_allclose(pd.concat(blocks).to_numpy(), x)
+    np.testing.assert_allclose(pd.read_csv(out, index_col=0).to_numpy(), x)
+    assert E['hours'] == 168
+    np.testing.assert_allclose(E['QtCC'], x[:, 10].sum() / 1000)
+
+
+def test_epw(tmp_path):
+    """
+    EPW file (8 lines of header, RH in %): va_hum and ad_hum models
+    vs. the models of va_hum.py and ad_hum.py for each hour
+    """
+    path = tmp_path / 'weather.epw'
+    θ, φ = -5 + 4 * np.sin(2 * np.pi * t / 24), 0.9 + 0 * t
+    lines = [f'HEADER {k}' for k in range(8)]
+    lines += [f'2023,1,{1 + k // 24},{1 + k % 24},60,?,{θ[k]:.1f},'
+              f'-6.0,{100 * φ[k]:.0f},101325,0,0'
+              for k in range(len(t))]
+    path.write_text('\n'.join(lines) + '\n')
+
+    w = pd.concat(annual.weather(path, chunksize=100))
+    np.testing.assert_allclose(w['θo'], θ, atol=0.05)
+    np.testing.assert_allclose(w['φo'], φ)
+    assert w['hour'].iloc[25] == 2
+
+    x = pd.concat(annual.simulate(annual.va_hum_model(m=4.84),
+                                  annual.weather(path, chunksize=100)))
+    for k in [0, 100]:
+        np.testing.assert_allclose(
+            x.iloc[k],
+            va_hum.ModelAllOutAir(4.84, 30, 18, 0.5, w['θo'][k], w['φo'][k],
+                                  0, 0, 2.12, 935.83))
+
+    m = ad_hum.RecAirCAV_compute(α=0.5)['m']
+    x = pd.concat(annual.simulate(annual.ad_hum_model(α=0.5),
+                                  annual.weather(path, chunksize=100)))
+    for k in [0, 100]:
+        np.testing.assert_allclose(
+            x.iloc[k],
+            ad_hum.ModelRecAir(m, 0.5, 0.1, 30, 18, 0.49,
+                               w['θo'][k], w['φo'][k], 0, 0, 2.18, 935.83),
+            rtol=1e-5, atol=1e-3)
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+test benchmark.py
+"""
+import benchmark
+
+
+def test_run_save_compare(tmp_path):
+    """
+    Quick run of some cases, JSON file, comparison with a baseline
+    """
+    res = benchmark.run(['psy.w', 'cool.batch'], quick=True, repeat=1,
+                        max_time=0.01)
+    assert set(res['results']) == {'psy.w[1000]', 'psy.w[10000]',
+                                   'cool.batch[10000]'}
+    assert all(r['time'] > 0 for r in res['results'].values())
+
+    path = benchmark.save(res, tmp_path)
+    assert benchmark.load(path) == res
+
+    baseline = {'results': {k: {'time': r['time'] * f}
+                            for (k, r), f in zip(res['results'].items(),
+                                                 [1, 0.5, 2])}}
+    baseline['results']['psy.pvs[1000]'] = {'time': 1}
+    df = benchmark.compare(res, baseline, threshold=0.2)
+    assert set(df.index) == set(res['results'])
+    assert list(df.index[df['regression']]) == ['psy.w[10000]']
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+test codegen.py and the generated lin_gen.py (vs. the matrix form)
+"""
+import numpy as np
+import pytest
+import psychro as psy
+import solvers
+import cool
+import ad_hum as ah
+import lin_gen
+
+
+def test_cool_gen():
+    """
+    Evaluators of cool vs. np.linalg.solve of cool.system, for the four
+    types of controllers and edge values (mo = 0, mo = m, β = 0, mi = 0,
+    UA = 0, Kθ = Kw = 0; not all at once: singular system)
+    """
+    rng = np.random.default_rng(0)
+    N = 200
+    m = rng.uniform(0.5, 5, N)
+    mo = m * np.r_[0, 1, rng.uniform(0, 1, N - 2)]
+    β = np.r_[0.5, 0.5, 0, rng.uniform(0, 0.95, N - 3)]
+    inputs = [rng.uniform(20, 40, N), rng.uniform(0.2, 1, N),
+              rng.uniform(20, 28, N), rng.uniform(0.3, 0.7, N),
+              np.r_[1, 0, rng.uniform(0, 3, N - 2)],
+              np.r_[1000, 1000, 0, rng.uniform(0, 2000, N - 3)],
+              rng.uniform(0, 5e4, N), rng.uniform(0, 5e3, N)]
+    θs = rng.uniform(0, 20, N)
+    ws, wsp, _ = psy.wsat(θs)
+    θo, φo, θIsp, φIsp = inputs[:4]
+    for Kθ, Kw, kind in [(0, 0, 'KK'), (1e3, 2e3, 'KK'),
+                         (np.inf, 1e4, 'IK'), (1e3, np.inf, 'KI'),
+                         (np.inf, np.inf, 'II')]:
+        parameters = [m, mo, β, np.full(N, Kθ), np.full(N, Kw)]
+        A, b = cool.system(parameters, inputs)
+        A[:, 4, 3], A[:, 4, 2], b[:, 4] = -1, wsp, wsp * θs - ws
+        x = solvers.solve(A, b, *cool.ideal(parameters, inputs))
+        f = getattr(lin_gen, 'cool_' + kind)
+        np.testing.assert_allclose(
+            f(*parameters, θo, psy.w(θo, φo), θIsp, psy.w(θIsp, φIsp),
+              *inputs[4:], wsp, wsp * θs - ws),
+            x, rtol=1e-7, atol=1e-9)
+
+
+def test_cool_solve_batch_gen():
+    """
+    cool.solve_batch: method 'gen' vs. 'lapack' (same iterations)
+    """
+    parameters = [3.1, 1., 0.2, 1e10, 0]
+    inputs = [np.linspace(24, 38, 50), 0.8, 26., 0.5, 1.35, 675.,
+              34000., 4000.]
+    for Kθ in [1e10, np.inf]:
+        parameters[3] = Kθ
+        x, n_iter, converged = cool.solve_batch(
+            parameters, inputs, full_output=True, method='gen')
+        xl, n_iterl, _ = cool.solve_batch(parameters, inputs,
+                                          full_output=True)
+
+        assert converged.all() and (n_iter == n_iterl).all()
+        np.testing.assert_allclose(x, xl, rtol=1e-6, atol=1e-9)
+
+
+def test_ModelRecAir_batch():
+    """
+    ad_hum.ModelRecAir_batch vs. ModelRecAir for each point,
+    finite and ideal controllers
+    """
+    θO = np.linspace(-10, 10, 11)
+    inputs = 4.93, 0.5, 0.1, 30, 18, 0.49, θO, 1, 0, 0, 2.18, 935.83
+    Kθ, Kw = ah.Kθ, ah.Kw
+    try:
+        for ah.Kθ, ah.Kw in [(1e3, 1e3), (np.inf, 1e3), (1e3, np.inf),
+                             (np.inf, np.inf)]:
+            x, _, converged = ah.ModelRecAir_batch(*inputs,
+                                                   full_output=True)
+            xs = [ah.ModelRecAir(*inputs[:6], θ, *inputs[7:]) for θ in θO]
+
+            assert converged.all()
+            np.testing.assert_allclose(x, xs, rtol=1e-6, atol=1e-9)
+    finally:
+        ah.Kθ, ah.Kw = Kθ, Kw
+
+
+def test_generate(tmp_path):
+    """
+    lin_gen.py is up to date with codegen.py
+    """
+    pytest.importorskip('sympy')
+    import codegen
+    path = tmp_path / 'lin_gen.py'
+    codegen.generate(path)
+
+    with open(lin_gen.__file__, encoding='utf-8') as f:
+        assert path.read_text(encoding='utf-8') == f.read()
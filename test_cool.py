@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+test cool.py
+"""
+import cool
+import psychro as psy
+import numpy as np
+import pytest
+
+# AHU of T06_cool.ipynb
+parameters = 3.1, 1., 0.2, 1e10, 0          # m, mo, β, Kθ, Kw
+inputs = 32., 0.8, 26., 0.5, 1.35, 675., 34000., 4000.
+
+# θM, wM, θs, ws, θC, wC, θS, wS, θI, wI, QtCC, QsCC, QlCC, QsHC, QsTZ, QlTZ
+y = np.array([27.935492, 0.017, 6.907281, 0.006172,
+              11.112923, 0.008337, 11.112923, 0.008337,
+              26.000012, 0.013534,
+              -119177.18, -52149.96, -67027.22, 0., 46149.98, 40207.13])
+
+
+def test_solve_lin():
+    """
+    Saturation point on the saturation curve and regression values
+    """
+    ahu = cool.MxCcRhTzBl(parameters, inputs)
+    x = ahu.solve_lin(40)
+
+    np.testing.assert_allclose(x, y, rtol=1e-4, atol=1e-6)
+    np.testing.assert_allclose(psy.w(x[2], 1), x[3], atol=1e-5)
+
+
+def test_solve_lin_warm_start():
+    """
+    Warm start from the previous solution converges in one iteration
+    """
+    ahu = cool.MxCcRhTzBl(parameters, inputs)
+    ahu.solve_lin(cool.θs_0)
+    x = ahu.solve_lin()
+
+    assert ahu.n_iter == 1
+    np.testing.assert_allclose(x, y, rtol=1e-4, atol=1e-6)
+
+
+def test_solve_batch():
+    """
+    Batch of operating points vs. solve_lin for each point
+    """
+    θo = np.array([32., 28, 35, 24])
+    φo = np.array([0.8, 0.5, 0.6, 0.7])
+    x, n_iter, converged = cool.solve_batch(
+        parameters, (θo, φo) + inputs[2:], full_output=True)
+
+    assert x.shape == (4, 16) and converged.all()
+    np.testing.assert_allclose(x[0], y, rtol=1e-4, atol=1e-6)
+    ahu = cool.MxCcRhTzBl(parameters, inputs)
+    for k in range(4):
+        ahu.actual[5:7] = θo[k], φo[k]
+        np.testing.assert_allclose(x[k], ahu.solve_lin(cool.θs_0),
+                                   rtol=1e-6, atol=1e-6)
+
+
+def test_solve_batch_singular():
+    """
+    A singular point (m = 0) gives NaN, the other points are solved
+    (LAPACK and generated evaluators); mixed ideal / finite gains: error
+    """
+    m = np.array([3.1, 0, 3.1])
+    for method in ['lapack', 'gen']:
+        x, n_iter, converged = cool.solve_batch(
+            (m,) + parameters[1:], inputs, full_output=True, method=method)
+
+        assert converged.tolist() == [True, False, True]
+        assert np.isnan(x[1]).all()
+        np.testing.assert_allclose(x[[0, 2]], [y, y], rtol=1e-4, atol=1e-6)
+
+        with pytest.raises(ValueError):
+            cool.solve_batch(parameters[:3] + (np.array([1e10, np.inf]), 0),
+                             inputs, method=method)
+
+
+def test_CAV_compute():
+    """
+    Compute-only CAV gives the result of solve_lin without chart
+    """
+    ahu = cool.MxCcRhTzBl(parameters, inputs)
+    res = ahu.CAV(*inputs)
+
+    np.testing.assert_allclose(res['x'], y, rtol=1e-4, atol=1e-6)
+    np.testing.assert_allclose(res['θ'][1:], y[0:10:2], rtol=1e-4)
+    assert res['A'].shape == (5, 6)
+    assert res['Q']['QsTZ'] == res['x'][14]
+
+
+def test_ideal_controllers():
+    """
+    Kθ = np.inf (ideal controller) vs. Kθ = 1e10, single and batch
+    """
+    ideal = parameters[:3] + (np.inf, 0)
+    x = cool.MxCcRhTzBl(ideal, inputs).solve_lin(40)
+
+    assert x[8] == inputs[2]
+    np.testing.assert_allclose(x, y, rtol=1e-4, atol=1e-6)
+    np.testing.assert_allclose(
+        cool.solve_batch(ideal, (np.array([32., 32.]),) + inputs[1:]),
+        [x, x], rtol=1e-6, atol=1e-9)
+
+
+def test_sequence():
+    """
+    VAV for a sequence of outdoor temperatures: warm start / continuation
+    gives the solutions of the independent points with fewer iterations
+    """
+    points = [dict(sp=16, θo=θo) for θo in np.linspace(28, 34, 12)]
+    n, x = 0, []
+    for point in points:
+        ahu = cool.MxCcRhTzBl(parameters, inputs)
+        x.append(ahu.VAV(**point)['x'])
+        n += ahu.n_total
+
+    for predictor in ['last', 'secant']:
+        ahu = cool.MxCcRhTzBl(parameters, inputs)
+        res = ahu.sequence('VAV', points, predictor)
+        np.testing.assert_allclose([r['x'] for r in res], x,
+                                   rtol=1e-3, atol=1e-5)
+        assert ahu.n_total < 0.6 * n
+
+
+def test_dx_dp():
+    """
+    Implicit differentiation vs. finite differences for m and β;
+    VAV reaches the set point of θS (signed residual)
+    """
+    for K in [1e10, np.inf]:
+        ahu = cool.MxCcRhTzBl(parameters[:3] + (K, K), inputs)
+        for k in [0, 2]:
+            x = ahu.solve_lin(tol=1e-12)
+            dx = ahu.dx_dp(k)
+            ahu.actual[k] += 1e-5
+            dx_fd = (ahu.solve_lin(tol=1e-12) - x) / 1e-5
+            ahu.actual[k] -= 1e-5
+            np.testing.assert_allclose(dx, dx_fd, rtol=1e-3, atol=1e-3)
+
+    res = cool.MxCcRhTzBl(parameters, inputs).VAV(sp=16)
+    np.testing.assert_allclose(res['x'][6], 16, atol=1e-6)
+    assert res['success'] and res['converged'] and res['nfev'] > 0
+
+
+def test_VBP_all(capsys):
+    """
+    φI controlled by β: two solutions, found by β_roots whatever the
+    initial guess of β_ls; no solution for θS controlled by β (status
+    returned, not printed)
+    """
+    ahu = cool.MxCcRhTzBl((3.5,) + parameters[1:], inputs)
+    res = ahu.VBP_all('φI', 0.65, *inputs)
+    β = [r['β'] for r in res]
+
+    assert len(res) == 2 and β[0] < β[1]
+    for r in res:
+        np.testing.assert_allclose(r['x'][9], psy.w(26, 0.65), atol=1e-8)
+        assert r['energy'] > 0
+    for β0 in β:
+        ahu = cool.MxCcRhTzBl((3.5,) + parameters[1:], inputs)
+        r = ahu.VBP('φI', 0.65, *inputs, β0=β0)
+        np.testing.assert_allclose(r['β'], β0, atol=1e-3)
+        assert r['success']
+    assert ahu.VBP_all('θS', 14, *inputs) == []
+    r = ahu.VBP('θS', 14, *inputs)
+    assert not r['success'] and r['cost'] >= 1e-5
+    assert capsys.readouterr().out == ''
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+test hvac_net.py
+"""
+import hvac_net as hn
+import cool
+import ad_hum as ah
+import va_hum as vh
+import numpy as np
+
+# AHU of T06_cool.ipynb
+values = dict(m=3.1, mo=1., β=0.2, Kθ=1e10, Kw=0,
+              θo=32., φo=0.8, θIsp=26., φIsp=0.5,
+              mi=1.35, UA=675., Qsa=34000., Qla=4000.)
+parameters = 3.1, 1., 0.2, 1e10, 0
+inputs = 32., 0.8, 26., 0.5, 1.35, 675., 34000., 4000.
+
+
+def test_cool():
+    """
+    Network of cool.MxCcRhTzBl vs. solve_lin (single) and solve_batch
+    """
+    net = hn.cool()
+    x, n_iter, converged = net.solve(values, full_output=True)
+    ahu = cool.MxCcRhTzBl(parameters, inputs)
+
+    assert net.unknowns[:4] == ['θM', 'wM', 'θs', 'ws'] and converged
+    np.testing.assert_allclose(x, ahu.solve_lin(cool.θs_0), rtol=1e-10)
+
+    θo = np.array([32., 28, 35, 24])
+    φo = np.array([0.8, 0.5, 0.6, 0.7])
+    x = net.solve(dict(values, θo=θo, φo=φo))
+    np.testing.assert_allclose(
+        x, cool.solve_batch(parameters, (θo, φo) + inputs[2:]),
+        rtol=1e-10, atol=1e-12)
+
+
+def test_RecAirAH():
+    """
+    Network of ad_hum.ModelRecAir
+    """
+    x = hn.RecAirAH().solve(dict(
+        m=4.9334, α=1, β=0.1, Kθ=1e10, Kw=1e10, θO=-1, φO=1,
+        θIsp=18, φIsp=0.49, mi=2.18, UA=935.83, Qsa=0, Qla=0))
+
+    np.testing.assert_allclose(
+        x, ah.ModelRecAir(4.9334, 1, 0.1, 30, 18, 0.49, -1, 1, 0, 0,
+                          2.18, 935.83), rtol=1e-4)
+
+
+def test_va_hum():
+    """
+    Networks of va_hum models (no saturation) for N outdoor conditions
+    """
+    θO = np.array([-1, 5, 10, -5])
+    v = dict(m=4.84, α=0.5, Kθ=1e10, Kw=1e10, θO=θO, φO=1,
+             θIsp=18, φIsp=0.5, mi=2.12, UA=935.83, Qsa=100, Qla=50)
+
+    np.testing.assert_allclose(
+        hn.AllOutAirVH().solve(v),
+        vh.CompiledAllOutAir(4.84, 2.12, 935.83).solve(
+            18, 0.5, θO, 1, 100, 50), rtol=1e-8)
+    np.testing.assert_allclose(
+        hn.RecAirVH().solve(v),
+        vh.CompiledRecAir(4.84, 0.5, 2.12, 935.83).solve(
+            18, 0.5, θO, 1, 100, 50), rtol=1e-8)
+
+
+def test_new_layout():
+    """
+    Layout not in the tutorials: preheating, adiabatic humidifier, fan
+    and reheating with all out air; ideal controllers
+    """
+    net = hn.Network([
+        hn.HC('HC1', 'O', '0', 'm'),
+        hn.AH('AH', '0', '1'),
+        hn.F('F', '1', '2'),
+        hn.HC('HC2', '2', '3', 'm'),
+        hn.TZ('TZ', '3', 'I', 'm'),
+        hn.BL('BL', 'I', 'O'),
+        hn.Kθ('Kθ', 'I', 'QsHC2'),
+        hn.Kw('Kw', 'I', 'QsHC1')])
+    v = dict(m=3, Kθ=np.inf, Kw=np.inf, θO=-1, φO=1, θIsp=20, φIsp=0.4,
+             mi=1, UA=800, Qsa=0, Qla=0)
+    x = net.solve(v)
+    res = net.result(x, v)
+
+    assert res['points'] == ['O', '0', '1', '2', '3', 'I']
+    np.testing.assert_allclose(res['θ'][-1], 20)
+    np.testing.assert_allclose(res['w'][-1], hn.psy.w(20, 0.4))
+    np.testing.assert_allclose(res['w'][2], hn.psy.w(res['θ'][2], 1),
+                               rtol=1e-3)
+    # enthalpy conserved in AH
+    np.testing.assert_allclose(
+        hn.c * res['θ'][1] + hn.l * res['w'][1],
+        hn.c * res['θ'][2] + hn.l * res['w'][2])
+
+
+def zone_values(n):
+    rng = np.random.default_rng(0)
+    return dict(mo=0.2 * n, β=0.2, Kθ=np.inf, Kw=np.inf,
+                θo=32., φo=0.5, φIsp=0.5,
+                mz=rng.uniform(0.5, 1.5, n), θIsp=rng.uniform(22, 26, n),
+                UA=rng.uniform(100, 300, n), mi=rng.uniform(0.02, 0.1, n),
+                Qsa=rng.uniform(2e3, 8e3, n), Qla=rng.uniform(200, 1e3, n))
+
+
+def test_zones_sparse_vs_dense():
+    """
+    Sparse LU with Woodbury update vs. dense Newton iterations
+    """
+    v = zone_values(5)
+
+    np.testing.assert_allclose(hn.zones(5).solve(v),
+                               hn.zones(5, sparse=False).solve(v),
+                               rtol=1e-9, atol=1e-12)
+
+
+def test_zones_500():
+    """
+    500 zones: set points reached, factorization reused for new weather
+    """
+    net = hn.zones(500)
+    v = zone_values(500)
+    x, n_iter, converged = net.solve(v, full_output=True)
+    lu = net._lu[1]
+    A, _ = net.system(v)
+
+    assert converged and A.nnz < 3 * len(net.unknowns)
+    np.testing.assert_allclose(x[[net.index[f'θI{k}'] for k in range(500)]],
+                               v['θIsp'])
+    x = net.solve(dict(v, θo=30.))
+    assert net._lu[1] is lu
+    np.testing.assert_allclose(x[net.index['wI0']],
+                               hn.psy.w(v['θIsp'][0], 0.5))
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+test instrument.py
+"""
+import numpy as np
+import instrument
+import cool
+import ad_hum
+import mix
+import hvac_net as hn
+
+
+def test_collector():
+    """
+    Calls recorded only inside the with block; iterations and condition
+    numbers by solver
+    """
+    ahu = cool.MxCcRhTzBl([3.1, 1., 0.2, 1e10, 0],
+                          [32., 0.8, 26., 0.5, 1.35, 675., 34000., 4000.])
+    with instrument.Collector(cond=True) as col:
+        ahu.VAV(sp=16)
+        mix.mixing_compute()
+        with instrument.Collector() as inner:
+            ad_hum.RecAirVAV_compute()
+        hn.cool().solve(dict(m=3.1, mo=1, β=0.2, Kθ=1e10, Kw=0,
+                             θo=np.linspace(28, 34, 5), φo=0.8, θIsp=26,
+                             φIsp=0.5, mi=1.35, UA=675, Qsa=34e3, Qla=4e3))
+    n_total = ahu.n_total
+    ahu.CAV()
+
+    s = col.summary()
+    assert instrument.active is None
+    assert list(s.index) == ['cool.solve_lin', 'cool.m_ls', 'mix.mixing',
+                             'hvac_net.Network.solve']
+    assert s.loc['cool.solve_lin', 'n_iter'] == n_total
+    assert s.loc['cool.m_ls', 'calls'] == 1
+    assert s.loc['hvac_net.Network.solve', 'N'] == 5
+    assert (s['cond_max'].dropna() > 1).all()
+    assert s.loc['mix.mixing', 'n_iter'] == mix.mixing_compute()['n_iter']
+
+    r = inner.frame()
+    assert set(r['name']) == {'ad_hum.ModelRecAir', 'ad_hum.RecAirVAV'}
+    assert (r['time_solve'].dropna() > 0).all()
+    assert 'cond' not in r
@@ -5,9 +5,9 @@
 Created on Thu Apr 30 07:55:42 2020
 
 @author: cghiaus
-test mix07.py
+test mix.py
 """
-import mix07 as mx
+import mix as mx
 import numpy as np
 
 
@@ -25,7 +25,7 @@ def test_mean_temperature():
     ye = (θ0 + θ1) / 2
 
     # Obtained output: the temperature after MX
-    yo = mx.mixing(1, θ0, 0.8, θ1, φ1=0.95, α=0.5)[0]
+    yo = mx.mixing_compute(1, θ0, 0.8, θ1, φ1=0.95, α=0.5)['x'][0]
 
     np.testing.assert_almost_equal(yo, ye, 1)
 
@@ -36,9 +36,29 @@ def test_mix():
     # Expected output
     ye = (t0 + t1) / 2
     # Obtained output
-    yo = mx.mixing(1, t0, 0.8, t1, φ1=0.95, α=0.5)[0]
+    yo = mx.mixing_compute(1, t0, 0.8, t1, φ1=0.95, α=0.5)['x'][0]
 
     np.testing.assert_almost_equal(yo, ye, 1)
 
 
+def test_mixing_vec():
+    """
+    Mixing line (array of α) and arrays of points vs. mixing_compute
+    """
+    α = np.linspace(0, 1, 11)
+    res = mx.mixing_vec(0, 0.8, 32, 0.95, α)
+    assert res['condensation'].sum() == 9
+    for k in range(len(α)):
+        x = mx.mixing_compute(1, 0, 0.8, 32, 0.95, α[k])['x']
+        np.testing.assert_allclose([res['θ2'][k], res['w2'][k]], x[:2])
+        np.testing.assert_allclose(res['θ3'][k], x[-2], atol=1e-2)
+        np.testing.assert_allclose(res['w3'][k], x[-1], rtol=1e-3)
+
+    θ0 = np.array([[10, 0], [-5, 20]])
+    res = mx.mixing_vec(θ0, 0.8, 32, 0.95, 0.5)
+    assert res['θ3'].shape == (2, 2)
+    x = mx.mixing_compute(1, -5, 0.8, 32, 0.95, 0.5)['x']
+    np.testing.assert_allclose(res['θ3'][1, 0], x[2], atol=1e-2)
+    np.testing.assert_allclose(res['w3'][1, 0], x[3], rtol=1e-3)
+
 # test_mean_temperature()
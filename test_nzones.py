@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+test nzones.py
+"""
+import nzones
+import numpy as np
+import runpy
+import matplotlib
+matplotlib.use('Agg')
+
+# Zones of 2zones.py
+zones = dict(θTZ=[17, 25], φTZ=[0.70, 0.40], A=np.array([70, 35]),
+             mi=np.array([0.06, 0.06]), n_p=np.array([10, 5]))
+
+
+def test_2zones():
+    """
+    n = 2 vs. the script 2zones.py
+    """
+    y = runpy.run_path('2zones.py')
+    s = nzones.summer(θO=29, φO=0.6, mO=0.7, θS0=13, b=0.3, **zones)
+    w = nzones.winter(θO=0, φO=1, mO=0.7, m=s['m'], **zones)
+
+    np.testing.assert_allclose(s['m'], [y['m1'], y['m2']])
+    np.testing.assert_allclose(s['θh'], y['θh'])
+    np.testing.assert_allclose(s['QtCC'], y['QtCC'])
+    np.testing.assert_allclose(s['QHC'], [y['QHC1'], y['QHC2']])
+    np.testing.assert_allclose(s['Qtot'], y['Qtot'])
+    np.testing.assert_allclose(w['θS'], [y['θS1'], y['θS2']])
+    np.testing.assert_allclose(w['QsHC'], [y['QsHC1'], y['QsHC2']])
+    np.testing.assert_allclose(w['QlVH'], [y['QlVH1'], y['QlVH2']])
+
+
+def test_many_zones():
+    """
+    2000 zones: energy balance of the cooling coil and the reheating
+    """
+    n = 2000
+    rng = np.random.default_rng(0)
+    z = dict(θTZ=rng.uniform(22, 26, n), φTZ=rng.uniform(0.4, 0.5, n),
+             A=rng.uniform(20, 100, n), mi=rng.uniform(0.01, 0.05, n),
+             n_p=rng.integers(1, 10, n))
+    s = nzones.summer(θO=32, φO=0.5, mO=0.2 * n, θS0=14, b=0.2, **z)
+
+    assert s['m'].shape == (n,) and np.all(s['m'] > 0)
+    # sensible balance of the air loop: CC, HC, zones and outdoor air
+    np.testing.assert_allclose(
+        s['QsCC'] + s['QHC'].sum() + s['QsTZ'].sum(),
+        -nzones.ca * 0.2 * n * (32 - s['θM1']), rtol=1e-9)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+test psychro.py
+"""
+import psychro as psy
+import numpy as np
+
+
+def test_t_inverse_of_w():
+    """
+    t(w(θ, φ), φ) = θ for arrays of temperature and relative humidity
+    """
+    θ = np.array([-10, 0, 5, 20, 32, 45])
+    φ = np.array([0.3, 1, 1, 0.5, 0.8, 0.9])
+    yo, converged = psy.t(psy.w(θ, φ), φ, full_output=True)
+
+    np.testing.assert_allclose(yo, θ, atol=1e-6)
+    assert converged.all()
+
+
+def test_t_scalar():
+    """
+    Scalar inputs give a float (as used in 2zones.py)
+    """
+    θ = psy.t(psy.w(14, 1), phi=1)
+
+    assert isinstance(θ, float)
+    np.testing.assert_almost_equal(θ, 14, 6)
+
+
+def test_t_no_solution():
+    """
+    phi <= 0: NaN, not converged (the other elements are solved)
+    """
+    θ, converged = psy.t(0.01, np.array([0.5, 0, -1]), full_output=True)
+
+    np.testing.assert_array_equal(np.isnan(θ), [False, True, True])
+    assert converged.tolist() == [True, False, False]
+    assert np.isnan(psy.t(0.01, 0))
+
+
+def test_dpvs():
+    """
+    Analytic derivative of pvs compared with central differences
+    """
+    θ = np.linspace(-10, 50, 13)
+    h = 1e-4
+    ye = (psy.pvs(θ + h) - psy.pvs(θ - h)) / (2 * h)
+
+    np.testing.assert_allclose(psy.dpvs(θ), ye, rtol=1e-7)
+
+
+def test_pvs_table_error():
+    """
+    Relative error of the tabulated pvs & dpvs vs. the exact equation
+    """
+    θ = np.linspace(-60, 200, 260_001)
+
+    np.testing.assert_allclose(psy.pvs(θ, 'table'), psy.pvs(θ, 'exact'),
+                               rtol=1e-10)
+    np.testing.assert_allclose(psy.dpvs(θ, 'table'), psy.dpvs(θ, 'exact'),
+                               rtol=1e-7)
+
+
+def test_pvs_backend():
+    """
+    Global backend selection and exact values outside the table
+    """
+    θ = np.array([-80, 20, 250])
+    try:
+        psy.pvs_backend = 'table'
+        yo = psy.w(θ, 0.5)
+    finally:
+        psy.pvs_backend = 'exact'
+
+    np.testing.assert_allclose(yo, psy.w(θ, 0.5), rtol=1e-10)
+    assert psy.pvs(-80, 'table') == psy.pvs(-80)
+
+
+def test_pvs_unknown_backend(capsys):
+    """
+    Unknown backend: reported, exact equation used
+    """
+    assert psy.pvs(20, 'tabel') == psy.pvs(20)
+    assert psy.dpvs(20, 'tabel') == psy.dpvs(20)
+    assert 'pvs: unknown backend tabel; exact used' in capsys.readouterr().out
+
+
+def test_pvs_table_nan():
+    """
+    NaN gives NaN with the table backend (as with the exact equation)
+    """
+    y = psy.pvs_table(np.array([np.nan, 20.]))
+    assert np.isnan(y[0])
+    assert y[1] == psy.pvs(20, 'table')
+    assert np.isnan(psy.pvs_table(np.nan, derivative=True))
+    try:
+        psy.pvs_backend = 'table'
+        assert np.isnan(psy.w(np.nan, 0.5))
+    finally:
+        psy.pvs_backend = 'exact'
+
+
+def test_wsat():
+    """
+    ws, dws/dθ and pvs from wsat vs. w(θ, 1), differences and pvs(θ)
+    """
+    θ = np.linspace(-10, 50, 13)
+    h = 1e-4
+    ws, wsp, ps = psy.wsat(θ, Z=500)
+
+    np.testing.assert_allclose(ws, psy.w(θ, 1, Z=500), rtol=1e-12)
+    np.testing.assert_allclose(
+        wsp, (psy.w(θ + h, 1, 500) - psy.w(θ - h, 1, 500)) / (2 * h),
+        rtol=1e-7)
+    np.testing.assert_allclose(ps, psy.pvs(θ), rtol=1e-12)
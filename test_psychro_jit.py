@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+test psychro_jit.py against psychro.py
+"""
+import psychro as psy
+import psychro_jit as pj
+import numpy as np
+
+
+def test_same_results():
+    """
+    Compiled kernels give the same results as the NumPy functions
+    (serial and parallel evaluation)
+    """
+    rng = np.random.default_rng(1)
+    for n in [10, pj.parallel_min_size]:
+        θ = rng.uniform(-10, 50, n)
+        φ = rng.uniform(0, 1, n)
+        w = rng.uniform(0, 0.03, n)
+        Z = rng.uniform(0, 2000, n)
+
+        np.testing.assert_allclose(pj.p(Z), psy.p(Z), rtol=1e-13)
+        np.testing.assert_allclose(pj.pvs(θ), psy.pvs(θ), rtol=1e-13)
+        np.testing.assert_allclose(pj.w(θ, φ, Z), psy.w(θ, φ, Z),
+                                   rtol=1e-13)
+        np.testing.assert_allclose(pj.wsp(θ, Z), psy.wsp(θ, Z), rtol=1e-13)
+        np.testing.assert_allclose(pj.v(θ, w, Z), psy.v(θ, w, Z),
+                                   rtol=1e-13)
+        np.testing.assert_allclose(pj.phi(θ, w, Z), psy.phi(θ, w, Z),
+                                   rtol=1e-13)
+
+
+def test_scalar_and_broadcast():
+    """
+    Scalars and broadcasting as in psychro.py
+    """
+    θ = np.array([[0], [20]])
+    φ = np.array([0.2, 0.5, 1])
+
+    np.testing.assert_allclose(pj.w(θ, φ), psy.w(θ, φ), rtol=1e-13)
+    np.testing.assert_allclose(pj.w(20, 0.5), psy.w(20, 0.5), rtol=1e-13)
+
+
+def test_table_backend():
+    """
+    Table backend: same results as psychro.py with the table, NaN and
+    values out of the table (exact), scalars and broadcasting
+    """
+    rng = np.random.default_rng(2)
+    for n in [10, pj.parallel_min_size]:
+        θ = np.r_[np.nan, -80, 250, rng.uniform(-60, 200, n)]
+        φ = rng.uniform(0, 1, n + 3)
+        w = rng.uniform(0, 0.03, n + 3)
+
+        np.testing.assert_allclose(pj.pvs(θ, 'table'), psy.pvs(θ, 'table'),
+                                   rtol=1e-12)
+        np.testing.assert_allclose(pj.w(θ, φ, backend='table'),
+                                   psy.w(θ, φ, backend='table'), rtol=1e-12)
+        np.testing.assert_allclose(pj.phi(θ, w, backend='table'),
+                                   psy.phi(θ, w, backend='table'),
+                                   rtol=1e-12)
+    try:
+        psy.pvs_backend = 'table'
+        np.testing.assert_allclose(pj.w([[0], [20]], [0.2, 0.5]),
+                                   psy.w(np.array([[0], [20]]), [0.2, 0.5]),
+                                   rtol=1e-12)
+        assert np.ndim(pj.w(20, 0.5)) == 0
+    finally:
+        psy.pvs_backend = 'exact'
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+test solvers.py
+"""
+import solvers
+import numpy as np
+import pytest
+
+rng = np.random.default_rng(1)
+
+
+def test_solve_ideal_vs_penalty():
+    """
+    Eliminated ideal controllers vs. controller rows with a high gain
+    """
+    n, rows, cols, x_sp = 6, [4, 5], [0, 1], np.array([2., -3.])
+    A = rng.random((3, n, n)) + n * np.eye(n)
+    b = rng.random((3, n))
+    K = 1e8
+    A[:, rows] = 0
+    A[:, rows, cols] = K
+    A[:, rows, [2, 3]] = 1      # heat flow rates of the controllers
+    b[:, rows] = K * x_sp
+
+    x = solvers.solve(A, b, rows, cols, x_sp)
+
+    assert x.shape == (3, n)
+    np.testing.assert_array_equal(x[:, cols], np.tile(x_sp, (3, 1)))
+    np.testing.assert_allclose(x, np.linalg.solve(A, b[..., None])[..., 0],
+                               rtol=1e-6)
+
+
+def test_ideal():
+    """
+    Selection of the controllers with infinite gain
+    """
+    rows, cols, x_sp = solvers.ideal([1e10, np.inf], [14, 15], [8, 9],
+                                     [26, np.array([0.01, 0.02])])
+
+    assert rows.tolist() == [15] and cols.tolist() == [9]
+    np.testing.assert_array_equal(x_sp, [[0.01], [0.02]])
+
+    # ideal for some points only: error, not a silent NaN
+    with pytest.raises(ValueError):
+        solvers.ideal([np.array([1e10, np.inf]), 0], [14, 15], [8, 9],
+                      [26, 0.01])
+
+
+def test_fixed_point():
+    """
+    Linear contraction: Anderson and Aitken vs. Picard iterations;
+    divergence and maximum number of iterations
+    """
+    M = np.diag([0.9, 0.5, -0.8])
+    M[0, 1] = 0.3
+    c = np.array([1., 2., 3.])
+    x_e = np.linalg.solve(np.eye(3) - M, c)
+
+    def g(x):
+        return M @ x + c, None
+
+    n = {}
+    for accel in ['picard', 'aitken', 'anderson']:
+        x, _, status = solvers.fixed_point(g, np.zeros(3), 1e-8, 500, accel)
+        np.testing.assert_allclose(x, x_e, rtol=1e-6)
+        assert status['converged'] and not status['diverged']
+        n[accel] = status['n_iter']
+    assert n['anderson'] < n['picard'] / 4 and n['aitken'] < n['picard']
+
+    _, _, status = solvers.fixed_point(lambda x: (2 * x + 1, None), 1., 1e-8,
+                                       accel='picard')
+    assert status['diverged'] and status['n_iter'] == 4
+    _, _, status = solvers.fixed_point(g, np.zeros(3), 1e-8, 10, 'picard')
+    assert not status['converged'] and status['n_iter'] == 10
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+test store.py
+"""
+import numpy as np
+import pandas as pd
+import annual
+from store import Store
+
+
+def test_append_reopen(tmp_path):
+    """
+    Blocks appended, store reopened: columns are memory maps of all rows
+    """
+    res = Store(tmp_path / 'res', columns=['θI', 'QtCC'])
+    x = np.random.default_rng(0).normal(size=(250, 2))
+    for k in range(0, 250, 100):
+        res.append(pd.DataFrame(x[k:k + 100], columns=['θI', 'QtCC']))
+    res.append({'θI': [1.]})                # column missing: not appended
+
+    res = Store(tmp_path / 'res')
+    assert res.columns == ['θI', 'QtCC'] and len(res) == 250
+    assert isinstance(res['QtCC'], np.memmap)
+    np.testing.assert_array_equal(res['θI'], x[:, 0])
+    np.testing.assert_array_equal(
+        res.frame(['QtCC'], rows=slice(200, None))['QtCC'], x[200:, 1])
+    assert res.frame(rows=slice(200, None)).index[0] == 200
+
+
+def test_column_names(tmp_path):
+    """
+    Names of columns with spaces are kept when the store is reopened
+    """
+    Store(tmp_path / 'res', columns=['θ I', 'Qt CC']).append(
+        {'θ I': [1., 2.], 'Qt CC': [3., 4.]})
+
+    res = Store(tmp_path / 'res')
+    assert res.columns == ['θ I', 'Qt CC']
+    np.testing.assert_array_equal(res['Qt CC'], [3., 4.])
+
+
+def test_annual_run(tmp_path):
+    """
+    annual.run writes the blocks of results in the store
+    """
+    path = tmp_path / 'weather.csv'
+    θo = 28 + 6 * np.sin(2 * np.pi * np.arange(100) / 24)
+    pd.DataFrame({'θo': θo, 'φo': 0.5}).to_csv(path, index=False)
+    model = annual.cool_model()
+    res = Store(tmp_path / 'res', columns=model[1])
+
+    E = annual.run(path, model, out=res, chunksize=30)
+    np.testing.assert_allclose(res['QtCC'].sum() / 1000, E['QtCC'])
+    np.testing.assert_allclose(res.frame().to_numpy(),
+                               model[0](θo, 0.5 + 0 * θo))
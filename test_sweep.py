@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+test sweep.py
+"""
+import numpy as np
+import cool
+import va_hum
+import sweep
+
+
+def test_cool_grid():
+    """
+    Sweep on a grid (chunks, pool of processes) vs. one solve_batch
+    """
+    points = sweep.grid(β=[0, 0.1, 0.2], θo=np.linspace(26, 36, 50))
+    res, perf = sweep.sweep('cool', points, chunksize=40, workers=2)
+    res1, _ = sweep.sweep('cool', points, workers=1)
+
+    x = cool.solve_batch(
+        [3.1, 1, points['β'], 1e10, 1e10],
+        [points['θo'], 0.5, 26, 0.5, 1.35, 675, 34_000, 4_000])
+    assert len(res) == 150 and perf['chunks'] == 4
+    assert list(res.columns[:2]) == ['β', 'θo']
+    np.testing.assert_allclose(res.iloc[:, 2:], x)
+    np.testing.assert_allclose(res1.iloc[:, 2:], x)
+    assert res['β'].iloc[50] == 0.1
+
+
+def test_RecAirVAV():
+    """
+    Mass flow rate and unknowns of a sweep vs. m_RecAirVAV for one point;
+    unknown parameters are rejected
+    """
+    points = sweep.grid(α=[0.2, 0.8], θO=[-10, 0, 10])
+    res, _ = sweep.sweep('RecAirVAV', points, workers=1)
+    m, x = va_hum.m_RecAirVAV(0.8, 30, 18, 0.5, 0, 1, 0, 0, 2.12, 935.83)
+
+    np.testing.assert_allclose(res.iloc[4, 2:], np.hstack([m, x]))
+    assert sweep.sweep('RecAirVAV', sweep.grid(β=[0, 1])) == (None, None)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@author: cghiaus
+test va_hum.py
+"""
+import va_hum as vh
+import numpy as np
+
+# Inputs: indoor set point, outdoor, auxiliary loads
+θIsp, φIsp = 18, 0.5
+θO = np.array([-1, 5, 10, -5])
+φO = np.array([1, 0.8, 0.6, 0.9])
+Qsa, Qla = 100, 50
+mi, UA = 2.12, 935.83
+
+
+def test_ModelAllOutAir_ModelRecAir():
+    """
+    Regression values of the former test_VaHum.py (winter_VaHum.py,
+    2020; differences < 0.3 % due to the equation of pvs)
+    m = 4.84 kg/s, θS = 30 °C, indoor 18 °C, 50 %, outdoor -1 °C, 100 %
+    """
+    y = np.array([30, 3.5076e-3,            # point 0 (t, w)
+                  30, 7.670e-3,             # point 1 (t, w)
+                  18, 6.4025e-3,            # point 2 (t, w)
+                  150020.8, 50290.27,       # QsHC, QlVH
+                  -58060.78, -15318.30])    # QsTZ, QlTZ
+    np.testing.assert_allclose(
+        vh.ModelAllOutAir(4.84, 30, 18, 0.5, -1, 1, 0, 0, 2.12, 935.83),
+        y, rtol=3e-3)
+
+    y = np.array([-1, 3.5076e-3,            # point 0 (t0, w0)
+                  29.996, 3.5076e-3,        # point 1 (t1, w1)
+                  29.996, 7.6611e-3,        # point 2 (t2, w2)
+                  18, 6.3960e-3,            # point 3 (t3, w3)
+                  150020.65, 50176.49,      # QsHC, QlVH
+                  -58060.72, -15283.64])    # QsTZ, QlTZ
+    np.testing.assert_allclose(
+        vh.ModelRecAir(4.84, 1, 30, 18, 0.5, -1, 1, 0, 0, 2.12, 935.83),
+        y, rtol=1e-4)
+
+
+def test_CompiledAllOutAir():
+    """
+    Factorized model with N right-hand sides vs. ModelAllOutAir
+    """
+    m = 4.84
+    model = vh.CompiledAllOutAir(m, mi, UA)
+    x = model.solve(θIsp, φIsp, θO, φO, Qsa, Qla)
+
+    assert x.shape == (4, 10)
+    for k in range(4):
+        np.testing.assert_allclose(
+            x[k],
+            vh.ModelAllOutAir(m, 30, θIsp, φIsp, θO[k], φO[k],
+                              Qsa, Qla, mi, UA),
+            rtol=1e-8, atol=1e-10)
+
+
+def test_CompiledRecAir():
+    """
+    Factorized model with N right-hand sides vs. ModelRecAir
+    """
+    m, α = 4.84, 0.5
+    model = vh.CompiledRecAir(m, α, mi, UA)
+    x = model.solve(θIsp, φIsp, θO, φO, Qsa, Qla)
+
+    assert x.shape == (4, 12)
+    for k in range(4):
+        np.testing.assert_allclose(
+            x[k],
+            vh.ModelRecAir(m, α, 30, θIsp, φIsp, θO[k], φO[k],
+                           Qsa, Qla, mi, UA),
+            rtol=1e-8, atol=1e-10)
+
+
+def test_CompiledRecAir_ideal():
+    """
+    Ideal controllers (Kt, Kw = np.inf) vs. controller gains 1e10
+    """
+    m, α = 4.84, 0.5
+    x = vh.CompiledRecAir(m, α, mi, UA).solve(θIsp, φIsp, θO, φO, Qsa, Qla)
+    Kt, Kw = vh.Kt, vh.Kw
+    try:
+        vh.Kt, vh.Kw = np.inf, np.inf
+        model = vh.CompiledRecAir(m, α, mi, UA)
+        xi = model.solve(θIsp, φIsp, θO, φO, Qsa, Qla)
+        x0 = vh.ModelRecAir(m, α, 30, θIsp, φIsp, θO[0], φO[0],
+                            Qsa, Qla, mi, UA)
+    finally:
+        vh.Kt, vh.Kw = Kt, Kw
+
+    assert model.lu[0].shape == (10, 10)
+    # with a finite gain, wI - wIsp = QHC / Kw (relative error ~ 5e-4)
+    np.testing.assert_array_equal(xi[:, 6], θIsp)
+    np.testing.assert_allclose(xi[:, 7], vh.psy.w(θIsp, φIsp), rtol=1e-12)
+    np.testing.assert_allclose(xi, x, rtol=2e-3)
+    np.testing.assert_allclose(x0, xi[0], rtol=1e-10)
+
+
+def test_m_VAV():
+    """
+    Mass flow rate of VAV: θS = θSsp for arrays of operating points
+    """
+    θSsp = 30
+    m, x = vh.m_AllOutAirVAV(θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
+    np.testing.assert_allclose(x[:, 2], θSsp, atol=1e-6)
+    np.testing.assert_allclose(
+        x[0], vh.ModelAllOutAir(m[0], θSsp, θIsp, φIsp, θO[0], φO[0],
+                                Qsa, Qla, mi, UA), rtol=1e-8)
+
+    m, x = vh.m_RecAirVAV(0.5, θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
+    np.testing.assert_allclose(x[:, 4], θSsp, atol=1e-6)
+    assert np.all(np.diff(m[np.argsort(θO)]) < 0)   # less heating, less m
+
+
+def test_m_VAV_no_solution(capsys):
+    """
+    No heating solution when θO > θIsp: m is NaN, status returned
+    """
+    m, x = vh.m_AllOutAirVAV(30, θIsp, φIsp, 25, 0.5, 0, 0, mi, UA)
+
+    assert np.isnan(m)
+    assert not vh.AllOutAirVAV_compute(θO=25, φO=0.5)['success']
+    assert capsys.readouterr().out == ''
@@ -28,10 +28,13 @@ Variable air volume (VAV)
 Inputs given in Jupyter Notebook
 
 """
+import time
 import numpy as np
-import pandas as pd
 import psychro as psy
+import solvers
+import instrument
 import matplotlib.pyplot as plt
+from scipy.linalg import lu_factor, lu_solve
 
 # Design conditions for CAV (to determine m)
 θOd = -1        # °C, outdoor temperarture
@@ -47,6 +50,131 @@ UAd = 85.9      # kJ/K, overall heat conductance
 c = 1e3         # air specific heat J/kg K
 l = 2496e3      # latent heat J/kg
 
+Kt, Kw = 1e10, 1e10     # controller gain; np.inf: ideal controller
+
+# Controllers Kt, Kw: equations and controlled unknowns (θI, wI)
+_ctrl_AllOutAir = [8, 9], [4, 5]
+_ctrl_RecAir = [10, 11], [6, 7]
+
+
+def _matrix(n, Aij):
+    """
+    Matrix (n, n) or stack of matrices (N, n, n) from the list of
+    non-zero coefficients (row, column, value); values are scalars
+    or arrays of N values.
+    """
+    i, j, a = zip(*Aij)
+    a = np.broadcast_arrays(*a)
+    A = np.zeros(a[0].shape + (n, n))
+    A[..., i, j] = np.stack(a, axis=-1)
+    return A
+
+
+def _vector(n, bi):
+    """
+    Vector (n,) or stack of vectors (N, n) from the list of
+    non-zero elements (row, value); values are scalars or arrays.
+    """
+    i, v = zip(*bi)
+    v = np.broadcast_arrays(*v)
+    b = np.zeros(v[0].shape + (n,))
+    b[..., i] = np.stack(v, axis=-1)
+    return b
+
+
+def _ideal(K, ctrl, θIsp, φIsp):
+    """
+    Ideal controllers among K = [Kt, Kw] (see solvers.ideal).
+    """
+    return solvers.ideal(K, *ctrl, [θIsp, psy.w(θIsp, φIsp)])
+
+
+def _solve(A, b, ctrl, θIsp, φIsp):
+    """
+    Solution of A x = b, single system or stack of systems.
+    The ideal controllers (Kt, Kw = np.inf) are eliminated: θI = θIsp
+    and wI = w(θIsp, φIsp) are imposed (see solvers.py).
+    """
+    return solvers.solve(A, b, *_ideal([Kt, Kw], ctrl, θIsp, φIsp))
+
+
+class CompiledModel:
+    """
+    Linear model A x = b with the matrix A factorized once.
+
+    A depends only on the configuration of the building and of the AHU
+    (m, α, mi, UA and controller gains); the weather, the set points
+    and the loads enter only b. The LU factorization of A is computed
+    at creation; *solve* gives the solutions for a block of N
+    right-hand sides in a single LAPACK call.
+    The ideal controllers (Kt, Kw = np.inf at creation) are eliminated
+    before the factorization.
+    """
+
+    def __init__(self, A, rhs, ctrl=([], [])):
+        """
+        A       (n, n) np.array, coefficients of unknowns
+        rhs     function giving b, (n,) or (N, n), from the inputs
+                θIsp, φIsp, θO, φO, Qsa, Qla
+        ctrl    equations and unknowns of the controllers Kt, Kw
+        """
+        t0 = time.perf_counter()
+        self.K, self.ctrl = [Kt, Kw], ctrl
+        rows, cols, _ = _ideal(self.K, ctrl, 0, 0)
+        A, self.Ac, self.eqs, self.free = solvers.reduce(A, rows, cols)
+        self.lu = lu_factor(A)
+        self.rhs = rhs
+        instrument.record('va_hum.CompiledModel', A=A,
+                          time_assembly=time.perf_counter() - t0)
+
+    def solve(self, θIsp, φIsp, θO, φO, Qsa, Qla):
+        """
+        Solutions for scalar inputs or arrays of N values (broadcasted).
+
+        Returns
+        -------
+        x       (n,) or (N, n) np.array, unknowns of the model
+        """
+        t0 = time.perf_counter()
+        b = self.rhs(θIsp, φIsp, θO, φO, Qsa, Qla)
+        _, cols, x_sp = _ideal(self.K, self.ctrl, θIsp, φIsp)
+        b = solvers.rhs(b, self.Ac, self.eqs, x_sp)
+        t1 = time.perf_counter()
+        xr = lu_solve(self.lu, b.T).T
+        instrument.record('va_hum.CompiledModel.solve', time_assembly=t1 - t0,
+                          time_solve=time.perf_counter() - t1,
+                          N=b.size // len(self.eqs))
+        return solvers.restore(xr, self.free, cols, x_sp)
+
+
+def CompiledAllOutAir(m, mi, UA):
+    """
+    ModelAllOutAir with m, mi, UA given, factorized once.
+
+    Example
+    -------
+    model = CompiledAllOutAir(m=4.84, mi=2.12, UA=935.83)
+    x = model.solve(θIsp, φIsp, θO, φO, Qsa, Qla)    # arrays of N values
+    x[:, 6]     # QsHC for the N operating points
+    """
+    def rhs(θIsp, φIsp, θO, φO, Qsa, Qla):
+        return _b_AllOutAir(m, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
+    return CompiledModel(_A_AllOutAir(m, mi, UA), rhs, _ctrl_AllOutAir)
+
+
+def CompiledRecAir(m, α, mi, UA):
+    """
+    ModelRecAir with m, α, mi, UA given, factorized once.
+
+    Example
+    -------
+    model = CompiledRecAir(m=4.84, α=0.5, mi=2.12, UA=935.83)
+    x = model.solve(θIsp, φIsp, θO, φO, Qsa, Qla)    # arrays of N values
+    """
+    def rhs(θIsp, φIsp, θO, φO, Qsa, Qla):
+        return _b_RecAir(m, α, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
+    return CompiledModel(_A_RecAir(m, α, mi, UA), rhs, _ctrl_RecAir)
+
 # *****************************************
 # ALL OUT AIR
 # *****************************************
@@ -97,33 +225,96 @@ def ModelAllOutAir(m, θS, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA):
          |       |<----Kw--|-w2
          |<------------Kt--|-t2
     """
-    Kt, Kw = 1e10, 1e10             # controller gain
+    # Model
+    A = _A_AllOutAir(m, mi, UA)     # coefficents of unknowns
+    b = _b_AllOutAir(m, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
+
+    # Solution
+    x = _solve(A, b, _ctrl_AllOutAir, θIsp, φIsp)
+    return x
+
+
+def _A_AllOutAir(m, mi, UA):
+    """
+    Matrix of ModelAllOutAir, (10, 10) or (N, 10, 10) for arrays.
+    """
+    return _matrix(10, [
+        # HC heating coil
+        (0, 0, m * c), (0, 6, -1),
+        (1, 1, m * l),
+        # VA vapor humidifier
+        (2, 0, -m * c), (2, 2, m * c),
+        (3, 1, -m * l), (3, 3, m * l), (3, 7, -1),
+        # TZ thermal zone
+        (4, 2, -m * c), (4, 4, m * c), (4, 8, -1),
+        (5, 3, -m * l), (5, 5, m * l), (5, 9, -1),
+        # BL building
+        (6, 4, UA + mi * c), (6, 8, 1),
+        (7, 5, mi * l), (7, 9, 1),
+        # Kt indoor temperature controller
+        (8, 4, Kt), (8, 6, 1),
+        # Kw indoor hum.ratio controller
+        (9, 5, Kw), (9, 7, 1)])
+
+
+def _b_AllOutAir(m, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA):
+    """
+    Vector of inputs of ModelAllOutAir, (10,) or (N, 10) for arrays.
+    """
     wO = psy.w(θO, φO)              # outdoor mumidity ratio
     wIsp = psy.w(θIsp, φIsp)        # indoor mumidity ratio
+    return _vector(10, [
+        (0, m * c * θO),            # HC
+        (1, m * l * wO),
+        (6, (UA + mi * c) * θO + Qsa),  # BL
+        (7, mi * l * wO + Qla),
+        (8, Kt * θIsp),             # Kt
+        (9, Kw * wIsp)])            # Kw
+
+
+def AllOutAirCAV_compute(θS=30, θIsp=18, φIsp=0.5, θO=-1, φO=1,
+                         Qsa=0, Qla=0, mi=2.12, UA=935.83):
+    """
+    Computation of *AllOutAirCAV*, without chart and printing.
+
+    Returns
+    -------
+    res     dict
+        'x'     results of ModelAllOutAir
+        'θ', 'w'    points O, 0, 1, 2 on psychrometric chart
+        'A'     adjacency matrix of processes (HC, VH, TZ)
+        'Q'     heat flow rates QsHC, QlVH, QsTZ, QlTZ, W
+        'm'     mass flow rate, kg/s
+    """
+    wO = psy.w(θO, φO)  # hum. out
+
+    # Mass flow rate for design conditions
+    # θOd = -1                        # outdoor design conditions
+    # mid = 2.18                      # infiltration design
+    QsZ = UAd * (θOd - θId) + mid * c * (θOd - θId) + Qsad
+    m = - QsZ / (c * (θSd - θId))
 
     # Model
-    A = np.zeros((10, 10))          # coefficents of unknowns
-    b = np.zeros(10)                # vector of inputs
-    # HC heating coil
-    A[0, 0], A[0, 6], b[0] = m * c, -1, m * c * θO
-    A[1, 1], b[1] = m * l, m * l * wO
-    # VA vapor humidifier
-    A[2, 0], A[2, 2], b[2] = -m * c, m * c, 0
-    A[3, 1], A[3, 3], A[3, 7], b[3] = -m * l, m * l, -1, 0
-    # TZ thermal zone
-    A[4, 2], A[4, 4], A[4, 8], b[4] = -m * c, m * c, -1, 0
-    A[5, 3], A[5, 5], A[5, 9], b[5] = -m * l, m * l, -1, 0
-    # BL building
-    A[6, 4], A[6, 8], b[6] = UA + mi * c, 1, (UA + mi * c) * θO + Qsa
-    A[7, 5], A[7, 9], b[7] = mi * l, 1, mi * l * wO + Qla
-    # Kt indoor temperature controller
-    A[8, 4], A[8, 6], b[8] = Kt, 1, Kt * θIsp
-    # Kw indoor hum.ratio controller
-    A[9, 5], A[9, 7], b[9] = Kw, 1, Kw * wIsp
+    x = ModelAllOutAir(m, θS, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
+    return _res_AllOutAir(x, m, wO, θO)
 
-    # Solution
-    x = np.linalg.solve(A, b)
-    return x
+
+def _res_AllOutAir(x, m, wO, θO):
+    """
+    Result of all out air models (CAV & VAV) as a dict.
+    """
+    # Adjancy matrix: rows=lines; columns=points
+    # Points       O    0   1   2       Elements
+    A = np.array([[-1, 1, 0, 0],     # HC
+                 [0, -1, 1, 0],      # VH
+                 [0, 0, 1, -1]])     # TZ
+    return {'x': x,
+            'θ': np.append(θO, x[0:5:2]),
+            'w': np.append(wO, x[1:6:2]),
+            'A': A,
+            'points': ['O', '1', '2', '3'],
+            'Q': dict(zip(['QsHC', 'QlVH', 'QsTZ', 'QlTZ'], x[6:])),
+            'm': m}
 
 
 def AllOutAirCAV(θS=30, θIsp=18, φIsp=0.5, θO=-1, φO=1,
@@ -166,55 +357,33 @@ def AllOutAirCAV(θS=30, θIsp=18, φIsp=0.5, θO=-1, φO=1,
          |       |<----Kw--|-w2
          |<------------Kt--|-t2
     """
+    res = AllOutAirCAV_compute(θS, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
     plt.close('all')
-    wO = psy.w(θO, φO)  # hum. out
-
-    # Mass flow rate for design conditions
-    # θOd = -1                        # outdoor design conditions
-    # mid = 2.18                      # infiltration design
-    QsZ = UAd * (θOd - θId) + mid * c * (θOd - θId) + Qsad
-    m = - QsZ / (c * (θSd - θId))
     print('Winter All_out_air CAV')
-    print(f'm = {m: 5.3f} kg/s constant (from design conditions)')
+    print(f'm = {res["m"]: 5.3f} kg/s constant (from design conditions)')
     print(f'Design conditions θS = {θS: 3.1f} °C, '
           f'mi = {mid:.4f} kg/s, θO = {θOd:3.1f} °C, '
           f'θI = {θIsp:3.1f} °C')
+    psy.show(res)
+    x = res['x']
+    return x
 
-    # Model
-    x = ModelAllOutAir(m, θS, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
-
-    # Processes on psychrometric chart
-    t = np.append(θO, x[0:5:2])
-    w = np.append(wO, x[1:6:2])
-
-    # Adjancy matrix: rows=lines; columns=points
-    # Points       O    0   1   2       Elements
-    A = np.array([[-1, 1, 0, 0],     # HC
-                 [0, -1, 1, 0],      # VH
-                 [0, 0, 1, -1]])     # TZ
-
-    psy.chartA(t, w, A)
-
-    t = pd.Series(t)
-    w = 1000 * pd.Series(w)
-    P = pd.concat([t, w], axis=1)       # points
-    P.columns = ['θ [°C]', 'w [g/kg]']
-    P.index = ['O', '1', '2', '3']
-
-    output = P.to_string(formatters={
-        'θ [°C]': '{:,.2f}'.format,
-        'w [g/kg]': '{:,.2f}'.format
-    })
-    print()
-    print(output)
 
-    Q = pd.Series(x[6:], index=['QsHC', 'QlVH', 'QsTZ', 'QlTZ'])
-    # Q.columns = ['kW']
-    pd.options.display.float_format = '{:,.2f}'.format
-    print()
-    print(Q.to_frame().T / 1000, 'kW')
+def AllOutAirVAV_compute(θSsp=30, θIsp=18, φIsp=0.5, θO=-1, φO=1,
+                         Qsa=0, Qla=0, mi=2.12, UA=935.83):
+    """
+    Computation of *AllOutAirVAV*, without chart and printing.
 
-    return x
+    Returns
+    -------
+    res     dict, as *AllOutAirCAV_compute*, and
+        'success'   bool, m solves θS = θSsp (else m is NaN)
+    """
+    wO = psy.w(θO, φO)            # outdoor mumidity ratio
+    m, x = m_AllOutAirVAV(θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
+    res = _res_AllOutAir(x, m, wO, θO)
+    res['success'] = not np.isnan(m)
+    return res
 
 
 def AllOutAirVAV(θSsp=30, θIsp=18, φIsp=0.5, θO=-1, φO=1,
@@ -257,55 +426,88 @@ def AllOutAirVAV(θSsp=30, θIsp=18, φIsp=0.5, θO=-1, φO=1,
          |       |<----Kw---------|-w2
          |<------------Kt---------|-θ2
 
-        Mass-flow rate (VAV) I-controller:
-        start with m = 0
-        measure the supply temperature
-        while -(θSsp - θS)>0.01, increase m (I-controller)
+        Mass-flow rate (VAV):
+        m solves θS(m) = θSsp (see *m_AllOutAirVAV*)
     """
+    res = AllOutAirVAV_compute(θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
     plt.close('all')
-    wO = psy.w(θO, φO)            # outdoor mumidity ratio
-
-    # Mass flow rate
-    DθS, m = 2, 0                   # initial temp; diff; flow rate
-    while DθS > 0.01:
-        m = m + 0.01                # mass-flow rate I-controller
-        # Model
-        x = ModelAllOutAir(m, θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
-        θS = x[2]
-        DθS = -(θSsp - θS)
+    if not res['success']:
+        print('m_AllOutAirVAV: No solution for m')
     print('Winter All_out_air VAV')
-    print(f'm = {m: 5.3f} kg/s')
-    # Processes on psychrometric chart
-    t = np.append(θO, x[0:5:2])
-    w = np.append(wO, x[1:6:2])
-    # Points       o    0   1   2   Elements
-    A = np.array([[-1, 1, 0, 0],    # HC
-                 [0, -1, 1, 0],     # VH
-                 [0, 0, 1, -1]])    # TZ
-
-    psy.chartA(t, w, A)
-
-    t = pd.Series(t)
-    w = 1000 * pd.Series(w)
-    P = pd.concat([t, w], axis=1)       # points
-    P.columns = ['θ [°C]', 'w [g/kg]']
-
-    output = P.to_string(formatters={
-        'θ [°C]': '{:,.2f}'.format,
-        'w [g/kg]': '{:,.2f}'.format
-    })
-    print()
-    print(output)
-
-    Q = pd.Series(x[6:], index=['QsHC', 'QlVH', 'QsTZ', 'QlTZ'])
-    # Q.columns = ['kW']
-    pd.options.display.float_format = '{:,.2f}'.format
-    print()
-    print(Q.to_frame().T / 1000, 'kW')
-
+    print(f'm = {res["m"]: 5.3f} kg/s')
+    psy.show(res)
     return None
 
 
+def _m_VAV(θS, θSsp, tol, max_iter):
+    """
+    Mass flow rate m which solves θS(m) = θSsp, vectorized.
+
+    With ideal controllers, the supply temperature of the models is
+    θS = θI - QsTZ / (m c), i.e. affine in u = 1 / m. The secant method
+    in u is then exact in one step; with the large (finite) controller
+    gains, it converges in a few steps.
+
+    Parameters
+    ----------
+    θS          function of m (N values) giving θS (N values)
+    θSsp        supply temperature set point, N values
+    tol         °C, tolerance on |θS - θSsp|
+    max_iter    maximum number of iterations
+
+    Returns
+    -------
+    m           N values, NaN where there is no solution m > 0
+    """
+    t0 = time.perf_counter()
+    u0, u1 = np.full(θSsp.shape, 1.), np.full(θSsp.shape, 0.5)
+    ε0, ε1 = θS(1 / u0) - θSsp, θS(1 / u1) - θSsp
+    active = np.abs(ε1) >= tol
+    nfev = 2
+    for k in range(max_iter):
+        if not active.any():
+            break
+        nfev += 1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            u = u1 - ε1 * (u1 - u0) / (ε1 - ε0)
+        active &= u > 0
+        u0, ε0 = u1, ε1
+        u1 = np.where(active, u, u1)
+        ε1 = np.where(active, θS(1 / u1) - θSsp, ε1)
+        active &= np.abs(ε1) >= tol
+    m = 1 / u1
+    m[np.abs(ε1) >= tol] = np.nan
+    instrument.record('va_hum.m_VAV', time=time.perf_counter() - t0,
+                      nfev=nfev, N=m.size, success=not np.isnan(m).any())
+    return m
+
+
+def m_AllOutAirVAV(θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA,
+                   tol=1e-6, max_iter=20):
+    """
+    Mass flow rate of VAV all out air s.t. θS = θSsp (see *_m_VAV*).
+    Inputs are scalars or arrays of N operating points (broadcasted).
+
+    Returns
+    -------
+    m       mass flow rate of dry air, kg/s; NaN if no solution
+    x       results of ModelAllOutAir for m, (10,) or (N, 10)
+    """
+    inputs = np.broadcast_arrays(θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
+    shape = inputs[0].shape
+    θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA = (
+        np.ravel(x).astype(float) for x in inputs)
+
+    def solve(m):
+        A = _A_AllOutAir(m, mi, UA)
+        b = _b_AllOutAir(m, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
+        return _solve(A, b, _ctrl_AllOutAir, θIsp, φIsp)
+
+    m = _m_VAV(lambda m: solve(m)[:, 2], θSsp, tol, max_iter)
+    x = solve(m)
+    return m.reshape(shape)[()], x.reshape(shape + (10,))
+
+
 # *****************************************
 # RECYCLED AIR
 # *****************************************
@@ -359,36 +561,105 @@ def ModelRecAir(m, α, θS, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA):
                |       |<----Kw--|-w3
                |<------------Kt--|-t3
     """
-    Kt, Kw = 1e10, 1e10             # controller gain
+    # Model
+    A = _A_RecAir(m, α, mi, UA)     # coefficents of unknowns
+    b = _b_RecAir(m, α, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
+
+    # Solution
+    x = _solve(A, b, _ctrl_RecAir, θIsp, φIsp)
+    return x
+
+
+def _A_RecAir(m, α, mi, UA):
+    """
+    Matrix of ModelRecAir, (12, 12) or (N, 12, 12) for arrays.
+    """
+    return _matrix(12, [
+        # MX mixing box
+        (0, 0, m * c), (0, 6, -(1 - α) * m * c),
+        (1, 1, m * l), (1, 7, -(1 - α) * m * l),
+        # HC hearing coil
+        (2, 0, m * c), (2, 2, -m * c), (2, 8, 1),
+        (3, 1, m * l), (3, 3, -m * l),
+        # VH vapor humidifier
+        (4, 2, m * c), (4, 4, -m * c),
+        (5, 3, m * l), (5, 5, -m * l), (5, 9, 1),
+        # TZ thermal zone
+        (6, 4, m * c), (6, 6, -m * c), (6, 10, 1),
+        (7, 5, m * l), (7, 7, -m * l), (7, 11, 1),
+        # BL building
+        (8, 6, UA + mi * c), (8, 10, 1),
+        (9, 7, mi * l), (9, 11, 1),
+        # Kt indoor temperature controller
+        (10, 6, Kt), (10, 8, 1),
+        # Kw indoor humidity controller
+        (11, 7, Kw), (11, 9, 1)])
+
+
+def _b_RecAir(m, α, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA):
+    """
+    Vector of inputs of ModelRecAir, (12,) or (N, 12) for arrays.
+    """
     wO = psy.w(θO, φO)            # hum. out
     wIsp = psy.w(θIsp, φIsp)      # hum. in set point
+    return _vector(12, [
+        (0, α * m * c * θO),        # MX
+        (1, α * m * l * wO),
+        (8, (UA + mi * c) * θO + Qsa),  # BL
+        (9, mi * l * wO + Qla),
+        (10, Kt * θIsp),            # Kt
+        (11, Kw * wIsp)])           # Kw
+
+
+def RecAirCAV_compute(α=0.5, θS=30, θIsp=18, φIsp=0.5, θO=-1, φO=1,
+                      Qsa=0, Qla=0, mi=2.12, UA=935.83):
+    """
+    Computation of *RecAirCAV*, without chart and printing.
+
+    Returns
+    -------
+    res     dict
+        'x'     results of ModelRecAir
+        'θ', 'w'    points O, 0, 1, 2, 3 on psychrometric chart
+        'A'     adjacency matrix of processes (MX, HC, VH, TZ)
+        'Q'     heat flow rates QsHC, QlVH, QsTZ, QlTZ, W
+        'm'     mass flow rate, kg/s
+    """
+    wO = psy.w(θO, φO)            # hum. out
+
+    # Mass flow rate for design conditions
+    # Supplay air mass flow rate
+    # QsZ = UA*(θO - θIsp) + mi*c*(θO - θIsp)
+    # m = - QsZ/(c*(θS - θIsp)
+    # where
+    # θOd, wOd = -1, 3.5e-3           # outdoor
+    # θS = 30                       # supply air
+    # mid = 2.18                     # infiltration
+    QsZ = UA * (θOd - θIsp) + mid * c * (-1 - θIsp) + Qsa
+    m = - QsZ / (c * (θS - θIsp))
 
     # Model
-    A = np.zeros((12, 12))          # coefficents of unknowns
-    b = np.zeros(12)                # vector of inputs
-    # MX mixing box
-    A[0, 0], A[0, 6], b[0] = m * c, -(1 - α) * m * c, α * m * c * θO
-    A[1, 1], A[1, 7], b[1] = m * l, -(1 - α) * m * l, α * m * l * wO
-    # HC hearing coil
-    A[2, 0], A[2, 2], A[2, 8], b[2] = m * c, -m * c, 1, 0
-    A[3, 1], A[3, 3], b[3] = m * l, -m * l, 0
-    # VH vapor humidifier
-    A[4, 2], A[4, 4], b[4] = m * c, -m * c, 0
-    A[5, 3], A[5, 5], A[5, 9], b[5] = m * l, -m * l, 1, 0
-    # TZ thermal zone
-    A[6, 4], A[6, 6], A[6, 10], b[6] = m * c, -m * c, 1, 0
-    A[7, 5], A[7, 7], A[7, 11], b[7] = m * l, -m * l, 1, 0
-    # BL building
-    A[8, 6], A[8, 10], b[8] = (UA + mi * c), 1, (UA + mi * c) * θO + Qsa
-    A[9, 7], A[9, 11], b[9] = mi * l, 1, mi * l * wO + Qla
-    # Kt indoor temperature controller
-    A[10, 6], A[10, 8], b[10] = Kt, 1, Kt * θIsp
-    # Kw indoor humidity controller
-    A[11, 7], A[11, 9], b[11] = Kw, 1, Kw * wIsp
+    x = ModelRecAir(m, α, θS, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
+    return _res_RecAir(x, m, wO, θO)
 
-    # Solution
-    x = np.linalg.solve(A, b)
-    return x
+
+def _res_RecAir(x, m, wO, θO):
+    """
+    Result of recycled air models (CAV & VAV) as a dict.
+    """
+    # Processes on psychrometric chart
+    # Points      o    0    1   2   3       Elements
+    #             0    1    2   3   4
+    A = np.array([[-1, 1, 0, 0, -1],        # MX
+                 [0, -1, 1, 0, 0],          # HC
+                 [0, 0, -1, 1, 0],          # VH
+                 [0, 0, 0, -1, 1]])         # TZ
+    return {'x': x,
+            'θ': np.append(θO, x[0:8:2]),
+            'w': np.append(wO, x[1:8:2]),
+            'A': A,
+            'Q': dict(zip(['QsHC', 'QlVH', 'QsTZ', 'QlTZ'], x[8:])),
+            'm': m}
 
 
 def RecAirCAV(α=0.5, θS=30, θIsp=18, φIsp=0.5, θO=-1, φO=1,
@@ -430,60 +701,33 @@ def RecAirCAV(α=0.5, θS=30, θIsp=18, φIsp=0.5, θO=-1, φO=1,
                |       |_____Kw__|_w3
                |_____________Kt__|_t3
     """
+    res = RecAirCAV_compute(α, θS, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
     plt.close('all')
-    wO = psy.w(θO, φO)            # hum. out
-
-    # Mass flow rate for design conditions
-    # Supplay air mass flow rate
-    # QsZ = UA*(θO - θIsp) + mi*c*(θO - θIsp)
-    # m = - QsZ/(c*(θS - θIsp)
-    # where
-    # θOd, wOd = -1, 3.5e-3           # outdoor
-    # θS = 30                       # supply air
-    # mid = 2.18                     # infiltration
-    QsZ = UA * (θOd - θIsp) + mid * c * (-1 - θIsp) + Qsa
-    m = - QsZ / (c * (θS - θIsp))
     print('Winter Recirculated_air CAV')
-    print(f'm = {m: 5.3f} kg/s constant (from design conditions)')
+    print(f'm = {res["m"]: 5.3f} kg/s constant (from design conditions)')
     print(f'Design conditions θS = {θS: 3.1f} °C,'
           f'mi = {mid:3.1f} kg/s, θO = {θOd:3.1f} °C, '
           f'θI = {θIsp:3.1f} °C')
+    print(f'wO = {res["w"][0]:6.5f}')
+    psy.show(res)
+    return None
 
-    # Model
-    x = ModelRecAir(m, α, θS, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
-    # (m, θS, mi, θO, φO, α)
-
-    # Processes on psychrometric chart
-    # Points      o    0    1   2   3       Elements
-    #             0    1    2   3   4
-    A = np.array([[-1, 1, 0, 0, -1],        # MX
-                 [0, -1, 1, 0, 0],          # HC
-                 [0, 0, -1, 1, 0],          # VH
-                 [0, 0, 0, -1, 1]])         # TZ
-    t = np.append(θO, x[0:8:2])
-
-    print(f'wO = {wO:6.5f}')
-    w = np.append(wO, x[1:8:2])
-    psy.chartA(t, w, A)
-
-    t = pd.Series(t)
-    w = 1000 * pd.Series(w)
-    P = pd.concat([t, w], axis=1)       # points
-    P.columns = ['θ [°C]', 'w [g/kg]']
-
-    output = P.to_string(formatters={
-        'θ [°C]': '{:,.2f}'.format,
-        'w [g/kg]': '{:,.2f}'.format
-    })
-    print()
-    print(output)
 
-    Q = pd.Series(x[8:], index=['QsHC', 'QlVH', 'QsTZ', 'QlTZ'])
-    pd.options.display.float_format = '{:,.2f}'.format
-    print()
-    print(Q.to_frame().T / 1000, 'kW')
+def RecAirVAV_compute(α=0.5, θSsp=30, θIsp=18, φIsp=0.5, θO=-1, φO=1,
+                      Qsa=0, Qla=0, mi=2.12, UA=935.83):
+    """
+    Computation of *RecAirVAV*, without chart and printing.
 
-    return None
+    Returns
+    -------
+    res     dict, as *RecAirCAV_compute*, and
+        'success'   bool, m solves θS = θSsp (else m is NaN)
+    """
+    wO = psy.w(θO, φO)            # hum. out
+    m, x = m_RecAirVAV(α, θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
+    res = _res_RecAir(x, m, wO, θO)
+    res['success'] = not np.isnan(m)
+    return res
 
 
 def RecAirVAV(α=0.5, θSsp=30, θIsp=18, φIsp=0.5, θO=-1, φO=1,
@@ -530,58 +774,45 @@ def RecAirVAV(α=0.5, θSsp=30, θIsp=18, φIsp=0.5, θO=-1, φO=1,
                |       |_____Kw_________|_w3
                |_____________Kt_________|_t3
 
-    Mass-flow rate (VAV) I-controller:
-        start with m = 0
-        measure the supply temperature
-        while -(θSsp - θS)>0.01, increase m (I-controller)
+    Mass-flow rate (VAV):
+        m solves θS(m) = θSsp (see *m_RecAirVAV*)
     """
+    res = RecAirVAV_compute(α, θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
     plt.close('all')
-    wO = psy.w(θO, φO)            # hum. out
-
-    # Mass flow rate
-    DθS, m = 2, 0                   # initial temp; diff; flow rate
-    while DθS > 0.01:
-        m = m + 0.01
-
-        # Model
-        x = ModelRecAir(m, α, θSsp, θIsp, φIsp, θO, φO,
-                        Qsa, Qla, mi, UA)
-        θS = x[4]
-        DθS = -(θSsp - θS)
-
+    if not res['success']:
+        print('m_RecAirVAV: No solution for m')
     print('Winter Rec_air VAV')
-    print(f'm = {m: 5.3f} kg/s')
+    print(f'm = {res["m"]: 5.3f} kg/s')
+    print(f'wO = {res["w"][0]:6.5f}')
+    psy.show(res)
+    return None
 
-    # Processes on psychrometric chart
-    # Points      o    0    1   2   3       Elements
-    #             0    1    2   3   4
-    A = np.array([[-1, 1, 0, 0, -1],        # MX
-                 [0, -1, 1, 0, 0],          # HC
-                 [0, 0, -1, 1, 0],          # VH
-                 [0, 0, 0, -1, 1]])         # TZ
-    t = np.append(θO, x[0:8:2])
-    print(f'wO = {wO:6.5f}')
-    w = np.append(wO, x[1:8:2])
-    psy.chartA(t, w, A)
-
-    t = pd.Series(t)
-    w = 1000 * pd.Series(w)
-    P = pd.concat([t, w], axis=1)           # points
-    P.columns = ['θ [°C]', 'w [g/kg]']
-
-    output = P.to_string(formatters={
-        'θ [°C]': '{:,.2f}'.format,
-        'w [g/kg]': '{:,.2f}'.format
-    })
-    print()
-    print(output)
-
-    Q = pd.Series(x[8:], index=['QsHC', 'QlVH', 'QsTZ', 'QlTZ'])
-    pd.options.display.float_format = '{:,.2f}'.format
-    print()
-    print(Q.to_frame().T / 1000, 'kW')
 
-    return None
+def m_RecAirVAV(α, θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA,
+                tol=1e-6, max_iter=20):
+    """
+    Mass flow rate of VAV recycled air s.t. θS = θSsp (see *_m_VAV*).
+    Inputs are scalars or arrays of N operating points (broadcasted).
+
+    Returns
+    -------
+    m       mass flow rate of dry air, kg/s; NaN if no solution
+    x       results of ModelRecAir for m, (12,) or (N, 12)
+    """
+    inputs = np.broadcast_arrays(α, θSsp, θIsp, φIsp, θO, φO,
+                                 Qsa, Qla, mi, UA)
+    shape = inputs[0].shape
+    α, θSsp, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA = (
+        np.ravel(x).astype(float) for x in inputs)
+
+    def solve(m):
+        A = _A_RecAir(m, α, mi, UA)
+        b = _b_RecAir(m, α, θIsp, φIsp, θO, φO, Qsa, Qla, mi, UA)
+        return _solve(A, b, _ctrl_RecAir, θIsp, φIsp)
+
+    m = _m_VAV(lambda m: solve(m)[:, 4], θSsp, tol, max_iter)
+    x = solve(m)
+    return m.reshape(shape)[()], x.reshape(shape + (12,))
 
 
 # Uncomment to test a function